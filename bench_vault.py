@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "jsonschema",
+#     "pyyaml",
+# ]
+# ///
+"""Benchmark the vault tools against synthetic vaults of 1k, 10k or 100k notes.
+
+generate_vault() writes a schema-valid vault shaped like the real one: research
+notes of every subtype, plans with plan-sections, concepts, MOCs, project
+workspaces and paper workspaces with manuscript.md and references.yml. Notes
+link each other through related_notes (mostly with backlinks, so the
+bidirectional check finds some warnings), parent_plan and related_projects,
+and through [[...]] links in their bodies. Generated vaults are kept under
+.cache/bench/ and reused across runs.
+
+Each benchmark is timed best-of-N, without the parse cache:
+
+    validate       validate_directory() (schema, dates, links, tags, backlinks)
+    index          collect_notes() + generate_index()
+    references     check_paper() over every paper workspace
+    bidirectional  validate_inverse_relations() on pre-parsed notes
+
+--yaml-backends instead times parsing every note's frontmatter and every
+references.yml in an existing vault (the real one by default) with each
+available YAML backend, after checking that they parse identically.
+
+Timings are compared against a saved baseline (.cache/bench_baseline.json by
+default, since timings are machine-specific); a benchmark slower than its
+baseline by more than --tolerance is flagged as a regression.
+
+Usage:
+    uv run bench_vault.py                          # 1k and 10k notes
+    uv run bench_vault.py --sizes 1000,10000,100000
+    uv run bench_vault.py --save-baseline          # record the current timings
+    uv run bench_vault.py --check                  # exit 1 on any regression
+    uv run bench_vault.py --generate DIR --notes 500  # just write a vault
+    uv run bench_vault.py --yaml-backends          # libyaml vs pure Python on vault/
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import random
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from check_references import check_paper
+from generate_index import collect_notes, generate_index
+from validate_frontmatter import (
+    find_md_files,
+    validate_directory,
+    validate_inverse_relations,
+)
+from vault_notes import (
+    DEFAULT_CACHE_DIR,
+    REPO_ROOT,
+    load_note,
+    load_yaml,
+    parse_note,
+    read_frontmatter_text,
+    read_text,
+    yaml_loader,
+)
+
+DEFAULT_VAULT = REPO_ROOT / "vault"
+DEFAULT_SCHEMA = REPO_ROOT / "meta_schema.yml"
+DEFAULT_TAGS = REPO_ROOT / "meta_tags.yml"
+BENCH_DIR = DEFAULT_CACHE_DIR / "bench"
+DEFAULT_BASELINE = DEFAULT_CACHE_DIR / "bench_baseline.json"
+DEFAULT_SIZES = (1000, 10000)
+
+# Bump when generate_vault() output changes, so cached vaults are regenerated.
+GENERATOR_VERSION = 1
+
+# Share of notes per kind, roughly as in the real vault.
+KIND_WEIGHTS = {
+    "research": 70,
+    "plan": 6,
+    "plan-section": 6,
+    "concept": 8,
+    "moc": 4,
+    "project": 4,
+    "paper": 2,
+}
+
+RESEARCH_SUBTYPES = ["component", "pr", "issue", "issue-roundup", "design-problem",
+                     "design-spec", "dependency"]
+AREA_TAGS = ["galaxy/api", "galaxy/client", "galaxy/lib", "galaxy/tools", "galaxy/workflows",
+             "galaxy/datasets", "galaxy/collections", "galaxy/models", "galaxy/testing"]
+STATUSES = ["draft", "reviewed", "revised", "stale", "archived"]
+WORDS = ("workflow tool state dataset collection history job invocation schema "
+         "client api model parameter validation conversion upload export import "
+         "runtime format module component interface persistence extraction").split()
+
+# Share of related_notes links whose target links back.
+BACKLINK_RATE = 0.9
+
+
+def _sentence(rng, n=12):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def _summary(rng):
+    return _sentence(rng, rng.randint(6, 14))[:150]
+
+
+def _date(rng):
+    return datetime.date(2025, 1, 1) + datetime.timedelta(days=rng.randrange(500))
+
+
+def _plan_note_kinds(notes, rng):
+    kinds = list(KIND_WEIGHTS)
+    weights = list(KIND_WEIGHTS.values())
+    plan = rng.choices(kinds, weights, k=notes)
+    if "plan" not in plan:
+        plan[0] = "plan"
+    # plan-sections need a plan created before them
+    first_plan = plan.index("plan")
+    for i in range(first_plan):
+        if plan[i] == "plan-section":
+            plan[i] = "concept"
+    return plan
+
+
+def _note_name(kind, subtype, i):
+    if kind == "research":
+        if subtype == "pr":
+            return f"PR {10000 + i} - Synthetic Change {i}"
+        if subtype == "issue":
+            return f"Issue {20000 + i} - Synthetic Bug {i}"
+        return f"{subtype.replace('-', ' ').title()} - Synthetic Topic {i}"
+    if kind == "plan":
+        return f"Plan - Synthetic Feature {i}"
+    if kind == "plan-section":
+        return f"Plan Section - Synthetic Part {i}"
+    if kind == "concept":
+        return f"Concept - Synthetic Idea {i}"
+    if kind == "moc":
+        return f"MOC - Synthetic Map {i}"
+    return f"{kind}_{i:06d}"
+
+
+def _note_path(kind, name):
+    if kind in ("project", "paper"):
+        return Path(f"{kind}s") / name / "index.md"
+    if kind in ("plan", "plan-section"):
+        return Path("plans") / f"{name}.md"
+    return Path("research") / f"{name}.md"
+
+
+def _yaml_list(key, values):
+    if not values:
+        return []
+    return [f"{key}:"] + [f'  - "{v}"' for v in values]
+
+
+def _frontmatter(note, rng):
+    kind, subtype = note["kind"], note["subtype"]
+    tag = {"plan-section": "plan/section"}.get(kind, f"research/{subtype}" if subtype else kind)
+    created = _date(rng)
+    lines = [f"type: {kind}"]
+    if subtype:
+        lines.append(f"subtype: {subtype}")
+    lines += _yaml_list("tags", [tag] + rng.sample(AREA_TAGS, rng.randint(0, 3)))
+    lines += [
+        f"status: {rng.choice(STATUSES)}",
+        f"created: {created}",
+        f"revised: {created + datetime.timedelta(days=rng.randrange(60))}",
+        f"revision: {rng.randint(1, 5)}",
+        f"ai_generated: {'true' if rng.random() < 0.7 else 'false'}",
+        f'summary: "{_summary(rng)}"',
+    ]
+    if subtype == "pr":
+        lines += [f"github_pr: {10000 + note['index']}", "github_repo: galaxyproject/galaxy"]
+    elif subtype == "issue":
+        lines += [f"github_issue: {20000 + note['index']}", "github_repo: galaxyproject/galaxy"]
+    if kind in ("plan", "project", "paper"):
+        lines.append(f'title: "{note["name"]}"')
+    if kind == "plan-section":
+        lines += [f'parent_plan: "[[{note["parent_plan"]}]]"', f"section: Part {note['index']}"]
+    if kind == "paper":
+        lines += [
+            "paper_stage: drafting",
+            "paper_kind: software",
+            f'central_claim: "{_sentence(rng, 10)}"',
+        ]
+        lines += _yaml_list("related_projects", [f"[[{p}]]" for p in note["related_projects"]])
+    lines += _yaml_list("related_notes", [f"[[{r}]]" for r in note["related"]])
+    return "---\n" + "\n".join(lines) + "\n---\n"
+
+
+def _body(note, names, rng):
+    paragraphs = [f"# {note['name']}", ""]
+    for _ in range(rng.randint(2, 6)):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(30, 80))]
+        if names and rng.random() < 0.6:
+            words.insert(rng.randrange(len(words)), f"[[{rng.choice(names)}]]")
+        paragraphs += [" ".join(words).capitalize() + ".", ""]
+    return "\n".join(paragraphs)
+
+
+def _write_paper_files(paper_dir, rng):
+    keys = [f"Author{k} {2000 + k % 25}" for k in range(rng.randint(10, 40))]
+    entries = []
+    for key in keys:
+        entries += [
+            f'"{key}":',
+            "  kind: article",
+            f'  authors: "{key.split()[0]} A, Coauthor B"',
+            f"  year: {key.split()[1]}",
+            f'  title: "{_sentence(rng, 8)}"',
+            "",
+        ]
+    (paper_dir / "references.yml").write_text("\n".join(entries))
+    cited = rng.sample(keys, max(1, len(keys) * 3 // 4))
+    paragraphs = ["# Manuscript", ""]
+    for key in cited:
+        paragraphs += [f"{_sentence(rng, 20)} [{key}]", ""]
+    paragraphs += ["```", "[Not a citation 1999]", "```"]
+    (paper_dir / "manuscript.md").write_text("\n".join(paragraphs) + "\n")
+    (paper_dir / "outline.md").write_text("# Outline\n\n" + _sentence(rng, 40) + "\n")
+
+
+def generate_vault(root, notes, seed=0):
+    """Write a schema-valid synthetic vault of `notes` notes under root (replaced if present)."""
+    root = Path(root)
+    if root.exists():
+        shutil.rmtree(root)
+    rng = random.Random(seed)
+
+    plan = []
+    plans = []
+    projects = []
+    for i, kind in enumerate(_plan_note_kinds(notes, rng)):
+        subtype = rng.choice(RESEARCH_SUBTYPES) if kind == "research" else None
+        name = _note_name(kind, subtype, i)
+        note = {"index": i, "kind": kind, "subtype": subtype, "name": name,
+                "related": [], "related_projects": []}
+        if kind == "plan":
+            plans.append(name)
+        elif kind == "plan-section":
+            note["parent_plan"] = rng.choice(plans)
+        elif kind == "project":
+            projects.append(name)
+        plan.append(note)
+
+    for note in plan:
+        if note["kind"] == "paper" and projects:
+            note["related_projects"] = rng.sample(projects, min(len(projects), rng.randint(1, 3)))
+
+    # related_notes: mostly local neighbourhoods (as topics cluster), a few long-range.
+    for note in plan:
+        for _ in range(rng.choice([0, 1, 2, 2, 3, 3, 4, 5])):
+            if rng.random() < 0.8:
+                j = min(notes - 1, max(0, note["index"] + rng.randint(-50, 50)))
+            else:
+                j = rng.randrange(notes)
+            other = plan[j]
+            if other is note or other["name"] in note["related"]:
+                continue
+            note["related"].append(other["name"])
+            if rng.random() < BACKLINK_RATE and note["name"] not in other["related"]:
+                other["related"].append(note["name"])
+
+    names = [note["name"] for note in plan]
+    for note in plan:
+        path = root / _note_path(note["kind"], note["name"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(_frontmatter(note, rng) + "\n" + _body(note, names, rng))
+        if note["kind"] == "paper":
+            _write_paper_files(path.parent, rng)
+        elif note["kind"] == "project":
+            (path.parent / "PLAN.md").write_text("# Plan\n\n" + _sentence(rng, 40) + "\n")
+    return root
+
+
+def bench_vault_dir(notes, seed=0):
+    """Generated vault of `notes` notes under .cache/bench/, reused when already present."""
+    root = BENCH_DIR / f"vault-{notes}-s{seed}-v{GENERATOR_VERSION}"
+    marker = root / ".complete"
+    if not marker.exists():
+        generate_vault(root, notes, seed)
+        marker.write_text("")
+    return root
+
+
+def _best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmarks(vault_dir, repeat=3):
+    """{benchmark name: best time in seconds} for one vault."""
+    vault_dir = Path(vault_dir)
+    files_meta = [(str(p), load_note(p)["metadata"] or {}) for p in find_md_files(vault_dir)]
+    paper_dirs = sorted(p.parent for p in vault_dir.glob("papers/*/references.yml"))
+
+    def validate():
+        errors, _ = validate_directory(vault_dir, DEFAULT_SCHEMA, DEFAULT_TAGS)
+        if errors:
+            raise RuntimeError(f"synthetic vault {vault_dir} has {errors} validation errors")
+
+    def index():
+        generate_index(collect_notes(vault_dir))
+
+    def references():
+        for paper_dir in paper_dirs:
+            check_paper(paper_dir)
+
+    def bidirectional():
+        validate_inverse_relations(files_meta)
+
+    return {
+        "validate": _best_of(validate, repeat),
+        "index": _best_of(index, repeat),
+        "references": _best_of(references, repeat),
+        "bidirectional": _best_of(bidirectional, repeat),
+    }
+
+
+def available_yaml_backends():
+    """Concrete YAML backends usable here: "python", plus "c" when PyYAML has libyaml."""
+    import yaml
+
+    return ["python"] if yaml_loader("auto") is yaml.SafeLoader else ["python", "c"]
+
+
+def bench_yaml_backends(vault_dir, repeat=3):
+    """{backend: best time in seconds} to parse every note's frontmatter and every references.yml.
+
+    Raises RuntimeError if two backends parse any document differently.
+    """
+    vault_dir = Path(vault_dir)
+    notes = [read_frontmatter_text(p) for p in find_md_files(vault_dir)]
+    references = [read_text(p) for p in sorted(vault_dir.glob("papers/*/references.yml"))]
+
+    def parse_all(backend):
+        return ([parse_note(text, backend) for text in notes],
+                [load_yaml(text, backend) for text in references])
+
+    timings = {}
+    expected = None
+    for backend in available_yaml_backends():
+        parsed = parse_all(backend)
+        if expected is None:
+            expected = parsed
+        elif parsed != expected:
+            raise RuntimeError(f"YAML backend {backend!r} parses {vault_dir} differently")
+        timings[backend] = _best_of(lambda backend=backend: parse_all(backend), repeat)
+    return timings
+
+
+def compare(results, baseline, tolerance):
+    """(size, name, seconds, baseline seconds) for every benchmark slower than baseline * (1 + tolerance)."""
+    regressions = []
+    for size, timings in results.items():
+        for name, seconds in timings.items():
+            base = baseline.get(size, {}).get(name)
+            if base is not None and seconds > base * (1 + tolerance):
+                regressions.append((size, name, seconds, base))
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vault tools on synthetic vaults")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated note counts (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark; the best counts")
+    parser.add_argument("--seed", type=int, default=0, help="generator seed")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="write timings as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown over baseline before flagging (default: 0.25 = 25%%)")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any benchmark regressed")
+    parser.add_argument("--generate", type=Path, metavar="DIR", help="only write a synthetic vault to DIR")
+    parser.add_argument("--notes", type=int, default=1000, help="note count for --generate")
+    parser.add_argument("--yaml-backends", nargs="?", type=Path, const=DEFAULT_VAULT, metavar="VAULT",
+                        help="only compare YAML backends on VAULT (default: %(const)s)")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_vault(args.generate, args.notes, args.seed)
+        print(f"Wrote {args.notes} notes to {args.generate}")
+        return 0
+
+    if args.yaml_backends:
+        timings = bench_yaml_backends(args.yaml_backends, args.repeat)
+        print(f"YAML parsing, {args.yaml_backends}:")
+        for backend, seconds in timings.items():
+            speedup = f"  ({timings['python'] / seconds:.1f}x)" if backend != "python" else ""
+            print(f"  {backend:<8} {seconds:8.3f}s{speedup}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    for size in (int(s) for s in args.sizes.split(",")):
+        vault_dir = bench_vault_dir(size, args.seed)
+        results[str(size)] = timings = run_benchmarks(vault_dir, args.repeat)
+        print(f"\n{size} notes:")
+        for name, seconds in timings.items():
+            base = baseline.get(str(size), {}).get(name)
+            delta = f"  ({(seconds / base - 1) * 100:+.0f}% vs baseline)" if base else ""
+            print(f"  {name:<14} {seconds:8.3f}s{delta}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    for size, name, seconds, base in regressions:
+        print(f"REGRESSION  {size} notes / {name}: {seconds:.3f}s vs baseline {base:.3f}s")
+
+    if args.save_baseline:
+        baseline.update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nSaved baseline to {args.baseline}")
+    if args.check and regressions:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
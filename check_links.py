@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "jsonschema",
+#     "pyyaml",
+# ]
+# ///
+"""Check that every [[...]] link in note bodies and log.md resolves to a note.
+
+Links are resolved exactly as the validator resolves frontmatter link fields
+(slug match, else first note whose slug starts with the label's slug); an
+"|alias" or "#heading" suffix is ignored, and links inside fenced or inline
+code are not links. Per-file link lists come from the link_index.py database,
+so a re-run only re-scans files that changed since the last one.
+
+Usage:
+    uv run check_links.py                  # report dangling body links
+    uv run check_links.py --check          # exit 1 if any link dangles
+    uv run check_links.py vault/log.md     # only report links in these files
+    uv run check_links.py --no-cache       # scan every file from scratch
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from link_index import BODY_FIELD, DEFAULT_DB, DEFAULT_VAULT, LinkIndex
+from vault_notes import NoteCache
+
+
+def dangling_body_links(vault_dir=DEFAULT_VAULT, db_path=DEFAULT_DB, only=None, cache=None):
+    """(path, line, label) of body links that resolve to no note, path relative to vault_dir.
+
+    only: vault-relative posix paths to report on; None reports every file.
+    """
+    with LinkIndex(db_path, vault_dir, cache) as index:
+        index.update()
+        return [
+            (src, line, label)
+            for src, _, label, line in index.dangling(BODY_FIELD)
+            if only is None or src in only
+        ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", type=Path,
+                        help="only report links in these files (default: every note and log.md)")
+    parser.add_argument("--vault", type=Path, default=DEFAULT_VAULT, help="vault directory")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any link dangles")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="scan every file instead of using the .cache/ link index")
+    args = parser.parse_args()
+
+    only = None
+    if args.paths:
+        vault = args.vault.resolve()
+        only = {p.resolve().relative_to(vault).as_posix()
+                for p in args.paths if p.resolve().is_relative_to(vault)}
+
+    if args.no_cache:
+        dangling = dangling_body_links(args.vault, None, only)
+    else:
+        cache = NoteCache()
+        dangling = dangling_body_links(args.vault, DEFAULT_DB, only, cache)
+        cache.save()
+    for src, line, label in dangling:
+        print(f"{src}:{line}: [[{label}]] does not resolve to a note")
+
+    print(f"\nTotal: {len(dangling)} dangling links")
+    if args.check and dangling:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,13 +19,16 @@ Usage:
     uv run check_references.py          # report coverage for every paper
     uv run check_references.py --check  # exit 1 if any errors
     uv run check_references.py vault/papers/gxwf  # one paper
+    uv run check_references.py --no-cache  # re-read every file from scratch
+    uv run check_references.py --trace trace.json  # per-phase timings (Chrome trace JSON)
 """
 import argparse
 import re
 import sys
 from pathlib import Path
 
-import yaml
+from vault_notes import NoteCache, load_parsed, load_yaml
+from vault_trace import span, tracing
 
 REPO_ROOT = Path(__file__).parent
 DEFAULT_PAPERS = REPO_ROOT / "vault" / "papers"
@@ -41,9 +44,14 @@ _FENCE_RE = re.compile(r"```.*?```", re.DOTALL)
 _INLINE_CODE_RE = re.compile(r"`[^`]*`")
 
 
+def _blank(match: re.Match) -> str:
+    return "\n" * match.group().count("\n")
+
+
 def strip_code(text: str) -> str:
-    text = _FENCE_RE.sub("", text)
-    text = _INLINE_CODE_RE.sub("", text)
+    """Drop fenced and inline code, keeping its newlines so line numbers survive."""
+    text = _FENCE_RE.sub(_blank, text)
+    text = _INLINE_CODE_RE.sub(_blank, text)
     return text
 
 
@@ -53,8 +61,8 @@ def extract_cited_keys(manuscript: str) -> set[str]:
     ...) are resolved against the bibliography by the caller, since they are not
     self-identifying."""
     keys: set[str] = set()
-    for span in _CITE_SPAN_RE.finditer(strip_code(manuscript)):
-        for part in span.group(1).split(";"):
+    for cite in _CITE_SPAN_RE.finditer(strip_code(manuscript)):
+        for part in cite.group(1).split(";"):
             part = part.strip()
             if _AUTHOR_YEAR_RE.match(part):
                 keys.add(part)
@@ -64,8 +72,8 @@ def extract_cited_keys(manuscript: str) -> set[str]:
 def extract_bracket_parts(manuscript: str) -> set[str]:
     """All bracket-span parts (used to detect usage of short keys like MCP)."""
     parts: set[str] = set()
-    for span in _CITE_SPAN_RE.finditer(strip_code(manuscript)):
-        for part in span.group(1).split(";"):
+    for cite in _CITE_SPAN_RE.finditer(strip_code(manuscript)):
+        for part in cite.group(1).split(";"):
             parts.add(part.strip())
     return parts
 
@@ -85,12 +93,22 @@ def validate_entry(key: str, entry) -> list[str]:
     return errors
 
 
-def check_paper(paper_dir: Path) -> tuple[list[str], list[str], dict]:
+def _parse_references(text: str):
+    with span("yaml"):
+        return load_yaml(text) or {}
+
+
+def _parse_manuscript(text: str) -> dict:
+    with span("parse-manuscript"):
+        return {"cited": extract_cited_keys(text), "parts": extract_bracket_parts(text)}
+
+
+def check_paper(paper_dir: Path, cache=None) -> tuple[list[str], list[str], dict]:
     """Return (errors, warnings, info) for one paper directory.
 
     info = {"total": N, "cited": M, "backlog": K} where backlog entries are
     bibliography records present but not cited inline (a legitimate candidate
-    pool, not a problem).
+    pool, not a problem). cache is an optional vault_notes.NoteCache.
     """
     errors: list[str] = []
     warnings: list[str] = []
@@ -102,7 +120,7 @@ def check_paper(paper_dir: Path) -> tuple[list[str], list[str], dict]:
     if not manuscript_path.exists() or not refs_path.exists():
         return errors, warnings, info  # not a fully-wired paper; skip silently
 
-    raw = yaml.safe_load(refs_path.read_text(encoding="utf-8")) or {}
+    raw = load_parsed(refs_path, "references", _parse_references, cache)
     if not isinstance(raw, dict):
         return [f"{refs_path}: top-level YAML must be a mapping of keys"], warnings, info
 
@@ -110,16 +128,16 @@ def check_paper(paper_dir: Path) -> tuple[list[str], list[str], dict]:
         errors.extend(f"{refs_path.name}: {e}" for e in validate_entry(key, entry))
 
     bib_keys = set(raw.keys())
-    manuscript = manuscript_path.read_text(encoding="utf-8")
+    manuscript = load_parsed(manuscript_path, "manuscript", _parse_manuscript, cache)
 
     # Author-year citations must resolve.
-    cited_author_year = extract_cited_keys(manuscript)
+    cited_author_year = manuscript["cited"]
     for key in sorted(cited_author_year):
         if key not in bib_keys:
             errors.append(f"manuscript cites [{key}] but references.yml has no entry")
 
     # Short keys (no year) are detected by membership in the bibliography.
-    bracket_parts = extract_bracket_parts(manuscript)
+    bracket_parts = manuscript["parts"]
     used_short_keys = {k for k in bib_keys if not _AUTHOR_YEAR_RE.match(k) and k in bracket_parts}
 
     used = (cited_author_year & bib_keys) | used_short_keys
@@ -130,20 +148,12 @@ def check_paper(paper_dir: Path) -> tuple[list[str], list[str], dict]:
     return errors, warnings, info
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("paths", nargs="*", help="paper dirs (default: all under vault/papers)")
-    parser.add_argument("--check", action="store_true", help="exit 1 if any errors")
-    args = parser.parse_args()
-
-    if args.paths:
-        paper_dirs = [Path(p) for p in args.paths]
-    else:
-        paper_dirs = sorted(p for p in DEFAULT_PAPERS.iterdir() if p.is_dir())
-
+def report_papers(paper_dirs, cache=None) -> int:
+    """Check and print a report for each paper directory; returns the total error count."""
     total_errors = 0
     for paper_dir in paper_dirs:
-        errors, warnings, info = check_paper(paper_dir)
+        with span("check", paper=paper_dir.name):
+            errors, warnings, info = check_paper(paper_dir, cache)
         if not (paper_dir / "references.yml").exists():
             continue
         status = "OK" if not errors else "FAIL"
@@ -154,6 +164,43 @@ def main() -> int:
         for w in warnings:
             print(f"  warn:  {w}")
         total_errors += len(errors)
+    return total_errors
+
+
+def find_papers(papers_dir=DEFAULT_PAPERS) -> list[Path]:
+    """Paper workspace directories under papers_dir, sorted."""
+    return sorted(p for p in Path(papers_dir).iterdir() if p.is_dir())
+
+
+def _check_papers(args) -> int:
+    """Check and report every selected paper; returns the total error count."""
+    cache = None if args.no_cache else NoteCache()
+
+    with span("discovery"):
+        if args.paths:
+            paper_dirs = [Path(p) for p in args.paths]
+        else:
+            paper_dirs = find_papers()
+
+    total_errors = report_papers(paper_dirs, cache)
+
+    if cache is not None:
+        cache.save()
+    return total_errors
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", help="paper dirs (default: all under vault/papers)")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any errors")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-read every file instead of using .cache/notes.pickle")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write per-phase span timings to FILE as Chrome trace event JSON")
+    args = parser.parse_args()
+
+    with tracing(args.trace, "check_references"):
+        total_errors = _check_papers(args)
 
     print(f"\nTotal: {total_errors} errors")
     if args.check and total_errors:
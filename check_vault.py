@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "jsonschema",
+#     "pydantic",
+#     "pyyaml",
+# ]
+# ///
+"""Run every vault check in one process over one loaded vault.
+
+Equivalent to `make validate check-index check-dashboard check-references
+check-architecture-views`, but with one interpreter start-up instead of five.
+The vault is walked once, and every check reads notes through one shared
+NoteCache in snapshot mode, so each file is stat'ed, read and parsed at most
+once per run: the index check reuses the frontmatter the validator parsed.
+
+Usage:
+    uv run check_vault.py                     # run every check
+    uv run check_vault.py validate index      # only these checks
+    uv run check_vault.py --no-cache          # parse everything from scratch
+    uv run check_vault.py --trace trace.json  # per-check, per-phase timings
+
+The architecture check is skipped when the galaxy-architecture submodule is
+not checked out. Exits 1 if any check fails.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from check_references import find_papers, report_papers
+from generate_architecture_views import (
+    TOPICS_SRC,
+    drifted_topics,
+    in_submodule,
+    list_topics,
+)
+from generate_dashboard import DEFAULT_CONFIG, check_dashboard
+from generate_index import (
+    check_index,
+    check_index_shards,
+    collect_notes,
+    has_index_shards,
+)
+from validate_frontmatter import (
+    DEFAULT_RESULTS_CACHE,
+    INDEX_SHARD_DIR,
+    ResultCache,
+    find_md_files,
+    validate_directory,
+)
+from vault_notes import DEFAULT_CACHE, NoteCache
+from vault_trace import span, tracing
+
+REPO_ROOT = Path(__file__).parent
+DEFAULT_VAULT = REPO_ROOT / "vault"
+DEFAULT_SCHEMA = REPO_ROOT / "meta_schema.yml"
+DEFAULT_TAGS = REPO_ROOT / "meta_tags.yml"
+
+PASSED, FAILED, SKIPPED = "ok", "FAILED", "skipped"
+
+
+class Vault:
+    """The vault as loaded for one run: its note paths and the caches every check shares.
+
+    results: optional validate_frontmatter.ResultCache for the validate check.
+    """
+
+    def __init__(self, vault_dir=DEFAULT_VAULT, cache=None, results=None):
+        self.dir = Path(vault_dir)
+        self.cache = cache if cache is not None else NoteCache(None, snapshot=True)
+        self.results = results
+        with span("discovery"):
+            self.paths = list(find_md_files(self.dir))
+
+
+def check_frontmatter(vault):
+    errors, _ = validate_directory(vault.dir, DEFAULT_SCHEMA, DEFAULT_TAGS, vault.cache,
+                                   paths=vault.paths, results=vault.results)
+    return FAILED if errors else PASSED
+
+
+def check_index_page(vault):
+    notes = collect_notes(vault.dir, vault.cache, vault.paths)
+    shard_dir = vault.dir / INDEX_SHARD_DIR
+    if has_index_shards(shard_dir):  # generated with --split
+        if check_index_shards(notes, vault.dir / "Index.md", shard_dir):
+            print("Index.md and its pages are up to date.")
+            return PASSED
+        print("Index.md is out of date. Run 'make index ARGS=--split' to regenerate.")
+        return FAILED
+    if check_index(notes, vault.dir / "Index.md"):
+        print("Index.md is up to date.")
+        return PASSED
+    print("Index.md is out of date. Run 'make index' to regenerate.")
+    return FAILED
+
+
+def check_dashboard_page(vault):
+    with open(DEFAULT_CONFIG) as f:
+        sections = json.load(f)
+    if check_dashboard(sections, vault.dir / "Dashboard.md"):
+        print("Dashboard.md is up to date.")
+        return PASSED
+    print("Dashboard.md is out of date. Run 'make dashboard' to regenerate.")
+    return FAILED
+
+
+def check_paper_references(vault):
+    papers_dir = vault.dir / "papers"
+    if not papers_dir.is_dir():
+        print("No papers.")
+        return SKIPPED
+    total_errors = report_papers(find_papers(papers_dir), vault.cache)
+    print(f"\nTotal: {total_errors} errors")
+    return FAILED if total_errors else PASSED
+
+
+def check_architecture_views(vault):
+    if not TOPICS_SRC.exists():
+        print("galaxy-architecture submodule missing — run `git submodule update --init`.")
+        return SKIPPED
+    with in_submodule():
+        drifted = drifted_topics(list_topics())
+    if drifted:
+        print(f"drift in {len(drifted)} topic(s): {', '.join(drifted)}")
+        print("run `make architecture-views` to regenerate")
+        return FAILED
+    print("Architecture views are up to date.")
+    return PASSED
+
+
+# Run in this order; names are the CLI's check selectors.
+CHECKS = {
+    "validate": check_frontmatter,
+    "index": check_index_page,
+    "dashboard": check_dashboard_page,
+    "references": check_paper_references,
+    "architecture": check_architecture_views,
+}
+
+
+def run_checks(vault, names=None):
+    """Run the named checks (default: all, in CHECKS order) over vault; returns {name: status}."""
+    results = {}
+    for name, check in CHECKS.items():
+        if names and name not in names:
+            continue
+        print(f"\n### {name}")
+        with span(name):
+            results[name] = check(vault)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("checks", nargs="*", metavar="CHECK",
+                        help=f"checks to run (default: all of {', '.join(CHECKS)})")
+    parser.add_argument("--vault", type=Path, default=DEFAULT_VAULT, help="vault directory")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parse every note from scratch instead of using .cache/notes.pickle")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write per-phase span timings to FILE as Chrome trace event JSON")
+    args = parser.parse_args()
+    unknown = [name for name in args.checks if name not in CHECKS]
+    if unknown:
+        parser.error(f"unknown check: {', '.join(unknown)} (choose from {', '.join(CHECKS)})")
+
+    with tracing(args.trace, "check_vault"):
+        cache = NoteCache(None if args.no_cache else DEFAULT_CACHE, snapshot=True)
+        results = None if args.no_cache else ResultCache(DEFAULT_RESULTS_CACHE, DEFAULT_SCHEMA, DEFAULT_TAGS)
+        statuses = run_checks(Vault(args.vault, cache, results), args.checks)
+        cache.save()
+        if results is not None:
+            results.save()
+
+    print(f"\n{'=' * 50}")
+    for name, status in statuses.items():
+        print(f"{name:<14}{status}")
+    return 1 if FAILED in statuses.values() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
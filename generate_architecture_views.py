@@ -15,13 +15,17 @@ Usage:
     uv run generate_architecture_views.py            # regenerate all topics
     uv run generate_architecture_views.py --topic X  # single topic
     uv run generate_architecture_views.py --check    # exit 1 on drift
+    uv run generate_architecture_views.py --trace trace.json  # per-phase timings
 """
 
 import argparse
 import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 
+from vault_trace import span, tracing
+
 REPO_ROOT = Path(__file__).parent.resolve()
 SUBMODULE = REPO_ROOT / "galaxy-architecture"
 TOPICS_SRC = SUBMODULE / "topics"
@@ -33,8 +37,6 @@ UPSTREAM_PAGES_BASE = "https://jmchilton.github.io/galaxy-architecture"
 sys.path.insert(0, str(SUBMODULE / "scripts"))
 sys.path.insert(0, str(SUBMODULE / "outputs" / "sphinx-docs"))
 
-from build import generate_topic_markdown  # noqa: E402
-
 
 def list_topics() -> list[str]:
     return sorted(
@@ -57,7 +59,21 @@ def rewrite_for_vault(markdown: str, topic_id: str) -> str:
     return markdown
 
 
+@contextmanager
+def in_submodule():
+    # Upstream's load_metadata/load_content default to Path("topics") (cwd-relative).
+    previous = os.getcwd()
+    os.chdir(SUBMODULE)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
 def render_topic(topic_id: str) -> str:
+    # Imported here so this module loads (and can report the missing submodule) without it.
+    from build import generate_topic_markdown
+
     topic_dir = TOPICS_SRC / topic_id
     md = generate_topic_markdown(topic_id, topic_dir)
     return rewrite_for_vault(md, topic_id).rstrip() + "\n"
@@ -67,34 +83,52 @@ def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--topic", help="Generate only this topic")
     parser.add_argument("--check", action="store_true", help="Exit 1 on drift (does not write)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write per-phase span timings to FILE as Chrome trace event JSON")
     args = parser.parse_args()
+    with tracing(args.trace, "generate_architecture_views"):
+        return _generate(args)
+
 
+def drifted_topics(topics: list[str]) -> list[str]:
+    """Topics whose vault view differs from a fresh render. Call inside in_submodule()."""
+    drifted: list[str] = []
+    for topic_id in topics:
+        out = VIEWS_DIR / f"{topic_id}.md"
+        with span("render", topic=topic_id):
+            new_content = render_topic(topic_id)
+        with span("read", path=str(out)):
+            current = out.read_text() if out.exists() else ""
+        if current != new_content:
+            drifted.append(topic_id)
+    return drifted
+
+
+def _generate(args) -> int:
     if not TOPICS_SRC.exists():
         print(f"ERROR: submodule missing — run `git submodule update --init` ({TOPICS_SRC})", file=sys.stderr)
         return 2
 
-    # Upstream's load_metadata/load_content default to Path("topics") (cwd-relative).
-    os.chdir(SUBMODULE)
-
-    topics = [args.topic] if args.topic else list_topics()
-    VIEWS_DIR.mkdir(parents=True, exist_ok=True)
+    with in_submodule():
+        with span("discovery"):
+            topics = [args.topic] if args.topic else list_topics()
 
-    drifted: list[str] = []
-    for topic_id in topics:
-        out = VIEWS_DIR / f"{topic_id}.md"
-        new_content = render_topic(topic_id)
         if args.check:
-            current = out.read_text() if out.exists() else ""
-            if current != new_content:
-                drifted.append(topic_id)
-            continue
-        out.write_text(new_content)
-        print(f"wrote vault/projects/architecture/topics/{topic_id}.md")
-
-    if args.check and drifted:
-        print(f"drift in {len(drifted)} topic(s): {', '.join(drifted)}", file=sys.stderr)
-        print("run `make architecture-views` to regenerate", file=sys.stderr)
-        return 1
+            drifted = drifted_topics(topics)
+            if drifted:
+                print(f"drift in {len(drifted)} topic(s): {', '.join(drifted)}", file=sys.stderr)
+                print("run `make architecture-views` to regenerate", file=sys.stderr)
+                return 1
+            return 0
+
+        VIEWS_DIR.mkdir(parents=True, exist_ok=True)
+        for topic_id in topics:
+            out = VIEWS_DIR / f"{topic_id}.md"
+            with span("render", topic=topic_id):
+                new_content = render_topic(topic_id)
+            with span("write", path=str(out)):
+                out.write_text(new_content)
+            print(f"wrote vault/projects/architecture/topics/{topic_id}.md")
     return 0
 
 
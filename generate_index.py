@@ -2,7 +2,6 @@
 # /// script
 # requires-python = ">=3.10"
 # dependencies = [
-#     "python-frontmatter",
 #     "pyyaml",
 # ]
 # ///
@@ -11,25 +10,72 @@
 Usage:
     uv run generate_index.py          # write vault/Index.md
     uv run generate_index.py --check  # exit 1 if file differs from generated
+    uv run generate_index.py --split  # small root Index.md + per-section pages in vault/Index/
+    uv run generate_index.py --no-cache  # parse every note from scratch
+    uv run generate_index.py --trace trace.json  # per-phase timings (Chrome trace JSON)
+
+The note dicts the index is built from are kept in .cache/index.pickle
+(IndexCatalog) together with each rendered section, so a run re-reads only
+the notes whose stat changed and re-renders only the sections they fall in.
+Those notes are read through the parse cache shared with the other vault
+tools (.cache/notes.pickle), which is loaded only when the catalog misses.
 """
 import argparse
+import os
+import pickle
 import re
 import sys
+import tempfile
 from pathlib import Path
 
-import frontmatter
-
-from validate_frontmatter import find_md_files
+from validate_frontmatter import INDEX_SHARD_DIR, find_md_files
+from vault_notes import (
+    DEFAULT_CACHE_DIR,
+    NoteCache,
+    load_note,
+    load_parsed,
+    note_body,
+    parse_note,
+    read_text,
+)
+from vault_trace import span, tracing
 
 REPO_ROOT = Path(__file__).parent
 DEFAULT_VAULT = REPO_ROOT / "vault"
 DEFAULT_OUTPUT = DEFAULT_VAULT / "Index.md"
+DEFAULT_CATALOG = DEFAULT_CACHE_DIR / "index.pickle"
+DEFAULT_SHARD_DIR = DEFAULT_VAULT / INDEX_SHARD_DIR
+
+# Sharded index (--split): page file names start with SHARD_PREFIX, and a
+# section longer than SHARD_PAGE_SIZE notes spans several pages.
+SHARD_PREFIX = "Index - "
+SHARD_PAGE_SIZE = 500
+
+# Bump when note dicts or section rendering change; older catalogs are discarded.
+CATALOG_VERSION = 1
 
 _H1_RE = re.compile(r"^#\s+(.+?)\s*$", re.MULTILINE)
 
-# (type, subtype) -> (section heading, sort_key)
-# Top-level sections rendered in this order.
+# Top-level sections rendered in this order, and the note types each lists.
 TOP_LEVEL_ORDER = ["plans", "projects", "papers", "research", "concepts", "mocs"]
+SECTION_TYPES = {
+    "plans": ("plan", "plan-section"),
+    "projects": ("project",),
+    "papers": ("paper",),
+    "research": ("research",),
+    "concepts": ("concept",),
+    "mocs": ("moc",),
+}
+_SECTION_OF_TYPE = {t: section for section, types in SECTION_TYPES.items() for t in types}
+
+SECTION_HEADINGS = {
+    "plans": "Plans",
+    "projects": "Projects",
+    "papers": "Papers",
+    "research": "Research",
+    "concepts": "Concepts",
+    "mocs": "Maps of Content",
+}
 
 RESEARCH_SUBTYPE_ORDER = [
     "component",
@@ -52,41 +98,193 @@ RESEARCH_SUBTYPE_LABEL = {
 }
 
 
+def _first_h1(body: str):
+    m = _H1_RE.search(body)
+    return m.group(1).strip() if m else None
+
+
 def derive_title(path: Path, body: str) -> str:
     """Prefer first H1 in body; fall back to filename stem."""
-    m = _H1_RE.search(body)
-    if m:
-        return m.group(1).strip()
-    return path.stem
+    return _first_h1(body) or path.stem
+
+
+def _parse_h1(text: str):
+    """Cache parser: first H1 of a whole note's body, or None."""
+    return _first_h1(note_body(text))
+
 
+def note_dict(vault_dir: Path, path: Path, cache=None):
+    """The Index.md view of the note at path, or None if it has no frontmatter.
 
-def collect_notes(vault_dir: Path):
-    """Walk vault and return a list of note dicts with frontmatter + derived title."""
+    Raises ValueError if the frontmatter does not parse.
+    """
+    if cache is None:
+        text = read_text(path)  # one read for frontmatter and title
+        note = parse_note(text)
+        title = _parse_h1(text) if note["frontmatter"] and note["error"] is None else None
+    else:
+        note = load_note(path, cache)  # frontmatter only; body read below for the title
+        title = None
+    if not note["frontmatter"]:
+        return None
+    if note["error"] is not None:
+        raise ValueError(f"{path}: failed to parse frontmatter: {note['error']}")
+    if cache is not None:
+        title = load_parsed(path, "h1", _parse_h1, cache)
+    meta = note["metadata"]
+    rel = path.relative_to(vault_dir)
+    # Workspace index.md files share stem "index"; slug by parent dir instead.
+    if meta.get("type") in ("project", "paper") and path.name == "index.md":
+        slug = path.parent.name
+    else:
+        slug = path.stem
+    return {
+        "slug": slug,
+        "path": rel.as_posix(),
+        "title": title or path.stem,
+        "type": meta.get("type"),
+        "subtype": meta.get("subtype"),
+        "status": meta.get("status"),
+        "summary": meta.get("summary", ""),
+    }
+
+
+def collect_notes(vault_dir: Path, cache=None, paths=None, catalog=None):
+    """Walk vault and return a list of note dicts with frontmatter + derived title.
+
+    cache: optional vault_notes.NoteCache shared with the validator.
+    paths: find_md_files(vault_dir) output, if the caller has already walked the vault.
+    catalog: optional IndexCatalog; notes whose stat it has seen are not read.
+    """
+    if paths is None:
+        with span("discovery"):
+            paths = list(find_md_files(vault_dir))
+    if catalog is not None:
+        return catalog.collect(vault_dir, paths, cache)
     notes = []
-    for path in find_md_files(vault_dir):
-        text = path.read_text(encoding="utf-8")
-        if not frontmatter.checks(text):
-            continue
-        post = frontmatter.loads(text)
-        meta = post.metadata
-        rel = path.relative_to(vault_dir)
-        # Workspace index.md files share stem "index"; slug by parent dir instead.
-        if meta.get("type") in ("project", "paper") and path.name == "index.md":
-            slug = path.parent.name
-        else:
-            slug = path.stem
-        notes.append({
-            "slug": slug,
-            "path": rel.as_posix(),
-            "title": derive_title(path, post.content),
-            "type": meta.get("type"),
-            "subtype": meta.get("subtype"),
-            "status": meta.get("status"),
-            "summary": meta.get("summary", ""),
-        })
+    for path in paths:
+        note = note_dict(vault_dir, path, cache)
+        if note is not None:
+            notes.append(note)
     return notes
 
 
+def section_of(note):
+    """Key of the TOP_LEVEL_ORDER section listing note, or None if none does."""
+    return _SECTION_OF_TYPE.get(note.get("type"))
+
+
+class IndexCatalog:
+    """Persisted note dicts and rendered sections behind Index.md.
+
+    Entries are keyed by vault-relative path and validated by mtime and size,
+    like NoteCache, but hold only the seven fields collect_notes() returns,
+    so loading the catalog costs little however large the notes are.
+    collect() marks the sections of added, changed and removed notes dirty;
+    render() re-renders only those and reuses the rest.
+    """
+
+    def __init__(self, path=DEFAULT_CATALOG):
+        self.path = Path(path) if path is not None else None
+        self._vault = None
+        self._entries = {}   # relpath -> (mtime_ns, size, note dict or None)
+        self._sections = {}  # section key -> rendered lines
+        self.dirty = set(TOP_LEVEL_ORDER)
+        self._changed = False
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "rb") as f, span("cache-load"):
+                payload = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == CATALOG_VERSION:
+            self._vault = payload["vault"]
+            self._entries = payload["entries"]
+            self._sections = payload["sections"]
+            self.dirty = payload["dirty"]
+
+    def _mark(self, note):
+        if note is not None and section_of(note) is not None:
+            self.dirty.add(section_of(note))
+
+    def stale(self, vault_dir, paths):
+        """True if collect() would have to read any of paths (new or changed since the last run)."""
+        vault_dir = Path(vault_dir)
+        if str(vault_dir.resolve()) != self._vault:
+            return True
+        for path in paths:
+            entry = self._entries.get(path.relative_to(vault_dir).as_posix())
+            if entry is None:
+                return True
+            st = os.stat(path)
+            if entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+                return True
+        return False
+
+    def collect(self, vault_dir, paths, cache=None):
+        """collect_notes() over paths, reading only notes whose stat changed since the last run."""
+        vault_dir = Path(vault_dir)
+        vault = str(vault_dir.resolve())
+        if vault != self._vault:
+            self._vault = vault
+            self._entries = {}
+            self._sections = {}
+            self.dirty = set(TOP_LEVEL_ORDER)
+            self._changed = True
+        notes = []
+        seen = set()
+        for path in paths:
+            rel = path.relative_to(vault_dir).as_posix()
+            seen.add(rel)
+            st = os.stat(path)
+            entry = self._entries.get(rel)
+            if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                note = entry[2]
+            else:
+                note = note_dict(vault_dir, path, cache)
+                if entry is None or entry[2] != note:
+                    self._mark(entry and entry[2])
+                    self._mark(note)
+                self._entries[rel] = (st.st_mtime_ns, st.st_size, note)
+                self._changed = True
+            if note is not None:
+                notes.append(note)
+        for rel in self._entries.keys() - seen:
+            self._mark(self._entries.pop(rel)[2])
+            self._changed = True
+        return notes
+
+    def render(self, notes):
+        """generate_index(notes), re-rendering only the dirty sections."""
+        clean = {key: lines for key, lines in self._sections.items() if key not in self.dirty}
+        with span("render", sections=len(TOP_LEVEL_ORDER) - len(clean)):
+            sections = render_sections(notes, clean)
+        if self.dirty:
+            self._sections = sections
+            self.dirty = set()
+            self._changed = True
+        return _assemble(len(notes), sections)
+
+    def save(self):
+        """Write the catalog atomically if anything changed."""
+        if not self._changed or self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f, span("cache-save"):
+                pickle.dump({"version": CATALOG_VERSION, "vault": self._vault,
+                             "entries": self._entries, "sections": self._sections,
+                             "dirty": self.dirty},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._changed = False
+
+
 def _entry_line(note):
     """Render a single bullet: `- [[slug]] — summary [*(status)*]`."""
     line = f"- [[{note['slug']}]] — {note['summary']}"
@@ -96,83 +294,186 @@ def _entry_line(note):
     return line
 
 
-def generate_index(notes):
-    """Build Index.md content from a list of note dicts."""
-    by_type = {t: [] for t in ("plan", "plan-section", "project", "paper", "research", "concept", "moc")}
+def render_section(key, notes):
+    """Lines of the TOP_LEVEL_ORDER section key listing notes (those whose section_of() is key)."""
+    if not notes:
+        return []
+    lines = [f"## {SECTION_HEADINGS[key]}", ""]
+    if key == "research":
+        for label, group in _research_groups(notes):
+            lines.append(f"### {label}")
+            lines.append("")
+            for n in group:
+                lines.append(_entry_line(n))
+            lines.append("")
+    else:
+        for n in _sorted_section(key, notes):
+            lines.append(_entry_line(n))
+        lines.append("")
+    return lines
+
+
+def _sorted_section(key, notes):
+    """notes of a non-research section in listing order; plan-sections follow the plans."""
+    if key == "plans":
+        return sorted(notes, key=lambda n: (n["type"] != "plan", n["title"].lower()))
+    return sorted(notes, key=lambda n: n["title"].lower())
+
+
+def _research_groups(notes):
+    """(label, notes sorted by title) per research subtype, in RESEARCH_SUBTYPE_ORDER then by name."""
+    by_subtype = {}
     for n in notes:
-        t = n.get("type")
-        if t in by_type:
-            by_type[t].append(n)
+        by_subtype.setdefault(n.get("subtype") or "other", []).append(n)
+    ordered = [st for st in RESEARCH_SUBTYPE_ORDER if st in by_subtype]
+    ordered += sorted(st for st in by_subtype if st not in RESEARCH_SUBTYPE_ORDER)
+    return [
+        (RESEARCH_SUBTYPE_LABEL.get(st, st.replace("-", " ").title()),
+         sorted(by_subtype[st], key=lambda n: n["title"].lower()))
+        for st in ordered
+    ]
+
+
+def render_sections(notes, rendered=None):
+    """{section key: lines} for every TOP_LEVEL_ORDER section, reusing those given in rendered."""
+    rendered = rendered or {}
+    by_section = {key: [] for key in TOP_LEVEL_ORDER if key not in rendered}
+    for n in notes:
+        key = section_of(n)
+        if key in by_section:
+            by_section[key].append(n)
+    return {key: rendered[key] if key in rendered else render_section(key, by_section[key])
+            for key in TOP_LEVEL_ORDER}
 
-    for lst in by_type.values():
-        lst.sort(key=lambda n: n["title"].lower())
 
+def _assemble(count, sections):
     lines = ["# Galaxy Brain Index", ""]
-    lines.append(f"*{len(notes)} notes. Auto-generated — run `make index` to refresh.*")
+    lines.append(f"*{count} notes. Auto-generated — run `make index` to refresh.*")
     lines.append("")
+    for key in TOP_LEVEL_ORDER:
+        lines.extend(sections[key])
+    return "\n".join(lines).rstrip() + "\n"
 
-    # Plans (includes plan-sections as sub-bullets under their parent, or flat)
-    plans = by_type["plan"] + by_type["plan-section"]
-    if plans:
-        lines.append("## Plans")
-        lines.append("")
-        for n in sorted(plans, key=lambda n: (n["type"] != "plan", n["title"].lower())):
-            lines.append(_entry_line(n))
-        lines.append("")
 
-    if by_type["project"]:
-        lines.append("## Projects")
-        lines.append("")
-        for n in by_type["project"]:
-            lines.append(_entry_line(n))
-        lines.append("")
+def generate_index(notes):
+    """Build Index.md content from a list of note dicts."""
+    return _assemble(len(notes), render_sections(notes))
 
-    if by_type["paper"]:
-        lines.append("## Papers")
-        lines.append("")
-        for n in by_type["paper"]:
-            lines.append(_entry_line(n))
-        lines.append("")
 
-    if by_type["research"]:
-        lines.append("## Research")
-        lines.append("")
-        by_subtype = {}
-        for n in by_type["research"]:
-            by_subtype.setdefault(n.get("subtype") or "other", []).append(n)
-        ordered = [st for st in RESEARCH_SUBTYPE_ORDER if st in by_subtype]
-        ordered += sorted(st for st in by_subtype if st not in RESEARCH_SUBTYPE_ORDER)
-        for st in ordered:
-            label = RESEARCH_SUBTYPE_LABEL.get(st, st.replace("-", " ").title())
-            lines.append(f"### {label}")
-            lines.append("")
-            for n in sorted(by_subtype[st], key=lambda n: n["title"].lower()):
-                lines.append(_entry_line(n))
-            lines.append("")
+def index_shards(notes, page_size=SHARD_PAGE_SIZE):
+    """Yield (section key, page name, heading, notes) for each page of the sharded index, in Index.md order.
 
-    if by_type["concept"]:
-        lines.append("## Concepts")
-        lines.append("")
-        for n in by_type["concept"]:
-            lines.append(_entry_line(n))
-        lines.append("")
+    One shard per top-level section, except research, which gets one per
+    subtype; a shard over page_size notes is split into numbered pages
+    ("Index - Plans", "Index - Plans 2", ...) so no page grows without bound.
+    """
+    by_section = {key: [] for key in TOP_LEVEL_ORDER}
+    for n in notes:
+        key = section_of(n)
+        if key is not None:
+            by_section[key].append(n)
+    for key in TOP_LEVEL_ORDER:
+        if key == "research":
+            groups = [(f"{SECTION_HEADINGS[key]} - {label}", group)
+                      for label, group in _research_groups(by_section[key])]
+        elif by_section[key]:
+            groups = [(SECTION_HEADINGS[key], _sorted_section(key, by_section[key]))]
+        else:
+            groups = []
+        for heading, group in groups:
+            for start in range(0, len(group), page_size):
+                page = start // page_size + 1
+                name = f"{SHARD_PREFIX}{heading}" + (f" {page}" if page > 1 else "")
+                yield key, name, heading, group[start:start + page_size]
 
-    if by_type["moc"]:
-        lines.append("## Maps of Content")
-        lines.append("")
-        for n in by_type["moc"]:
-            lines.append(_entry_line(n))
-        lines.append("")
 
-    return "\n".join(lines).rstrip() + "\n"
+def _root_lines(count, pages):
+    """Lines of the root Index.md of a sharded index; pages: index_shards() output."""
+    lines = ["# Galaxy Brain Index", ""]
+    lines.append(f"*{count} notes. Auto-generated — run `make index` to refresh.*")
+    current = None
+    for key, name, _, page_notes in pages:
+        if key != current:
+            lines.extend(["", f"## {SECTION_HEADINGS[key]}", ""])
+            current = key
+        lines.append(f"- [[{name}]] — {len(page_notes)} notes")
+    return lines
+
+
+def _shard_lines(heading, page_notes):
+    yield f"# {heading}"
+    yield ""
+    yield f"*{len(page_notes)} notes. Auto-generated — run `make index` to refresh.*"
+    yield ""
+    for n in page_notes:
+        yield _entry_line(n)
+
+
+def write_index_shards(notes, output_path, shard_dir, page_size=SHARD_PAGE_SIZE):
+    """Write a root index to output_path and one page per index_shards() entry to shard_dir.
+
+    Pages are streamed line by line; stale "Index - *.md" pages in shard_dir
+    are removed. Returns the number of pages written.
+    """
+    shard_dir = Path(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    pages = []
+    for key, name, heading, page_notes in index_shards(notes, page_size):
+        path = shard_dir / f"{name}.md"
+        with span("write", path=str(path)), open(path, "w", encoding="utf-8") as f:
+            for line in _shard_lines(heading, page_notes):
+                f.write(line + "\n")
+        pages.append((key, name, heading, page_notes))
+    written = {f"{name}.md" for _, name, _, _ in pages}
+    for stale in shard_dir.glob(f"{SHARD_PREFIX}*.md"):
+        if stale.name not in written:
+            stale.unlink()
+    with span("write", path=str(output_path)):
+        Path(output_path).write_text("\n".join(_root_lines(len(notes), pages)) + "\n", encoding="utf-8")
+    return len(pages)
+
+
+def has_index_shards(shard_dir):
+    """True if shard_dir holds pages of a --split index."""
+    return any(Path(shard_dir).glob(f"{SHARD_PREFIX}*.md"))
+
+
+def remove_index_shards(shard_dir):
+    """Delete the pages of an earlier --split run, and shard_dir itself once empty."""
+    shard_dir = Path(shard_dir)
+    for page in shard_dir.glob(f"{SHARD_PREFIX}*.md"):
+        page.unlink()
+    try:
+        shard_dir.rmdir()
+    except OSError:
+        pass  # missing, or holds other files
+
+
+def check_index_shards(notes, output_path, shard_dir, page_size=SHARD_PAGE_SIZE):
+    """True if output_path and shard_dir hold exactly what write_index_shards() would write."""
+    shard_dir = Path(shard_dir)
+    pages = list(index_shards(notes, page_size))
+    expected = {shard_dir / f"{name}.md": "\n".join(_shard_lines(heading, page_notes)) + "\n"
+                for _, name, heading, page_notes in pages}
+    expected[Path(output_path)] = "\n".join(_root_lines(len(notes), pages)) + "\n"
+    if set(shard_dir.glob(f"{SHARD_PREFIX}*.md")) != set(expected) - {Path(output_path)}:
+        return False
+    for path, content in expected.items():
+        if not path.exists() or path.read_text(encoding="utf-8") != content:
+            return False
+    return True
 
 
-def check_index(notes, output_path=None):
+def check_index(notes, output_path=None, expected=None):
+    """True if output_path holds the Index.md for notes (expected: that content, if already rendered)."""
     output_path = Path(output_path or DEFAULT_OUTPUT)
-    expected = generate_index(notes)
+    if expected is None:
+        with span("render"):
+            expected = generate_index(notes)
     if not output_path.exists():
         return False
-    actual = output_path.read_text(encoding="utf-8")
+    with span("read", path=str(output_path)):
+        actual = output_path.read_text(encoding="utf-8")
     return actual == expected
 
 
@@ -184,20 +485,54 @@ def main():
                         help=f"Vault directory (default: {DEFAULT_VAULT})")
     parser.add_argument("--output", default=str(DEFAULT_OUTPUT),
                         help=f"Output file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--split", action="store_true",
+                        help="Write a root index linking one page per section (and research subtype)")
+    parser.add_argument("--shard-dir", default=str(DEFAULT_SHARD_DIR),
+                        help=f"Directory for --split pages (default: {DEFAULT_SHARD_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parse every note from scratch instead of using .cache/index.pickle "
+                             "and .cache/notes.pickle")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write per-phase span timings to FILE as Chrome trace event JSON")
     args = parser.parse_args()
 
-    notes = collect_notes(Path(args.vault))
-
-    if args.check:
-        if check_index(notes, args.output):
-            print("Index.md is up to date.")
+    with tracing(args.trace, "generate_index"):
+        vault = Path(args.vault)
+        catalog = IndexCatalog(None if args.no_cache else DEFAULT_CATALOG)
+        with span("discovery"):
+            paths = list(find_md_files(vault))
+        cache = None
+        if not args.no_cache and catalog.stale(vault, paths):
+            cache = NoteCache()
+        notes = collect_notes(vault, cache, paths, catalog)
+        if cache is not None:
+            cache.save()
+        if args.split:
+            catalog.save()
+            if args.check:
+                if check_index_shards(notes, args.output, args.shard_dir):
+                    print("Index.md and its pages are up to date.")
+                else:
+                    print("Index.md is out of date. Run 'make index ARGS=--split' to regenerate.")
+                    sys.exit(1)
+            else:
+                pages = write_index_shards(notes, args.output, args.shard_dir)
+                print(f"Wrote {args.output} and {pages} pages in {args.shard_dir} ({len(notes)} notes)")
+            return
+        content = catalog.render(notes)
+        catalog.save()
+
+        if args.check:
+            if check_index(notes, args.output, content):
+                print("Index.md is up to date.")
+            else:
+                print("Index.md is out of date. Run 'make index' to regenerate.")
+                sys.exit(1)
         else:
-            print("Index.md is out of date. Run 'make index' to regenerate.")
-            sys.exit(1)
-    else:
-        content = generate_index(notes)
-        Path(args.output).write_text(content, encoding="utf-8")
-        print(f"Wrote {args.output} ({len(notes)} notes)")
+            with span("write", path=args.output):
+                Path(args.output).write_text(content, encoding="utf-8")
+            remove_index_shards(args.shard_dir)  # left by an earlier --split run
+            print(f"Wrote {args.output} ({len(notes)} notes)")
 
 
 if __name__ == "__main__":
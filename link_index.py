@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "jsonschema",
+#     "pyyaml",
+# ]
+# ///
+"""Persistent wiki-link graph of the vault, stored in SQLite.
+
+Records every wiki link of every note -- the frontmatter WIKI_LINK_FIELDS and
+[[...]] links in the body -- as an edge resolved to the target note's path
+(NULL when the link is dangling). LINK_SOURCES such as log.md are scanned for
+body links too, but are not notes and cannot be linked to.
+
+The database lives in .cache/links.sqlite and is updated incrementally:
+unchanged files cost one stat(), touched files are re-hashed, and only files
+whose content changed are re-parsed. Links are re-resolved for the changed
+files only, or for every file when files were added or removed (which can
+change what a prefix link resolves to).
+
+Usage:
+    uv run link_index.py                     # update the index
+    uv run link_index.py backlinks "[[Note]]"  # notes linking to Note (name or path)
+    uv run link_index.py dangling            # links that resolve to no note
+    uv run link_index.py orphans             # notes no other file links to
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+from check_references import strip_code
+from validate_frontmatter import WIKI_LINK_FIELDS, find_md_files
+from vault_notes import (
+    DEFAULT_CACHE_DIR,
+    REPO_ROOT,
+    NoteCache,
+    load_note,
+    note_body,
+    parse_note,
+    read_text,
+)
+from wiki_links import SlugIndex, body_links, note_stem, slugify, strip_brackets
+
+DEFAULT_VAULT = REPO_ROOT / "vault"
+DEFAULT_DB = DEFAULT_CACHE_DIR / "links.sqlite"
+
+# Bump when the tables or link extraction change; older databases are rebuilt.
+SCHEMA_VERSION = 2
+
+# links.field for [[...]] links found in the note body.
+BODY_FIELD = "body"
+
+# Vault files outside find_md_files() whose body links are indexed too.
+LINK_SOURCES = ("log.md",)
+
+_SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    is_note INTEGER NOT NULL,
+    slug TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX files_slug ON files (slug);
+CREATE TABLE links (
+    src TEXT NOT NULL,
+    field TEXT NOT NULL,
+    label TEXT NOT NULL,
+    line INTEGER,
+    target TEXT
+);
+CREATE INDEX links_src ON links (src);
+CREATE INDEX links_target ON links (target);
+"""
+
+
+def extract_links(text, metadata=None):
+    """(field, label, line) for every wiki link in a note's full text, in order.
+
+    Frontmatter fields come first, in WIKI_LINK_FIELDS order and with line None;
+    values that are not "[[...]]" strings are left to the validator. Body links
+    carry their 1-based line number; links inside code are ignored. metadata,
+    when given, is the already parsed frontmatter of text.
+    """
+    links = []
+    if metadata is None:
+        metadata = parse_note(text)["metadata"]
+    metadata = metadata or {}
+    for field, kind in WIKI_LINK_FIELDS.items():
+        value = metadata.get(field)
+        values = [value] if kind == "single" else value
+        if not isinstance(values, list):
+            continue
+        for v in values:
+            label = strip_brackets(v)
+            if label:
+                links.append((field, label, None))
+    body = note_body(text)
+    if not body:
+        return links
+    # note_body() strips, so the body ends where the stripped text does.
+    line = text.count("\n", 0, len(text.rstrip()) - len(body)) + 1
+    body = strip_code(body)
+    pos = 0
+    for offset, label in body_links(body):
+        line += body.count("\n", pos, offset)
+        pos = offset
+        links.append((BODY_FIELD, label, line))
+    return links
+
+
+class LinkIndex:
+    """SQLite-backed link graph of the notes under vault_dir.
+
+    Paths are stored relative to vault_dir, in posix form. Call update() to sync
+    the database with the files on disk before querying. db_path None keeps the
+    index in memory for a one-off run. A NoteCache, when given, supplies parsed
+    frontmatter shared with the other vault tools instead of re-parsing it.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB, vault_dir=DEFAULT_VAULT, cache=None):
+        self.db_path = db_path and Path(db_path)
+        self.vault_dir = Path(vault_dir)
+        self.cache = cache
+        if self.db_path is None:
+            self.conn = sqlite3.connect(":memory:")
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._create()
+
+    def _create(self):
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS notes")
+            self.conn.execute("DROP TABLE IF EXISTS files")
+            self.conn.execute("DROP TABLE IF EXISTS links")
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def update(self):
+        """Sync the index with the vault.
+
+        Returns counts of notes, changed files and removed files.
+        """
+        paths = list(find_md_files(self.vault_dir))
+        note_count = len(paths)
+        paths.extend(p for p in (self.vault_dir / name for name in LINK_SOURCES) if p.is_file())
+        rels = [path.relative_to(self.vault_dir).as_posix() for path in paths]
+        stored = {
+            row[0]: row[1:]
+            for row in self.conn.execute("SELECT path, position, mtime_ns, size, sha256 FROM files")
+        }
+        removed = stored.keys() - set(rels)
+        added = set(rels) - stored.keys()
+        changed = []
+        with self.conn:
+            for position, (path, rel) in enumerate(zip(paths, rels)):
+                st = os.stat(path)
+                old = stored.get(rel)
+                if old and old[1:3] == (st.st_mtime_ns, st.st_size):
+                    if old[0] != position:
+                        self.conn.execute("UPDATE files SET position = ? WHERE path = ?",
+                                          (position, rel))
+                    continue
+                text = read_text(path)
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (rel, position < note_count, slugify(note_stem(rel)), position,
+                     st.st_mtime_ns, st.st_size, digest),
+                )
+                if old and old[3] == digest:
+                    continue
+                changed.append(rel)
+                self.conn.execute("DELETE FROM links WHERE src = ?", (rel,))
+                self.conn.executemany(
+                    "INSERT INTO links (src, field, label, line) VALUES (?, ?, ?, ?)",
+                    [(rel, *link) for link in extract_links(text, self._metadata(path))],
+                )
+            for rel in removed:
+                self.conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+                self.conn.execute("DELETE FROM links WHERE src = ?", (rel,))
+
+            if added or removed:
+                self._resolve(None)
+            elif changed:
+                self._resolve(changed)
+        return {"notes": note_count, "changed": len(changed), "removed": len(removed)}
+
+    def _metadata(self, path):
+        if self.cache is None:
+            return None
+        return load_note(path, self.cache)["metadata"] or {}
+
+    def _slug_index(self):
+        # Same construction as the validator's slug map: vault order, one entry per slug.
+        rows = self.conn.execute("SELECT slug, path FROM files WHERE is_note ORDER BY position")
+        return SlugIndex(rows)
+
+    def _resolve(self, sources):
+        """Re-resolve link targets of the given source notes (None: every note)."""
+        index = self._slug_index()
+        if sources is None:
+            rows = self.conn.execute("SELECT rowid, label FROM links").fetchall()
+        else:
+            rows = []
+            for src in sources:
+                rows.extend(self.conn.execute("SELECT rowid, label FROM links WHERE src = ?", (src,)))
+        targets = {}
+        for rowid, label in rows:
+            if label not in targets:
+                targets[label] = index.resolve_slug(slugify(label))
+        self.conn.executemany(
+            "UPDATE links SET target = ? WHERE rowid = ?",
+            [(targets[label], rowid) for rowid, label in rows],
+        )
+
+    def resolve(self, note):
+        """Path of the note named by a "[[label]]", a bare label or a vault-relative path."""
+        if self.conn.execute("SELECT 1 FROM files WHERE is_note AND path = ?", (note,)).fetchone():
+            return note
+        slug = slugify(strip_brackets(note) or note)
+        if not slug:
+            return None
+        # Mirrors SlugIndex.resolve_slug: exact slug, else the earliest note with the
+        # prefix; a slug shared by several notes maps to the last of them.
+        # Slugs are ASCII, so bumping the last character bounds the prefix range.
+        end = slug[:-1] + chr(ord(slug[-1]) + 1)
+        first = self.conn.execute(
+            "SELECT slug FROM files WHERE is_note AND slug >= ? AND slug < ? "
+            "ORDER BY slug != ?, position LIMIT 1",
+            (slug, end, slug),
+        ).fetchone()
+        if first is None:
+            return None
+        row = self.conn.execute(
+            "SELECT path FROM files WHERE is_note AND slug = ? ORDER BY position DESC LIMIT 1",
+            first,
+        ).fetchone()
+        return row[0]
+
+    def backlinks(self, note):
+        """(src, field, label, line) of links from other files to note, or None if note is unknown."""
+        target = self.resolve(note)
+        if target is None:
+            return None
+        return self.conn.execute(
+            "SELECT src, field, label, line FROM links WHERE target = ? AND src != target "
+            "ORDER BY src, rowid",
+            (target,),
+        ).fetchall()
+
+    def dangling(self, field=None):
+        """(src, field, label, line) of links that resolve to no note, optionally of one field."""
+        return self.conn.execute(
+            "SELECT src, field, label, line FROM links "
+            "WHERE target IS NULL AND (? IS NULL OR field = ?) ORDER BY src, rowid",
+            (field, field),
+        ).fetchall()
+
+    def orphans(self):
+        """Paths of notes that no other file links to."""
+        return [row[0] for row in self.conn.execute(
+            "SELECT path FROM files WHERE is_note AND path NOT IN "
+            "(SELECT target FROM links WHERE target IS NOT NULL AND target != src) "
+            "ORDER BY path"
+        )]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the vault's wiki-link graph")
+    parser.add_argument("--vault", type=Path, default=DEFAULT_VAULT, help="vault directory")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="SQLite index file")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="parse frontmatter instead of reusing .cache/notes.pickle")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("update", help="sync the index with the vault (default)")
+    backlinks = sub.add_parser("backlinks", help="notes linking to NOTE")
+    backlinks.add_argument("note", help='"[[Note]]", note name, or vault-relative path')
+    sub.add_parser("dangling", help="links that resolve to no note")
+    sub.add_parser("orphans", help="notes no other file links to")
+    args = parser.parse_args()
+    cache = None if args.no_cache else NoteCache()
+
+    with LinkIndex(args.db, args.vault, cache) as index:
+        stats = index.update()
+        if cache is not None:
+            cache.save()
+        if args.command in (None, "update"):
+            print(f"Notes: {stats['notes']}  Changed: {stats['changed']}  Removed: {stats['removed']}")
+        elif args.command == "backlinks":
+            links = index.backlinks(args.note)
+            if links is None:
+                print(f"No note matches {args.note}", file=sys.stderr)
+                return 1
+            for src, field, label, line in links:
+                print(f"{src}\t{field}")
+        elif args.command == "dangling":
+            for src, field, label, line in index.dangling():
+                print(f"{src}\t{field}\t[[{label}]]")
+        elif args.command == "orphans":
+            for path in index.orphans():
+                print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "jsonschema",
+#     "pyyaml",
+# ]
+# ///
+"""Ranked full-text search over the vault.
+
+Indexes the title (first H1, else file name), frontmatter summary and tags,
+and body of every vault document in an SQLite FTS5 table at
+.cache/search.sqlite, and ranks matches with BM25, weighting title hits above
+summary and tag hits above body hits. Each search first syncs the index:
+unchanged files cost one stat(), and only files whose content changed are
+re-indexed.
+
+The FTS5 table is contentless, so it holds only the inverted index. The
+indexed text is kept zlib-compressed beside it, which FTS5 needs to remove a
+document's old terms when it changes.
+
+Usage:
+    uv run search_vault.py tool state validation     # top 10 documents
+    uv run search_vault.py -n 3 "workflow extraction"  # top 3
+    uv run search_vault.py --rebuild                 # re-index everything
+
+A query matches documents containing all of its words; if none do, documents
+containing any of them are ranked instead. Words match by stem ("workflows"
+finds "workflow").
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import zlib
+from pathlib import Path
+
+from generate_index import derive_title
+from validate_frontmatter import INDEX_SHARD_DIR, SKIP_FILES
+from vault_notes import (
+    DEFAULT_CACHE_DIR,
+    REPO_ROOT,
+    list_md_files,
+    note_body,
+    parse_note,
+    read_text,
+)
+
+DEFAULT_VAULT = REPO_ROOT / "vault"
+DEFAULT_DB = DEFAULT_CACHE_DIR / "search.sqlite"
+
+# Bump when the tables or the indexed text change; older databases are rebuilt.
+SCHEMA_VERSION = 1
+
+# BM25 column weights, in docs column order (title, summary, tags, body).
+WEIGHTS = (10.0, 5.0, 5.0, 1.0)
+
+_SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    fields BLOB NOT NULL
+);
+CREATE VIRTUAL TABLE docs USING fts5 (
+    title, summary, tags, body,
+    content = '',
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _is_skipped_dir(name):
+    return name.startswith(".") or name == "templates"
+
+
+def find_documents(vault_dir):
+    """Yield every searchable .md file: all of the vault but hidden dirs, templates/, the index pages and SKIP_FILES.
+
+    Unlike find_md_files(), workspace sub-documents (projects/*/PLAN.md, ...) are included.
+    """
+    vault_dir = Path(vault_dir)
+    for path in list_md_files(vault_dir, _is_skipped_dir):
+        parts = path.relative_to(vault_dir).parts
+        if any(p.startswith(".") or p == "templates" for p in parts):
+            continue
+        if len(parts) == 1 and parts[0] in SKIP_FILES:
+            continue
+        if len(parts) > 1 and parts[0] == INDEX_SHARD_DIR:
+            continue
+        yield path
+
+
+def document_fields(path, text):
+    """(title, summary, tags, body) to index for a document's full text."""
+    metadata = parse_note(text)["metadata"] or {}
+    body = note_body(text)
+    summary = metadata.get("summary")
+    tags = metadata.get("tags")
+    return (
+        derive_title(Path(path), body),
+        summary if isinstance(summary, str) else "",
+        " ".join(str(t) for t in tags) if isinstance(tags, list) else "",
+        body,
+    )
+
+
+def fts_query(text, any_word=False):
+    """FTS5 MATCH expression for free text: every word quoted, all required unless any_word."""
+    words = [f'"{w}"' for w in _WORD_RE.findall(text)]
+    return (" OR " if any_word else " ").join(words)
+
+
+class SearchIndex:
+    """FTS5 index of the documents under vault_dir; paths are vault-relative posix."""
+
+    def __init__(self, db_path=DEFAULT_DB, vault_dir=DEFAULT_VAULT):
+        self.db_path = Path(db_path)
+        self.vault_dir = Path(vault_dir)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.rebuild()
+
+    def rebuild(self):
+        """Drop every indexed document; the next update() re-indexes the vault."""
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS files")
+            self.conn.execute("DROP TABLE IF EXISTS docs")
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _unindex(self, doc_id):
+        # A contentless table forgets a row only when given the exact text it indexed.
+        (blob,) = self.conn.execute("SELECT fields FROM files WHERE id = ?", (doc_id,)).fetchone()
+        self.conn.execute(
+            "INSERT INTO docs (docs, rowid, title, summary, tags, body) VALUES ('delete', ?, ?, ?, ?, ?)",
+            (doc_id, *json.loads(zlib.decompress(blob))),
+        )
+
+    def update(self):
+        """Sync the index with the vault. Returns counts of documents, changed and removed."""
+        stored = {
+            row[0]: row[1:]
+            for row in self.conn.execute("SELECT path, id, mtime_ns, size, sha256 FROM files")
+        }
+        seen = set()
+        changed = 0
+        with self.conn:
+            for path in find_documents(self.vault_dir):
+                rel = path.relative_to(self.vault_dir).as_posix()
+                seen.add(rel)
+                st = os.stat(path)
+                old = stored.get(rel)
+                if old and old[1:3] == (st.st_mtime_ns, st.st_size):
+                    continue
+                text = read_text(path)
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if old and old[3] == digest:
+                    self.conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                                      (st.st_mtime_ns, st.st_size, old[0]))
+                    continue
+                changed += 1
+                if old:
+                    self._unindex(old[0])
+                    self.conn.execute("DELETE FROM files WHERE id = ?", (old[0],))
+                fields = document_fields(path, text)
+                doc_id = self.conn.execute(
+                    "INSERT INTO files (path, mtime_ns, size, sha256, title, summary, fields) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (rel, st.st_mtime_ns, st.st_size, digest, fields[0], fields[1],
+                     zlib.compress(json.dumps(fields).encode("utf-8"))),
+                ).lastrowid
+                self.conn.execute(
+                    "INSERT INTO docs (rowid, title, summary, tags, body) VALUES (?, ?, ?, ?, ?)",
+                    (doc_id, *fields),
+                )
+            removed = stored.keys() - seen
+            for rel in removed:
+                self._unindex(stored[rel][0])
+                self.conn.execute("DELETE FROM files WHERE id = ?", (stored[rel][0],))
+        return {"documents": len(seen), "changed": changed, "removed": len(removed)}
+
+    def search(self, text, limit=10):
+        """Best matches for free text as (path, title, summary, score), best first.
+
+        score is the negated BM25 rank, so higher is better.
+        """
+        for any_word in (False, True):
+            query = fts_query(text, any_word)
+            if not query:
+                return []
+            rows = self.conn.execute(
+                "SELECT path, title, summary, score FROM files JOIN ("
+                f"  SELECT rowid, -bm25(docs, {', '.join(map(str, WEIGHTS))}) AS score"
+                "  FROM docs WHERE docs MATCH ? ORDER BY score DESC LIMIT ?"
+                ") AS hits ON files.id = hits.rowid ORDER BY score DESC, path",
+                (query, limit),
+            ).fetchall()
+            if rows:
+                return rows
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ranked full-text search over the vault")
+    parser.add_argument("query", nargs="*", help="words to search for")
+    parser.add_argument("-n", "--limit", type=int, default=10, help="number of results (default: 10)")
+    parser.add_argument("--vault", type=Path, default=DEFAULT_VAULT, help="vault directory")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB, help="SQLite index file")
+    parser.add_argument("--rebuild", action="store_true", help="re-index every document")
+    args = parser.parse_args()
+    if not args.query and not args.rebuild:
+        parser.error("give a query, or --rebuild")
+
+    with SearchIndex(args.db, args.vault) as index:
+        if args.rebuild:
+            index.rebuild()
+        stats = index.update()
+        if not args.query:
+            print(f"Documents: {stats['documents']}  Indexed: {stats['changed']}")
+            return 0
+        results = index.search(" ".join(args.query), args.limit)
+        if not results:
+            print("No matches", file=sys.stderr)
+            return 1
+        for path, title, summary, score in results:
+            print(f"{path.removesuffix('.md')}  ({title})")
+            if summary:
+                print(f"    {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,13 +28,15 @@ function slugifyPath(rel: string): string {
 
 const SKIP_TOP = new Set(['Dashboard.md', 'Index.md', 'log.md']);
 const SKIP_DIRS = new Set(['.obsidian', 'templates']);
+// Pages of a sharded index (generate_index.py --split); skipped at the vault root only.
+const INDEX_SHARD_DIR = 'Index';
 
 function walk(dir: string, root: string, out: string[]): void {
   for (const ent of fs.readdirSync(dir, { withFileTypes: true })) {
     const full = path.join(dir, ent.name);
     const rel = path.relative(root, full);
     if (ent.isDirectory()) {
-      if (SKIP_DIRS.has(ent.name)) continue;
+      if (SKIP_DIRS.has(ent.name) || rel === INDEX_SHARD_DIR) continue;
       walk(full, root, out);
     } else if (ent.isFile() && ent.name.endsWith('.md')) {
       if (rel === ent.name && SKIP_TOP.has(ent.name)) continue;
@@ -1,9 +1,11 @@
 import fs from 'node:fs';
 import path from 'node:path';
 import { marked } from 'marked';
-import { resolveWikiLink, type WikiLinkTarget } from './wiki-links';
+import { resolveWikiLink, slugify, type WikiLinkTarget } from './wiki-links';
 
 const VAULT_DIR = path.resolve('../vault');
+// Pages of a sharded index (generate_index.py --split), under the vault root.
+const INDEX_SHARD_DIR = 'Index';
 
 /**
  * Load a vault-root markdown file (e.g. Index.md, log.md), resolve [[wiki links]]
@@ -21,3 +23,22 @@ export function renderVaultDoc(
   });
   return marked.parse(withLinks, { async: false }) as string;
 }
+
+/** Pages of a sharded index as { file, slug }, sorted; empty when Index.md is not sharded. */
+export function listIndexShards(): { file: string; slug: string }[] {
+  const dir = path.join(VAULT_DIR, INDEX_SHARD_DIR);
+  if (!fs.existsSync(dir)) return [];
+  return fs.readdirSync(dir)
+    .filter(name => name.startsWith('Index - ') && name.endsWith('.md'))
+    .sort()
+    .map(name => ({ file: `${INDEX_SHARD_DIR}/${name}`, slug: slugify(name.replace(/\.md$/, '')) }));
+}
+
+/** linkMap plus the index shard pages, so [[Index - Plans]] links to catalog/index-plans/. */
+export function withIndexShards(linkMap: Map<string, WikiLinkTarget>): Map<string, WikiLinkTarget> {
+  const map = new Map(linkMap);
+  for (const { slug } of listIndexShards()) {
+    map.set(slug, { id: `catalog/${slug}`, summary: '' });
+  }
+  return map;
+}
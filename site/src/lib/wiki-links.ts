@@ -17,7 +17,7 @@ export function buildWikiLinkMap(entries: CollectionEntry<'vault'>[]): Map<strin
 }
 
 /** Slugify a wiki link target the same way generateId does */
-function slugify(name: string): string {
+export function slugify(name: string): string {
   return name.toLowerCase()
     .replace(/\s+-\s+/g, '-')
     .replace(/\s+/g, '-')
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "pyyaml",
+# ]
+# ///
+"""Tag hierarchy and vault-wide tag postings.
+
+Tags are hierarchical by path: "research/component" sits under "research",
+and a note tagged "plan/followup" counts as tagged "plan". TagIndex is built
+once from meta_tags.yml and maps every declared tag to its ancestors and
+descendants; index_notes() then records, in one pass over the vault, which
+notes fall under each tag (directly or through a subtag), so "all notes under
+#research" is a set lookup. The same pass collects the tags notes use but
+meta_tags.yml does not declare, and the declared tags no note falls under.
+
+Usage:
+    uv run tag_index.py                 # unused and undeclared tags
+    uv run tag_index.py notes research  # notes tagged #research or a #research/* subtag
+    uv run tag_index.py tree            # declared tags with note counts
+"""
+import argparse
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from vault_notes import REPO_ROOT, NoteCache, load_note, load_yaml
+
+DEFAULT_VAULT = REPO_ROOT / "vault"
+DEFAULT_TAGS = REPO_ROOT / "meta_tags.yml"
+
+
+@lru_cache(maxsize=None)
+def tag_lineage(tag):
+    """frozenset of tag and its ancestors: "a/b/c" -> {"a", "a/b", "a/b/c"}.
+
+    A note tagged tag is under every tag in the set.
+    """
+    parts = tag.split("/")
+    return frozenset("/".join(parts[:i]) for i in range(1, len(parts) + 1))
+
+
+class TagIndex:
+    """Declared tag hierarchy plus, after index_notes(), tag -> notes postings."""
+
+    def __init__(self, tags):
+        self.tags = list(tags)
+        self.declared = frozenset(self.tags)
+        self.descendants = {tag: set() for tag in self.tags}
+        for tag in self.tags:
+            for ancestor in tag_lineage(tag) - {tag}:
+                if ancestor in self.descendants:
+                    self.descendants[ancestor].add(tag)
+        self.postings = {}    # tag -> paths of notes under it (tagged it or a subtag)
+        self.undeclared = {}  # tag -> paths of notes using it, for tags not in meta_tags.yml
+
+    @classmethod
+    def load(cls, tags_path=DEFAULT_TAGS):
+        """TagIndex of the tags declared in meta_tags.yml."""
+        with open(tags_path) as f:
+            return cls(load_yaml(f.read()))
+
+    def ancestors(self, tag):
+        """Tags strictly above tag, nearest last."""
+        return sorted(tag_lineage(tag) - {tag})
+
+    def index_notes(self, files_meta):
+        """Record the tags of (path, metadata) pairs; replaces any earlier postings."""
+        self.postings = {}
+        self.undeclared = {}
+        for path, meta in files_meta:
+            tags = meta.get("tags") if isinstance(meta, dict) else None
+            if not isinstance(tags, list):
+                continue
+            for tag in tags:
+                if not isinstance(tag, str):
+                    continue
+                if tag not in self.declared:
+                    self.undeclared.setdefault(tag, []).append(path)
+                for t in tag_lineage(tag):
+                    self.postings.setdefault(t, set()).add(path)
+        return self
+
+    def notes_under(self, tag):
+        """Paths of notes tagged tag or any of its subtags."""
+        return self.postings.get(tag.lstrip("#"), set())
+
+    def unused(self):
+        """Declared tags no note falls under, in meta_tags.yml order."""
+        return [tag for tag in self.tags if tag not in self.postings]
+
+
+def vault_tag_index(vault_dir=DEFAULT_VAULT, tags_path=DEFAULT_TAGS, cache=None):
+    """TagIndex over every note in vault_dir, paths relative to it (posix)."""
+    # validate_frontmatter imports this module for tag_lineage().
+    from validate_frontmatter import find_md_files
+
+    vault_dir = Path(vault_dir)
+    files_meta = []
+    for path in find_md_files(vault_dir):
+        note = load_note(path, cache)
+        if note["metadata"]:
+            files_meta.append((path.relative_to(vault_dir).as_posix(), note["metadata"]))
+    return TagIndex.load(tags_path).index_notes(files_meta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the vault's tag hierarchy")
+    parser.add_argument("--vault", type=Path, default=DEFAULT_VAULT, help="vault directory")
+    parser.add_argument("--tags", type=Path, default=DEFAULT_TAGS, help="tag registry")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="parse frontmatter instead of reusing .cache/notes.pickle")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("report", help="unused and undeclared tags (default)")
+    notes = sub.add_parser("notes", help="notes under TAG (including its subtags)")
+    notes.add_argument("tag", help='tag, with or without "#"')
+    sub.add_parser("tree", help="declared tags with the number of notes under each")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else NoteCache()
+    index = vault_tag_index(args.vault, args.tags, cache)
+    if cache is not None:
+        cache.save()
+
+    if args.command == "notes":
+        paths = index.notes_under(args.tag)
+        if not paths:
+            print(f"No notes under #{args.tag.lstrip('#')}", file=sys.stderr)
+            return 1
+        for path in sorted(paths):
+            print(path)
+    elif args.command == "tree":
+        for tag in index.tags:
+            depth = len(index.ancestors(tag))
+            print(f"{'  ' * depth}{tag}  ({len(index.notes_under(tag))})")
+    else:
+        for tag in index.unused():
+            print(f"unused      #{tag}")
+        for tag, paths in sorted(index.undeclared.items()):
+            print(f"undeclared  #{tag}  ({', '.join(sorted(paths))})")
+        print(f"\nUnused: {len(index.unused())}  Undeclared: {len(index.undeclared)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Tests for bench_vault.py — the synthetic vault generator and regression check."""
+import io
+from contextlib import redirect_stdout
+
+from bench_vault import (
+    DEFAULT_SCHEMA,
+    DEFAULT_TAGS,
+    available_yaml_backends,
+    bench_yaml_backends,
+    compare,
+    generate_vault,
+    run_benchmarks,
+)
+from check_references import check_paper
+from validate_frontmatter import find_md_files, validate_directory
+
+
+def test_generated_vault_is_schema_valid(tmp_path):
+    vault = generate_vault(tmp_path / "vault", 200, seed=1)
+    assert len(list(find_md_files(vault))) == 200
+    with redirect_stdout(io.StringIO()) as out:
+        errors, warnings = validate_directory(vault, DEFAULT_SCHEMA, DEFAULT_TAGS)
+    assert errors == 0, out.getvalue()
+    # Most related_notes links are reciprocated, a few are not.
+    assert 0 < warnings < 100
+
+
+def test_generated_vault_has_workspaces_with_clean_references(tmp_path):
+    vault = generate_vault(tmp_path / "vault", 300, seed=2)
+    papers = sorted(p.parent for p in vault.glob("papers/*/references.yml"))
+    assert papers
+    for paper in papers:
+        errors, _, info = check_paper(paper)
+        assert errors == []
+        assert 0 < info["cited"] <= info["total"]
+    assert list(vault.glob("projects/*/index.md"))
+    assert list(vault.glob("plans/Plan Section - *.md"))
+
+
+def test_generation_is_deterministic(tmp_path):
+    a = generate_vault(tmp_path / "a", 50, seed=3)
+    b = generate_vault(tmp_path / "b", 50, seed=3)
+    files_a = sorted(p.relative_to(a) for p in a.rglob("*") if p.is_file())
+    assert files_a == sorted(p.relative_to(b) for p in b.rglob("*") if p.is_file())
+    assert all((a / f).read_text() == (b / f).read_text() for f in files_a)
+
+
+def test_run_benchmarks_times_every_tool(tmp_path):
+    vault = generate_vault(tmp_path / "vault", 60)
+    timings = run_benchmarks(vault, repeat=1)
+    assert set(timings) == {"validate", "index", "references", "bidirectional"}
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_bench_yaml_backends_times_each_available_backend(tmp_path):
+    vault = generate_vault(tmp_path / "vault", 60)
+    timings = bench_yaml_backends(vault, repeat=1)
+    assert list(timings) == available_yaml_backends()
+    assert "python" in timings
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"1000": {"validate": 1.0, "index": 1.0}}
+    results = {"1000": {"validate": 1.3, "index": 1.1, "references": 5.0}, "10000": {"validate": 9.0}}
+    assert compare(results, baseline, 0.25) == [("1000", "validate", 1.3, 1.0)]
@@ -0,0 +1,38 @@
+"""Tests for check_links.py — dangling [[...]] links in note bodies and log.md."""
+from check_links import dangling_body_links
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _vault(tmp_path):
+    vault = tmp_path / "vault"
+    _write(vault / "research/Alpha.md",
+           '---\ntype: concept\nrelated_notes:\n  - "[[Nowhere]]"\n---\n\n'
+           "Links to [[Beta|b]], [[Bet]] (prefix) and [[Gone]].\n")
+    _write(vault / "research/Beta.md", "---\ntype: concept\n---\n\n```\n[[Fenced]]\n```\n")
+    _write(vault / "log.md", "# Log\n\n- [[Alpha]]\n- [[Removed Note]]\n")
+    return vault
+
+
+def test_reports_body_and_log_links_with_lines(tmp_path):
+    vault = _vault(tmp_path)
+    assert dangling_body_links(vault, tmp_path / "links.sqlite") == [
+        ("log.md", 4, "Removed Note"),
+        ("research/Alpha.md", 7, "Gone"),
+    ]
+
+
+def test_only_limits_reported_files(tmp_path):
+    vault = _vault(tmp_path)
+    assert dangling_body_links(vault, None, only={"log.md"}) == [("log.md", 4, "Removed Note")]
+
+
+def test_rerun_sees_fixed_link(tmp_path):
+    vault = _vault(tmp_path)
+    db = tmp_path / "links.sqlite"
+    dangling_body_links(vault, db)
+    _write(vault / "research/Gone.md", "---\ntype: concept\n---\n")
+    assert dangling_body_links(vault, db) == [("log.md", 4, "Removed Note")]
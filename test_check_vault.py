@@ -0,0 +1,105 @@
+"""Tests for check_vault.py — every vault check over one loaded vault."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from check_vault import FAILED, PASSED, SKIPPED, Vault, run_checks
+from generate_dashboard import DEFAULT_CONFIG, generate_dashboard
+from generate_index import collect_notes, generate_index, write_index_shards
+from vault_notes import NoteCache
+
+NOTE = """---
+type: concept
+tags:
+  - concept
+status: draft
+created: 2025-01-15
+revised: 2025-01-15
+revision: 1
+ai_generated: true
+summary: "A perfectly valid concept note for testing"
+---
+
+# Shared Concept
+"""
+
+
+class CountingCache(NoteCache):
+    def __init__(self):
+        super().__init__(None, snapshot=True)
+        self.parsed = []
+
+    def get(self, filepath, kind, parse, *args):
+        def counting(text):
+            self.parsed.append((kind, str(filepath)))
+            return parse(text)
+        return super().get(filepath, kind, counting, *args)
+
+
+def _vault(tmp_path):
+    vault = tmp_path / "vault"
+    (vault / "concepts").mkdir(parents=True)
+    (vault / "concepts/Shared Concept.md").write_text(NOTE)
+    (vault / "Index.md").write_text(generate_index(collect_notes(vault)))
+    with open(DEFAULT_CONFIG) as f:
+        (vault / "Dashboard.md").write_text(generate_dashboard(json.load(f)))
+    return vault
+
+
+def test_all_checks_pass_on_a_clean_vault(tmp_path, capsys):
+    results = run_checks(Vault(_vault(tmp_path)), ["validate", "index", "dashboard", "references"])
+    assert results == {"validate": PASSED, "index": PASSED, "dashboard": PASSED,
+                       "references": SKIPPED}
+    out = capsys.readouterr().out
+    assert "Files: 1  Errors: 0  Warnings: 0" in out
+    assert "Index.md is up to date." in out
+
+
+def test_failures_are_reported_per_check(tmp_path, capsys):
+    vault = _vault(tmp_path)
+    (vault / "concepts/Broken.md").write_text(NOTE.replace("status: draft", "status: nope"))
+    (vault / "Dashboard.md").write_text("stale\n")
+    results = run_checks(Vault(vault), ["validate", "index", "dashboard"])
+    assert results == {"validate": FAILED, "index": FAILED, "dashboard": FAILED}
+    assert "Index.md is out of date." in capsys.readouterr().out
+
+
+def test_notes_are_parsed_once_across_checks(tmp_path):
+    vault = _vault(tmp_path)
+    cache = CountingCache()
+    run_checks(Vault(vault, cache), ["validate", "index"])
+    note = str(vault / "concepts/Shared Concept.md")
+    assert cache.parsed.count(("note", note)) == 1
+    assert cache.parsed.count(("h1", note)) == 1
+
+
+def test_index_check_follows_split_index(tmp_path, capsys):
+    vault = _vault(tmp_path)
+    write_index_shards(collect_notes(vault), vault / "Index.md", vault / "Index")
+    assert run_checks(Vault(vault), ["validate", "index"]) == {"validate": PASSED, "index": PASSED}
+    assert "Index.md and its pages are up to date." in capsys.readouterr().out
+
+    (vault / "Index" / "Index - Concepts.md").write_text("stale\n")
+    assert run_checks(Vault(vault), ["index"]) == {"index": FAILED}
+
+
+def test_index_check_follows_switch_back_to_plain_index(tmp_path, capsys):
+    vault = _vault(tmp_path)
+    script = Path(__file__).parent / "generate_index.py"
+    base = [sys.executable, str(script), "--vault", str(vault), "--output", str(vault / "Index.md"),
+            "--shard-dir", str(vault / "Index"), "--no-cache"]
+    subprocess.run([*base, "--split"], check=True, capture_output=True)
+    assert (vault / "Index").is_dir()
+    subprocess.run(base, check=True, capture_output=True)
+    assert not (vault / "Index").exists()
+    subprocess.run([*base, "--check"], check=True, capture_output=True)
+    assert run_checks(Vault(vault), ["index"]) == {"index": PASSED}
+    assert "Index.md is up to date." in capsys.readouterr().out
+
+
+def test_only_the_root_index_dir_is_skipped(tmp_path, capsys):
+    vault = _vault(tmp_path)
+    (vault / "concepts" / "Index").mkdir()
+    (vault / "concepts" / "Index" / "Nested.md").write_text(NOTE.replace("status: draft", "status: nope"))
+    assert run_checks(Vault(vault), ["validate"]) == {"validate": FAILED}
@@ -0,0 +1,149 @@
+"""Tests for link_index.py — the persistent SQLite wiki-link graph."""
+import os
+from pathlib import Path
+
+import pytest
+
+from link_index import LinkIndex, extract_links
+from validate_frontmatter import _build_slug_map, _resolve_wiki_link, find_md_files
+from vault_notes import NoteCache
+
+VAULT = os.path.join(os.path.dirname(__file__), "vault")
+
+
+def _write_note(vault, rel, related=(), body=""):
+    path = vault / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ["---", "type: concept"]
+    if related:
+        lines.append("related_notes:")
+        lines.extend(f'  - "[[{name}]]"' for name in related)
+    lines.append("---")
+    path.write_text("\n".join(lines) + "\n\n" + body + "\n")
+    return path
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = tmp_path / "vault"
+    _write_note(vault, "research/Alpha.md", related=["Beta"], body="See [[Gamma|the gamma note]].")
+    _write_note(vault, "research/Beta.md", related=["Alpha", "Missing"])
+    _write_note(vault, "research/Gamma.md", body="Self [[Gamma#Setup]] and `[[Alpha]]` in code.")
+    _write_note(vault, "research/Lonely.md")
+    return vault
+
+
+@pytest.fixture
+def index(tmp_path, vault):
+    with LinkIndex(tmp_path / "links.sqlite", vault) as index:
+        index.update()
+        yield index
+
+
+def test_extract_links_skips_code_and_non_link_values():
+    text = (
+        "---\nparent_plan: not a link\nrelated_notes:\n  - \"[[A]]\"\n---\n"
+        "[[B]]\n```\n[[C]]\n```\n`[[D]]`\n"
+    )
+    assert extract_links(text) == [("related_notes", "A", None), ("body", "B", 6)]
+
+
+def test_extract_links_line_numbers_survive_stripped_code():
+    text = "---\ntype: concept\n---\n\nIntro `[[X]]` then [[A]].\n```\n[[C]]\n```\n\n[[B|b]]\n"
+    assert extract_links(text) == [("body", "A", 5), ("body", "B", 10)]
+    assert extract_links("[[A]]\n[[B]]") == [("body", "A", 1), ("body", "B", 2)]
+
+
+def test_extract_links_uses_given_metadata():
+    text = "---\nrelated_notes: []\n---\n"
+    assert extract_links(text, {"related_notes": ["[[A]]"]}) == [("related_notes", "A", None)]
+
+
+def test_backlinks_cover_frontmatter_and_body(index):
+    assert index.backlinks("[[Gamma]]") == [("research/Alpha.md", "body", "Gamma", 7)]
+    assert index.backlinks("Beta") == [("research/Alpha.md", "related_notes", "Beta", None)]
+    assert index.backlinks("research/Alpha.md") == [
+        ("research/Beta.md", "related_notes", "Alpha", None)
+    ]
+    assert index.backlinks("[[Nope]]") is None
+
+
+def test_dangling_and_orphans(index):
+    assert index.dangling() == [("research/Beta.md", "related_notes", "Missing", None)]
+    assert index.dangling("body") == []
+    # Gamma only links to itself; code spans are not links.
+    assert index.orphans() == ["research/Lonely.md"]
+
+
+def test_update_is_incremental(index, vault):
+    assert index.update() == {"notes": 4, "changed": 0, "removed": 0}
+    note = vault / "research/Lonely.md"
+    st = note.stat()
+    os.utime(note, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+    assert index.update()["changed"] == 0
+
+    _write_note(vault, "research/Lonely.md", body="[[Alpha]]")
+    assert index.update() == {"notes": 4, "changed": 1, "removed": 0}
+    assert ("research/Lonely.md", "body", "Alpha", 5) in index.backlinks("Alpha")
+
+
+def test_added_note_resolves_existing_dangling_links(index, vault):
+    _write_note(vault, "research/Missing Piece.md")
+    assert index.update() == {"notes": 5, "changed": 1, "removed": 0}
+    assert index.dangling() == []
+    assert index.backlinks("Missing Piece") == [
+        ("research/Beta.md", "related_notes", "Missing", None)
+    ]
+
+
+def test_removed_note_drops_its_links(index, vault):
+    (vault / "research/Alpha.md").unlink()
+    assert index.update() == {"notes": 3, "changed": 0, "removed": 1}
+    assert index.backlinks("Gamma") == []
+    assert ("research/Beta.md", "related_notes", "Alpha", None) in index.dangling()
+
+
+def test_log_is_a_link_source_but_not_a_note(index, vault):
+    (vault / "log.md").write_text("# Log\n\n- [[Lonely]] added\n- [[log]]\n")
+    assert index.update() == {"notes": 4, "changed": 1, "removed": 0}
+    assert index.backlinks("Lonely") == [("log.md", "body", "Lonely", 3)]
+    assert index.orphans() == []
+    assert index.resolve("log.md") is None
+    assert index.dangling("body") == [("log.md", "body", "log", 4)]
+
+
+def test_in_memory_index_with_note_cache(tmp_path, vault):
+    cache = NoteCache(tmp_path / "notes.pickle")
+    with LinkIndex(None, vault, cache) as index:
+        index.update()
+        assert index.orphans() == ["research/Lonely.md"]
+    assert not (tmp_path / "links.sqlite").exists()
+    cache.save()
+    assert (tmp_path / "notes.pickle").exists()
+
+
+def test_index_persists_across_instances(tmp_path, vault):
+    db = tmp_path / "links.sqlite"
+    with LinkIndex(db, vault) as index:
+        index.update()
+    with LinkIndex(db, vault) as index:
+        assert index.update()["changed"] == 0
+        assert index.orphans() == ["research/Lonely.md"]
+
+
+def test_frontmatter_targets_match_validator_on_real_vault(tmp_path):
+    paths = list(find_md_files(VAULT))
+    slug_map = _build_slug_map(paths)
+    with LinkIndex(tmp_path / "links.sqlite", VAULT) as index:
+        index.update()
+        rows = index.conn.execute(
+            "SELECT label, target FROM links WHERE field != 'body'"
+        ).fetchall()
+        for label, target in rows:
+            expected = _resolve_wiki_link(f"[[{label}]]", slug_map)
+            if expected is not None:
+                expected = Path(expected).relative_to(VAULT).as_posix()
+            assert target == expected, label
+        for label, target in rows:
+            if target is not None:
+                assert index.resolve(f"[[{label}]]") == target
@@ -0,0 +1,99 @@
+"""Tests for search_vault.py — the BM25 full-text index over the vault."""
+import pytest
+
+from search_vault import SearchIndex, document_fields, find_documents, fts_query
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = tmp_path / "vault"
+    _write(vault / "research/Component - Tool State.md",
+           "---\ntype: research\nsummary: How tool state is stored\ntags:\n  - research/component\n---\n"
+           "# Tool State Internals\n\nState dictionaries for tools.\n")
+    _write(vault / "research/Workflow Notes.md",
+           "---\ntype: concept\n---\n# Workflows\n\nA workflow mentions tool once and state never.\n")
+    _write(vault / "projects/wf/index.md", "---\ntype: project\n---\n# Project\n")
+    _write(vault / "projects/wf/PLAN.md", "# Extraction plan\n\nPlan for extracting workflows.\n")
+    _write(vault / "templates/concept.md", "# Template tool state\n")
+    _write(vault / "Index.md", "# Index tool state\n")
+    return vault
+
+
+@pytest.fixture
+def index(tmp_path, vault):
+    with SearchIndex(tmp_path / "search.sqlite", vault) as index:
+        index.update()
+        yield index
+
+
+def _paths(results):
+    return [path for path, *_ in results]
+
+
+def test_find_documents_includes_workspace_docs_only(vault):
+    rels = [p.relative_to(vault).as_posix() for p in find_documents(vault)]
+    assert rels == [
+        "projects/wf/PLAN.md",
+        "projects/wf/index.md",
+        "research/Component - Tool State.md",
+        "research/Workflow Notes.md",
+    ]
+
+
+def test_document_fields(vault):
+    path = vault / "research/Component - Tool State.md"
+    title, summary, tags, body = document_fields(path, path.read_text())
+    assert (title, summary, tags) == ("Tool State Internals", "How tool state is stored",
+                                      "research/component")
+    assert body.startswith("# Tool State Internals")
+
+
+def test_fts_query_quotes_words():
+    assert fts_query('tool "state" AND-x') == '"tool" "state" "AND" "x"'
+    assert fts_query("tool state", any_word=True) == '"tool" OR "state"'
+    assert fts_query("?!") == ""
+
+
+def test_title_and_summary_hits_rank_first(index):
+    assert _paths(index.search("tool state")) == [
+        "research/Component - Tool State.md",
+        "research/Workflow Notes.md",
+    ]
+
+
+def test_stemming_and_any_word_fallback(index):
+    assert _paths(index.search("extracted workflows")) == ["projects/wf/PLAN.md"]
+    assert _paths(index.search("dictionaries zebra")) == ["research/Component - Tool State.md"]
+    assert index.search("zebra") == []
+    assert index.search("") == []
+
+
+def test_update_reindexes_only_changed_documents(index, vault):
+    assert index.update() == {"documents": 4, "changed": 0, "removed": 0}
+    _write(vault / "projects/wf/PLAN.md", "# Zebra plan\n")
+    assert index.update() == {"documents": 4, "changed": 1, "removed": 0}
+    assert _paths(index.search("zebra")) == ["projects/wf/PLAN.md"]
+    assert index.search("extracting") == []
+
+
+def test_removed_document_leaves_the_index(index, vault):
+    (vault / "research/Workflow Notes.md").unlink()
+    assert index.update() == {"documents": 3, "changed": 0, "removed": 1}
+    assert _paths(index.search("tool state")) == ["research/Component - Tool State.md"]
+    # The contentless table dropped the old terms: its integrity check still passes.
+    index.conn.execute("INSERT INTO docs (docs, rank) VALUES ('integrity-check', 1)")
+
+
+def test_rebuild_and_reopen(tmp_path, vault):
+    db = tmp_path / "search.sqlite"
+    with SearchIndex(db, vault) as index:
+        index.update()
+    with SearchIndex(db, vault) as index:
+        assert index.update()["changed"] == 0
+        index.rebuild()
+        assert index.update()["changed"] == 4
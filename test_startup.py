@@ -0,0 +1,93 @@
+"""Start-up budget for the CLI scripts: heavy dependencies load only on the paths that need them."""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).parent
+
+# Modules each tool must not import at start-up (e.g. for --help or a warm-cache run).
+BUDGETS = {
+    "validate_frontmatter": {"jsonschema", "yaml", "concurrent.futures"},
+    "generate_index": {"jsonschema", "yaml"},
+    "generate_dashboard": {"jsonschema", "yaml"},
+    "check_references": {"jsonschema", "yaml"},
+    "generate_architecture_views": {"build", "pydantic", "yaml"},
+    "check_vault": {"build", "jsonschema", "yaml"},
+    "link_index": {"jsonschema", "yaml"},
+    "check_links": {"jsonschema", "yaml"},
+    "search_vault": {"jsonschema", "yaml"},
+    "tag_index": {"jsonschema", "yaml"},
+}
+
+# Wall-clock bound on `script --help`, best of a few runs. The target is tens of
+# milliseconds; the bound is loose so a busy CI machine does not flake. BUDGETS
+# catches single heavy imports; this catches start-up work piling up regardless.
+STARTUP_SECONDS = 0.5
+
+VALID = """---
+type: concept
+tags:
+  - concept
+status: draft
+created: 2025-01-15
+revised: 2025-01-15
+revision: 1
+ai_generated: true
+summary: "A perfectly valid concept note for testing"
+---
+"""
+
+
+def _loaded(code, *watch):
+    """Run code in a fresh interpreter; return which of watch it left in sys.modules."""
+    probe = f"{code}\nimport sys\nprint(' '.join(m for m in {sorted(watch)!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", probe], cwd=REPO, check=True,
+                         capture_output=True, text=True).stdout
+    return set(out.split())
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_stays_within_budget(module):
+    assert _loaded(f"import {module}", *BUDGETS[module]) == set()
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_help_starts_within_time_budget(module):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, f"{module}.py", "--help"], cwd=REPO, check=True,
+                       capture_output=True)
+        best = min(best, time.perf_counter() - start)
+    assert best < STARTUP_SECONDS, f"{module} --help took {best * 1000:.0f} ms"
+
+
+def test_clean_vault_validates_without_jsonschema(tmp_path):
+    (tmp_path / "vault").mkdir()
+    (tmp_path / "vault/Note.md").write_text(VALID)
+    code = (
+        "import io\n"
+        "from validate_frontmatter import validate_directory\n"
+        "from vault_report import TextReporter\n"
+        f"assert validate_directory({str(tmp_path / 'vault')!r}, 'meta_schema.yml', 'meta_tags.yml',"
+        " reporter=TextReporter(io.StringIO())) == (0, 0)"
+    )
+    assert _loaded(code, "jsonschema", "yaml") == {"yaml"}
+
+
+def test_invalid_note_still_reports_schema_errors(tmp_path):
+    (tmp_path / "vault").mkdir()
+    (tmp_path / "vault/Note.md").write_text(VALID.replace("status: draft", "status: nope"))
+    code = (
+        "import io\n"
+        "from validate_frontmatter import validate_directory\n"
+        "from vault_report import TextReporter\n"
+        "out = io.StringIO()\n"
+        f"validate_directory({str(tmp_path / 'vault')!r}, 'meta_schema.yml', 'meta_tags.yml',"
+        " reporter=TextReporter(out))\n"
+        "assert \"status: 'nope' is not one of\" in out.getvalue(), out.getvalue()"
+    )
+    assert _loaded(code, "jsonschema") == {"jsonschema"}
@@ -0,0 +1,52 @@
+"""Tests for tag_index.py — tag hierarchy, postings, unused and undeclared tags."""
+from pathlib import Path
+
+from tag_index import TagIndex, tag_lineage, vault_tag_index
+
+REPO = Path(__file__).parent
+
+TAGS = ["research", "research/component", "research/pr", "plan", "plan/followup", "galaxy/api", "concept"]
+
+
+def test_tag_lineage():
+    assert tag_lineage("a/b/c") == {"a", "a/b", "a/b/c"}
+    assert tag_lineage("plan") == {"plan"}
+    # Prefixes that are not whole path segments are not ancestors.
+    assert "plan" not in tag_lineage("planning")
+
+
+def test_hierarchy_maps_ancestors_and_descendants():
+    index = TagIndex(TAGS)
+    assert index.descendants["research"] == {"research/component", "research/pr"}
+    assert index.descendants["research/pr"] == set()
+    assert index.ancestors("research/component") == ["research"]
+    # galaxy/api has no declared parent; its lexical ancestor is still reported.
+    assert index.ancestors("galaxy/api") == ["galaxy"]
+
+
+def test_postings_unused_and_undeclared_in_one_pass():
+    index = TagIndex(TAGS).index_notes([
+        ("a.md", {"tags": ["research/component", "galaxy/api"]}),
+        ("b.md", {"tags": ["research/pr", "galaxy/made-up"]}),
+        ("c.md", {"tags": ["plan/followup"]}),
+        ("d.md", {"tags": "not-a-list"}),
+        ("e.md", {"tags": [3]}),
+    ])
+    assert index.notes_under("#research") == {"a.md", "b.md"}
+    assert index.notes_under("research/pr") == {"b.md"}
+    assert index.notes_under("plan") == {"c.md"}
+    assert index.notes_under("galaxy") == {"a.md", "b.md"}
+    assert index.notes_under("nothing") == set()
+    assert index.unused() == ["concept"]
+    assert index.undeclared == {"galaxy/made-up": ["b.md"]}
+
+
+def test_vault_tag_index_reads_notes_and_registry(tmp_path):
+    vault = tmp_path / "vault"
+    (vault / "research").mkdir(parents=True)
+    (vault / "research" / "A.md").write_text("---\ntags:\n  - research/component\n  - bogus\n---\n")
+    (vault / "Index.md").write_text("---\ntags:\n  - skipped\n---\n")
+    index = vault_tag_index(vault, REPO / "meta_tags.yml")
+    assert index.notes_under("research") == {"research/A.md"}
+    assert index.undeclared == {"bogus": ["research/A.md"]}
+    assert "moc" in index.unused()
@@ -2,28 +2,55 @@
 
 Uses the real meta_schema.yml and meta_tags.yml from the repo root.
 """
+import argparse
 import copy
 import datetime
 import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
 
+import jsonschema
+
 from validate_frontmatter import (
+    CompiledSchema,
+    RelationIndex,
+    ResultCache,
+    VaultWatcher,
     find_md_files,
+    git_changed_paths,
+    in_shard,
+    linked_neighbourhood,
+    load_compiled_schema,
     load_schema,
     load_tags,
+    merge_shard_summaries,
+    parse_shard,
     preprocess_frontmatter,
+    resolve_edges,
     validate_bidirectional_related_notes,
     validate_data,
     validate_dates,
     validate_directory,
     validate_file,
+    validate_inverse_relations,
+    validate_schema,
     validate_tag_coherence,
     validate_wiki_links,
 )
 from generate_dashboard import generate_dashboard, check_dashboard
-from generate_index import collect_notes, generate_index, check_index, derive_title
+from generate_index import (
+    IndexCatalog,
+    check_index,
+    check_index_shards,
+    collect_notes,
+    derive_title,
+    generate_index,
+    write_index_shards,
+)
 
 REPO_ROOT = Path(__file__).parent
 
@@ -405,6 +432,61 @@ def test_unknown_field_rejected(schema):
     assert any("unknown_field" in e or "Additional properties" in e for e in errors)
 
 
+# ---------------------------------------------------------------------------
+# Compiled schema: same errors as a plain Draft7Validator
+# ---------------------------------------------------------------------------
+
+
+def _reference_errors(data, schema):
+    validator = jsonschema.Draft7Validator(schema)
+    return [
+        f"{'.'.join(str(p) for p in e.absolute_path) or '(root)'}: {e.message}"
+        for e in sorted(validator.iter_errors(data), key=lambda e: list(e.path))
+    ]
+
+
+COMPILED_PARITY_CASES = [
+    VALID_RESEARCH_ISSUE,
+    VALID_PAPER,
+    {**VALID_CONCEPT, "tags": ["nope", "concept", 3]},
+    {**VALID_RESEARCH_COMPONENT, "subtype": "bogus", "extra": 1, "another": 2},
+    {k: v for k, v in VALID_RESEARCH_PR.items() if k not in ("github_pr", "github_repo")},
+    {k: v for k, v in VALID_PLAN_SECTION.items() if k != "parent_plan"},
+    {**VALID_PAPER, "paper_stage": "done", "authors": [{"name": ""}, {"orcid": "x"}]},
+    {**VALID_MOC, "revision": 0, "summary": "short", "related_notes": ["bare"]},
+    {"type": "research"},
+    {},
+]
+
+
+@pytest.mark.parametrize("data", COMPILED_PARITY_CASES)
+def test_compiled_schema_matches_draft7(schema, data):
+    assert validate_schema(data, CompiledSchema(schema)) == _reference_errors(data, schema)
+
+
+def test_compiled_schema_fast_path_covers_meta_schema(schema):
+    compiled = CompiledSchema(schema)
+    assert compiled.is_valid is not None
+    assert compiled.is_valid(VALID_RESEARCH_ISSUE)
+    assert not compiled.is_valid({**VALID_CONCEPT, "tags": ["nope"]})
+
+
+def test_compiled_schema_pickles(schema):
+    import pickle
+
+    compiled = pickle.loads(pickle.dumps(CompiledSchema(schema)))
+    assert validate_schema(VALID_PLAN, compiled) == []
+
+
+def test_load_compiled_schema_persists_merged_schema(tmp_path, schema):
+    args = (REPO_ROOT / "meta_schema.yml", REPO_ROOT / "meta_tags.yml", tmp_path)
+    first = load_compiled_schema(*args)
+    cached = list(tmp_path.glob("schema-*.json"))
+    assert len(cached) == 1
+    assert json.loads(cached[0].read_text()) == schema
+    assert load_compiled_schema(*args).schema == first.schema == schema
+
+
 # ---------------------------------------------------------------------------
 # File-level: no frontmatter
 # ---------------------------------------------------------------------------
@@ -413,8 +495,9 @@ def test_unknown_field_rejected(schema):
 def test_file_no_frontmatter(schema, tmp_path):
     md = tmp_path / "no_frontmatter.md"
     md.write_text("# Just a heading\n\nNo frontmatter here.\n")
-    errors, _ = validate_file(str(md), schema)
+    errors, _, metadata = validate_file(str(md), schema)
     assert any("no frontmatter" in e for e in errors)
+    assert metadata is None
 
 
 def test_file_valid(schema, tmp_path):
@@ -432,8 +515,10 @@ def test_file_valid(schema, tmp_path):
         "---\n"
         "# Content\n"
     )
-    errors, warnings = validate_file(str(md), schema)
+    errors, warnings, metadata = validate_file(str(md), schema)
     assert errors == []
+    assert metadata["type"] == "concept"
+    assert metadata["created"] == datetime.date(2025, 1, 15)
 
 
 # ---------------------------------------------------------------------------
@@ -723,6 +808,34 @@ def test_paper_author_rejects_unknown_field(schema):
     assert errors != []
 
 
+def test_relation_index_matches_resolve_edges_on_vault():
+    import validate_frontmatter
+
+    vault = REPO_ROOT / "vault"
+    files_meta = [(str(p), validate_frontmatter.load_note(p)["metadata"] or {})
+                  for p in find_md_files(vault)]
+    index = RelationIndex()
+    for path, meta in files_meta:
+        index.add(path, meta)
+    full = resolve_edges(files_meta, validate_frontmatter._build_slug_map(p for p, _ in files_meta))
+    assert index.edges() == {
+        path: {f: t for f, t in by_field.items() if f in index.fields}
+        for path, by_field in full.items()
+    }
+
+
+def test_relation_index_keeps_only_links():
+    index = RelationIndex()
+    meta = {"type": "research", "summary": "x" * 1000, "related_notes": ["[[B]]", "[[B]]"]}
+    index.add("/v/A.md", meta)
+    index.add("/v/B.md", {"type": "concept"})
+    assert index.links[1] == ()
+    assert len(index._labels) == 1
+    assert index.warnings() == [
+        ("/v/B.md", "related_notes: missing backlink to [[A]] (declared in /v/A.md)")
+    ]
+
+
 def test_paper_tag_coherence():
     data = {"type": "paper", "tags": ["galaxy/workflows"]}
     warnings = validate_tag_coherence(data)
@@ -833,6 +946,178 @@ def test_validate_directory_with_paper(tmp_path):
     assert total_warnings == 0
 
 
+def test_validate_directory_parses_each_note_once(tmp_path, monkeypatch):
+    import vault_notes
+
+    _mini_vault(tmp_path)
+    calls = []
+    real_parse = vault_notes.parse_note
+
+    def counting_parse(text):
+        calls.append(text)
+        return real_parse(text)
+
+    monkeypatch.setattr(vault_notes, "parse_note", counting_parse)
+    validate_directory(
+        str(tmp_path), str(REPO_ROOT / "meta_schema.yml"), str(REPO_ROOT / "meta_tags.yml")
+    )
+    assert len(calls) == len(list(find_md_files(tmp_path)))
+
+
+def test_validate_directory_parallel_matches_serial(tmp_path, capsys):
+    _mini_vault(tmp_path)
+    (tmp_path / "research" / "Broken.md").write_text("# no frontmatter\n")
+    args = (str(tmp_path), str(REPO_ROOT / "meta_schema.yml"), str(REPO_ROOT / "meta_tags.yml"))
+
+    serial = validate_directory(*args)
+    serial_out = capsys.readouterr().out
+    parallel = validate_directory(*args, jobs=2)
+    parallel_out = capsys.readouterr().out
+
+    assert serial == parallel == (1, 0)
+    assert serial_out == parallel_out
+
+
+def test_validate_directory_parallel_uses_and_fills_cache(tmp_path, capsys):
+    from vault_notes import NoteCache
+
+    _mini_vault(tmp_path)
+    args = (str(tmp_path), str(REPO_ROOT / "meta_schema.yml"), str(REPO_ROOT / "meta_tags.yml"))
+    cache = NoteCache(tmp_path / "cache.pickle")
+    assert validate_directory(*args, cache=cache, jobs=2) == (0, 0)
+    for path in find_md_files(tmp_path):
+        assert cache.fresh(path, "note")["frontmatter"] is True
+    assert validate_directory(*args, cache=cache, jobs=2) == (0, 0)
+
+
+def test_validate_job_reuses_parse_of_touched_note(tmp_path, monkeypatch):
+    """A worker given the stale cache entry of a note touched without edits does not re-parse it."""
+    import os
+
+    import validate_frontmatter
+    import vault_notes
+    from vault_notes import NoteCache
+
+    _mini_vault(tmp_path)
+    path = tmp_path / "research" / "Component - Foo.md"
+    cache = NoteCache(None)
+    vault_notes.load_note(path, cache)
+    os.utime(path, ns=(1, 1))  # stat changes, content does not
+    previous = cache.previous(path, "note")
+    assert cache.fresh(path, "note") is None
+
+    validate_frontmatter._init_worker(load_compiled_schema(
+        str(REPO_ROOT / "meta_schema.yml"), str(REPO_ROOT / "meta_tags.yml")))
+    monkeypatch.setattr(vault_notes, "parse_note", lambda text: pytest.fail("note was re-parsed"))
+    errors, _, _, entry = validate_frontmatter._validate_job((path, None, previous))
+    assert errors == []
+    assert entry["data"] is previous["data"] and entry["mtime_ns"] == 1
+
+
+def _result_cache_vault(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    _mini_vault(vault)
+    foo = vault / "research" / "Component - Foo.md"
+    foo.write_text(foo.read_text().replace("revision: 1\n", 'revision: 1\nrelated_notes:\n- "[[PR 1234 - Bar]]"\n'))
+    (vault / "research" / "Broken.md").write_text("---\ntype: nope\n---\n")
+    meta = tmp_path / "meta"
+    meta.mkdir()
+    for name in ("meta_schema.yml", "meta_tags.yml"):
+        (meta / name).write_text((REPO_ROOT / name).read_text())
+    return vault, meta / "meta_schema.yml", meta / "meta_tags.yml"
+
+
+def test_result_cache_skips_validating_unchanged_notes(tmp_path, capsys, monkeypatch):
+    import validate_frontmatter
+
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    cache_file = tmp_path / "validation.json"
+    results = ResultCache(cache_file, schema_path, tags_path)
+    first = validate_directory(vault, schema_path, tags_path, results=results)
+    first_out = capsys.readouterr().out
+    results.save()
+    assert first[0] > 0 and first[1] == 1  # Broken.md; Bar lacks a backlink to Foo
+
+    monkeypatch.setattr(validate_frontmatter, "validate_note",
+                        lambda *a: pytest.fail("cached note was validated again"))
+    results = ResultCache(cache_file, schema_path, tags_path)
+    assert validate_directory(vault, schema_path, tags_path, results=results) == first
+    assert capsys.readouterr().out == first_out
+
+
+def test_result_cache_warm_run_reuses_parse_cache_hashes(tmp_path, capsys, monkeypatch):
+    import validate_frontmatter
+    from vault_notes import NoteCache
+
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    cache = NoteCache(tmp_path / "notes.pickle")
+    results = ResultCache(tmp_path / "validation.json", schema_path, tags_path)
+    first = validate_directory(vault, schema_path, tags_path, cache, results=results)
+
+    monkeypatch.setattr(validate_frontmatter, "read_frontmatter_text",
+                        lambda path: pytest.fail(f"{path} was read on a warm run"))
+    assert validate_directory(vault, schema_path, tags_path, cache, results=results) == first
+
+
+def test_result_cache_revalidates_changed_notes(tmp_path, capsys):
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    cache_file = tmp_path / "validation.json"
+    results = ResultCache(cache_file, schema_path, tags_path)
+    validate_directory(vault, schema_path, tags_path, results=results)
+    results.save()
+
+    (vault / "research" / "Broken.md").write_text((vault / "research" / "Component - Foo.md").read_text()
+                                                  .replace("related_notes:\n- \"[[PR 1234 - Bar]]\"\n", ""))
+    results = ResultCache(cache_file, schema_path, tags_path)
+    assert validate_directory(vault, schema_path, tags_path, results=results) == (0, 1)
+
+
+@pytest.mark.parametrize("meta_file", ["schema", "tags"])
+def test_result_cache_is_discarded_when_schema_or_tags_change(tmp_path, capsys, meta_file):
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    cache_file = tmp_path / "validation.json"
+    results = ResultCache(cache_file, schema_path, tags_path)
+    validate_directory(vault, schema_path, tags_path, results=results)
+    results.save()
+
+    changed = schema_path if meta_file == "schema" else tags_path
+    changed.write_text(changed.read_text() + "\n# edited\n")
+    results = ResultCache(cache_file, schema_path, tags_path)
+    assert results.key != json.loads(cache_file.read_text())["key"]
+    assert results.get(ResultCache.digest(vault / "research" / "Broken.md")) is None
+
+
+def test_result_cache_file_is_portable(tmp_path, capsys):
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    cache_file = tmp_path / "validation.json"
+    results = ResultCache(cache_file, schema_path, tags_path)
+    validate_directory(vault, schema_path, tags_path, results=results)
+    results.save()
+    assert str(tmp_path) not in cache_file.read_text()
+
+    # A fresh checkout elsewhere (new paths, new mtimes) still hits the cache.
+    moved = tmp_path / "checkout"
+    vault.rename(moved)
+    results = ResultCache(cache_file, schema_path, tags_path)
+    for path in find_md_files(moved):
+        assert results.get(ResultCache.digest(path)) is not None
+
+
+def test_result_cache_prune_keeps_only_used_entries(tmp_path, capsys):
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    cache_file = tmp_path / "validation.json"
+    results = ResultCache(cache_file, schema_path, tags_path)
+    validate_directory(vault, schema_path, tags_path, results=results)
+    results.save()
+    (vault / "research" / "Broken.md").unlink()
+
+    results = ResultCache(cache_file, schema_path, tags_path)
+    validate_directory(vault, schema_path, tags_path, results=results)
+    results.save(prune=True)
+    assert len(json.loads(cache_file.read_text())["results"]) == len(list(find_md_files(vault)))
+
+
 # ---------------------------------------------------------------------------
 # Bidirectional related_notes (cross-file)
 # ---------------------------------------------------------------------------
@@ -893,6 +1178,392 @@ def test_bidirectional_related_notes_related_issues_not_enforced():
     assert validate_bidirectional_related_notes(files_meta) == []
 
 
+def test_inverse_relations_paper_related_projects_needs_project_backlink():
+    files_meta = [
+        ("/v/papers/gxwf/index.md", {"type": "paper", "related_projects": ["[[Project X]]"]}),
+        ("/v/projects/Project X.md", {"type": "project"}),
+    ]
+    warnings = validate_inverse_relations(files_meta)
+    assert warnings == [(
+        "/v/projects/Project X.md",
+        "related_notes: missing backlink to [[gxwf]] "
+        "(declared in /v/papers/gxwf/index.md related_projects)",
+    )]
+    files_meta[1][1]["related_notes"] = ["[[gxwf]]"]
+    assert validate_inverse_relations(files_meta) == []
+
+
+def test_inverse_relations_rule_applies_only_to_declared_types():
+    files_meta = [
+        ("/v/A.md", {"type": "research", "related_projects": ["[[Project X]]"]}),
+        ("/v/Project X.md", {"type": "project"}),
+    ]
+    assert validate_inverse_relations(files_meta) == []
+
+
+def test_inverse_relations_one_warning_per_inverse_field():
+    """A paper listing the project under two fields is told about the missing backlink once."""
+    files_meta = [
+        ("/v/P.md", {"type": "paper", "related_notes": ["[[X]]"], "related_projects": ["[[X]]"]}),
+        ("/v/X.md", {"type": "project"}),
+    ]
+    assert len(validate_inverse_relations(files_meta)) == 1
+
+
+def test_resolve_edges_resolves_each_link_once(monkeypatch):
+    import validate_frontmatter
+
+    calls = []
+    real = validate_frontmatter._resolve_wiki_link
+    monkeypatch.setattr(validate_frontmatter, "_resolve_wiki_link",
+                        lambda wl, slugs: calls.append(wl) or real(wl, slugs))
+    files_meta = [
+        (f"/v/N{i}.md", {"related_notes": ["[[Hub]]"], "related_projects": ["[[Hub]]"],
+                         "parent_plan": "[[Hub]]"})
+        for i in range(5)
+    ] + [("/v/Hub.md", {})]
+    slugs = validate_frontmatter._build_slug_map(p for p, _ in files_meta)
+    edges = resolve_edges(files_meta, slugs)
+    assert calls == ["[[Hub]]"]
+    assert edges["/v/N0.md"] == {f: {"/v/Hub.md"}
+                                 for f in ("related_notes", "related_projects", "parent_plan")}
+    assert edges["/v/Hub.md"] == {}
+
+
+# ---------------------------------------------------------------------------
+# Incremental validation (--since)
+# ---------------------------------------------------------------------------
+
+
+def test_linked_neighbourhood_includes_outgoing_and_incoming():
+    files_meta = [
+        ("/v/A.md", {"related_notes": ["[[B]]"]}),
+        ("/v/B.md", {}),
+        ("/v/C.md", {"parent_plan": "[[A]]"}),
+        ("/v/D.md", {"related_notes": ["[[C]]"]}),
+    ]
+    assert linked_neighbourhood(files_meta, {"/v/A.md"}) == {"/v/A.md", "/v/B.md", "/v/C.md"}
+
+
+def test_linked_neighbourhood_ignores_related_issues():
+    files_meta = [
+        ("/v/A.md", {"related_issues": ["[[B]]"]}),
+        ("/v/B.md", {}),
+    ]
+    assert linked_neighbourhood(files_meta, {"/v/B.md"}) == {"/v/B.md"}
+
+
+def test_linked_neighbourhood_deleted_note_pulls_in_linkers():
+    files_meta = [("/v/A.md", {"related_notes": ["[[Gone]]"]})]
+    assert linked_neighbourhood(files_meta, {"/v/Gone.md"}) == {"/v/A.md"}
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def test_validate_directory_since_only_checks_changed_and_neighbours(tmp_path, capsys):
+    _mini_vault(tmp_path)
+    research = tmp_path / "research"
+    _write_note(research / "Concept - Other.md", type="concept", tags=["concept"],
+                status="draft", created="2025-01-15", revised="2025-01-15", revision=1,
+                ai_generated=True, summary="An unrelated concept that is not touched at all.")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+
+    # Change the component note to point at the PR note; the PR note lacks a backlink.
+    _write_note(research / "Component - Foo.md",
+                type="research", subtype="component",
+                tags=["research/component"], status="draft",
+                created="2025-01-15", revised="2025-01-15", revision=1,
+                ai_generated=True, related_notes=['"[[PR 1234 - Bar]]"'],
+                summary="Covers the Foo widget lifecycle and its Pinia store binding.")
+
+    assert git_changed_paths(tmp_path, "HEAD") == {str(research / "Component - Foo.md")}
+    errors, warnings = validate_directory(
+        str(tmp_path), str(REPO_ROOT / "meta_schema.yml"), str(REPO_ROOT / "meta_tags.yml"),
+        since="HEAD",
+    )
+    out = capsys.readouterr().out
+    assert (errors, warnings) == (0, 1)
+    assert "Files: 2 " in out
+    assert "missing backlink to [[Component - Foo]]" in out
+
+
+def test_validate_directory_since_resolves_links_like_a_full_run(tmp_path, capsys):
+    _mini_vault(tmp_path)
+    research = tmp_path / "research"
+    # An exact-title match with errors must not shadow the prefix match on Bar.
+    _write_note(research / "PR 1234.md", type="research", tags=["research/pr"])
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    _write_note(research / "Component - Foo.md",
+                type="research", subtype="component",
+                tags=["research/component"], status="draft",
+                created="2025-01-15", revised="2025-01-15", revision=1,
+                ai_generated=True, related_notes=['"[[PR 1234]]"'],
+                summary="Covers the Foo widget lifecycle and its Pinia store binding.")
+
+    args = (str(tmp_path), str(REPO_ROOT / "meta_schema.yml"), str(REPO_ROOT / "meta_tags.yml"))
+    validate_directory(*args)
+    full = [line for line in capsys.readouterr().out.splitlines() if "missing backlink" in line]
+    validate_directory(*args, since="HEAD")
+    partial = [line for line in capsys.readouterr().out.splitlines() if "missing backlink" in line]
+    assert full
+    assert partial == full
+
+
+def test_validate_directory_since_reuses_cached_results(tmp_path, capsys, monkeypatch):
+    import validate_frontmatter
+    from vault_notes import NoteCache
+
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    _git(vault, "init", "-q")
+    _git(vault, "add", ".")
+    _git(vault, "commit", "-q", "-m", "init")
+    cache = NoteCache(tmp_path / "notes.pickle")
+    results = ResultCache(tmp_path / "validation.json", schema_path, tags_path)
+    validate_directory(vault, schema_path, tags_path, cache, results=results)
+
+    bar = vault / "research" / "PR 1234 - Bar.md"
+    bar.write_text(bar.read_text().replace("revision: 1\n", "revision: 2\n"))
+    validated = []
+    original = validate_frontmatter.validate_note
+    monkeypatch.setattr(validate_frontmatter, "validate_note",
+                        lambda note, schema: validated.append(note) or original(note, schema))
+    capsys.readouterr()
+    errors, warnings = validate_directory(vault, schema_path, tags_path, cache,
+                                          since="HEAD", results=results)
+    assert len(validated) == 1
+    assert (errors, warnings) == (0, 1)
+    assert "missing backlink to [[Component - Foo]]" in capsys.readouterr().out
+
+
+def test_since_without_git_reports_a_clean_error(tmp_path):
+    _mini_vault(tmp_path)
+    proc = subprocess.run(
+        [sys.executable, str(REPO_ROOT / "validate_frontmatter.py"), str(tmp_path), "--since", "HEAD"],
+        capture_output=True, text=True, cwd=REPO_ROOT, env={**os.environ, "PATH": ""},
+    )
+    assert proc.returncode == 2
+    assert proc.stderr.startswith("ERROR: ")
+    assert "Traceback" not in proc.stderr
+
+
+# ---------------------------------------------------------------------------
+# Sharded validation (--shard / --merge)
+# ---------------------------------------------------------------------------
+
+
+def test_shards_partition_the_vault():
+    rels = [p.relative_to(REPO_ROOT / "vault") for p in find_md_files(REPO_ROOT / "vault")]
+    owners = [[i for i in range(1, 5) if in_shard(rel, (i, 4))] for rel in rels]
+    assert all(len(o) == 1 for o in owners)
+    assert len({o[0] for o in owners}) == 4
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for bad in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(bad)
+
+
+def test_merged_shards_report_like_an_unsharded_run(tmp_path, capsys):
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    full = validate_directory(vault, schema_path, tags_path)
+    full_out = capsys.readouterr().out
+    assert "missing backlink" in full_out
+
+    summaries = []
+    for i in (1, 2, 3):
+        summaries.append(tmp_path / f"shard{i}.json")
+        validate_directory(vault, schema_path, tags_path, shard=(i, 3), summary=summaries[-1])
+        assert "missing backlink" not in capsys.readouterr().out
+    assert merge_shard_summaries(vault, summaries) == full
+    assert capsys.readouterr().out == full_out
+
+
+def test_merge_rejects_incomplete_shards(tmp_path):
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    summary = tmp_path / "shard1.json"
+    validate_directory(vault, schema_path, tags_path, shard=(1, 2), summary=summary)
+    with pytest.raises(ValueError, match="each shard once"):
+        merge_shard_summaries(vault, [summary, summary])
+
+
+def test_merge_rejects_summaries_with_missing_keys(tmp_path):
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    summary = tmp_path / "shard1.json"
+    validate_directory(vault, schema_path, tags_path, shard=(1, 1), summary=summary)
+    payload = json.loads(summary.read_text())
+    some_file = next(iter(payload["files"]))
+    broken = [
+        {k: v for k, v in payload.items() if k != "shard"},
+        {k: v for k, v in payload.items() if k != "files"},
+        {**payload, "files": {**payload["files"], some_file: {"errors": []}}},
+    ]
+    for bad in broken:
+        summary.write_text(json.dumps(bad))
+        with pytest.raises(ValueError, match="shard summary"):
+            merge_shard_summaries(vault, [summary])
+    proc = subprocess.run(
+        [sys.executable, str(REPO_ROOT / "validate_frontmatter.py"), str(vault), "--merge", str(summary)],
+        capture_output=True, text=True, cwd=REPO_ROOT,
+    )
+    assert proc.returncode == 2
+    assert proc.stderr.startswith("ERROR: ")
+
+
+def test_merge_honours_trace(tmp_path):
+    vault, schema_path, tags_path = _result_cache_vault(tmp_path)
+    summaries = []
+    for i in (1, 2):
+        summaries.append(str(tmp_path / f"shard{i}.json"))
+        validate_directory(vault, schema_path, tags_path, shard=(i, 2), summary=summaries[-1])
+    trace = tmp_path / "trace.json"
+    subprocess.run(
+        [sys.executable, str(REPO_ROOT / "validate_frontmatter.py"), str(vault),
+         "--schema", str(schema_path), "--tags", str(tags_path),
+         "--trace", str(trace), "--merge", *summaries],
+        capture_output=True, text=True, cwd=REPO_ROOT,
+    )
+    names = {e["name"] for e in json.loads(trace.read_text())["traceEvents"]}
+    assert {"validate_frontmatter", "cross-file"} <= names
+
+
+# ---------------------------------------------------------------------------
+# Watch mode
+# ---------------------------------------------------------------------------
+
+
+def _watched_vault(tmp_path, schema):
+    _mini_vault(tmp_path)
+    watcher = VaultWatcher(tmp_path, schema)
+    watcher.update(watcher.scan())
+    return watcher
+
+
+def test_watcher_initial_load_validates_everything(tmp_path, schema):
+    watcher = _watched_vault(tmp_path, schema)
+    assert set(watcher.results) == {str(p) for p in find_md_files(tmp_path)}
+    assert all(r == ([], []) for r in watcher.results.values())
+    assert watcher.scan() == set()
+
+
+def test_watcher_rechecks_changed_note_and_link_neighbour(tmp_path, schema, capsys):
+    watcher = _watched_vault(tmp_path, schema)
+    foo = tmp_path / "research" / "Component - Foo.md"
+    bar = str(tmp_path / "research" / "PR 1234 - Bar.md")
+    _write_note(foo, type="research", subtype="component",
+                tags=["research/component"], status="draft",
+                created="2025-01-15", revised="2025-01-15", revision=1,
+                ai_generated=True, related_notes=['"[[PR 1234 - Bar]]"'],
+                summary="Covers the Foo widget lifecycle and its Pinia store binding.")
+
+    changed = watcher.scan()
+    assert changed == {str(foo)}
+    affected = watcher.update(changed)
+    assert affected == {str(foo), bar}
+    assert watcher.report(affected) == (0, 1)
+    assert "missing backlink to [[Component - Foo]]" in capsys.readouterr().out
+
+
+def test_watcher_reports_new_errors_and_deletions(tmp_path, schema):
+    watcher = _watched_vault(tmp_path, schema)
+    broken = tmp_path / "research" / "Broken.md"
+    broken.write_text("# no frontmatter\n")
+    assert watcher.update(watcher.scan()) == {str(broken)}
+    assert watcher.results[str(broken)][0] == ["no frontmatter found"]
+
+    broken.unlink()
+    watcher.update(watcher.scan())
+    assert str(broken) not in watcher.results
+
+
+def test_watcher_matches_full_run_for_inverse_relations(tmp_path, schema):
+    watcher = _watched_vault(tmp_path, schema)
+    paper = tmp_path / "research" / "Component - Foo.md"
+    _write_note(paper, type="paper", tags=["paper"], status="draft", title="Foo",
+                paper_stage="drafting", paper_kind="application-note",
+                central_claim="Foo is fast.",
+                created="2025-01-15", revised="2025-01-15", revision=1,
+                ai_generated=True, related_projects=['"[[PR 1234 - Bar]]"'])
+    watcher.update(watcher.scan())
+    files_meta = list(watcher.meta.items())
+    expected = {}
+    for path, warning in validate_inverse_relations(files_meta):
+        expected.setdefault(path, []).append(warning)
+    assert {p: w for p, w in watcher.cross.items() if w} == expected
+
+
+def test_watcher_rechecks_notes_losing_a_prefix_resolved_link(tmp_path, schema):
+    """A new note that takes over a prefix link clears the old target's backlink warning."""
+    watcher = _watched_vault(tmp_path, schema)
+    research = tmp_path / "research"
+    foo = research / "Component - Foo.md"
+    foo.write_text(foo.read_text().replace("revision: 1\n", 'revision: 1\nrelated_notes:\n  - "[[PR 1234]]"\n'))
+    watcher.update(watcher.scan())
+    bar = str(research / "PR 1234 - Bar.md")
+    assert watcher.cross[bar]  # [[PR 1234]] resolves to Bar by prefix
+
+    exact = research / "PR 1234.md"
+    exact.write_text((research / "PR 1234 - Bar.md").read_text())
+    affected = watcher.update(watcher.scan())
+    assert bar in affected
+    assert watcher.cross[bar] == []
+    assert watcher.cross[str(exact)]
+
+
+def _backlink_lines(out):
+    return sorted(line for line in out.splitlines() if "missing backlink" in line)
+
+
+def test_watcher_resolves_links_like_a_full_run(tmp_path, schema, capsys):
+    _mini_vault(tmp_path)
+    research = tmp_path / "research"
+    exact = research / "PR 1234.md"
+    # An exact-title match with errors must not shadow the prefix match on Bar.
+    _write_note(exact, type="research", tags=["research/pr"])
+    _write_note(research / "Component - Foo.md",
+                type="research", subtype="component",
+                tags=["research/component"], status="draft",
+                created="2025-01-15", revised="2025-01-15", revision=1,
+                ai_generated=True, related_notes=['"[[PR 1234]]"'],
+                summary="Covers the Foo widget lifecycle and its Pinia store binding.")
+    args = (str(tmp_path), str(REPO_ROOT / "meta_schema.yml"), str(REPO_ROOT / "meta_tags.yml"))
+
+    validate_directory(*args)
+    full = _backlink_lines(capsys.readouterr().out)
+    assert full
+    watcher = VaultWatcher(tmp_path, schema)
+    watcher.report(watcher.update(watcher.scan()))
+    assert _backlink_lines(capsys.readouterr().out) == full
+
+    # Fixing the exact match moves the link onto it.
+    exact.write_text((research / "PR 1234 - Bar.md").read_text())
+    validate_directory(*args)
+    full = _backlink_lines(capsys.readouterr().out)
+    watcher.update(watcher.scan())
+    watcher.report(watcher.stats)
+    assert _backlink_lines(capsys.readouterr().out) == full
+
+
+def test_watch_rejects_options_it_does_not_honour():
+    for extra in (["--jobs", "2"], ["--format", "ndjson"], ["--trace", "t.json"], ["--since", "HEAD"]):
+        proc = subprocess.run(
+            [sys.executable, str(REPO_ROOT / "validate_frontmatter.py"), "--watch", *extra],
+            capture_output=True, text=True, cwd=REPO_ROOT,
+        )
+        assert proc.returncode == 2
+        assert "--watch cannot be combined" in proc.stderr
+
+
 # ---------------------------------------------------------------------------
 # Dashboard generation
 # ---------------------------------------------------------------------------
@@ -1049,3 +1720,97 @@ def test_generate_index_check_fails(tmp_path):
     idx = tmp_path / "Index.md"
     idx.write_text("# stale\n")
     assert check_index(notes, str(idx)) is False
+
+
+def test_index_catalog_rereads_and_rerenders_only_changes(tmp_path, monkeypatch):
+    import generate_index as index_module
+
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    _mini_vault(vault)
+    catalog_file = tmp_path / "index.pickle"
+    catalog = IndexCatalog(catalog_file)
+    first = catalog.render(collect_notes(vault, catalog=catalog))
+    assert first == generate_index(collect_notes(vault))
+    catalog.save()
+
+    read = []
+    real_note_dict = index_module.note_dict
+    monkeypatch.setattr(index_module, "note_dict",
+                        lambda v, path, cache=None: read.append(path.name) or real_note_dict(v, path, cache))
+    rendered = []
+    real_render_section = index_module.render_section
+    monkeypatch.setattr(index_module, "render_section",
+                        lambda key, notes: rendered.append(key) or real_render_section(key, notes))
+
+    catalog = IndexCatalog(catalog_file)
+    unchanged = catalog.render(collect_notes(vault, catalog=catalog))
+    assert (read, rendered) == ([], [])
+    assert unchanged == first
+
+    foo = vault / "research" / "Component - Foo.md"
+    foo.write_text(foo.read_text().replace("Foo widget", "Foo gadgetry"))
+    (vault / "projects" / "demo" / "index.md").unlink()
+    notes = collect_notes(vault, catalog=catalog)
+    out = catalog.render(notes)
+    assert read == ["Component - Foo.md"]
+    assert sorted(rendered) == ["projects", "research"]
+    assert "Foo gadgetry" in out and "[[demo]]" not in out
+    monkeypatch.undo()
+    assert out == generate_index(collect_notes(vault))
+
+
+def test_index_catalog_stale_only_when_a_note_must_be_read(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    _mini_vault(vault)
+    paths = list(find_md_files(vault))
+    catalog = IndexCatalog(tmp_path / "index.pickle")
+    assert catalog.stale(vault, paths)
+    collect_notes(vault, paths=paths, catalog=catalog)
+    catalog.save()
+
+    catalog = IndexCatalog(tmp_path / "index.pickle")
+    assert not catalog.stale(vault, paths)
+    assert not catalog.stale(vault, paths[1:])  # a removed note needs no read
+    paths[0].write_text(paths[0].read_text() + "\nMore.\n")
+    assert catalog.stale(vault, paths)
+
+
+def test_split_index_writes_root_and_section_pages(tmp_path):
+    _mini_vault(tmp_path)
+    notes = collect_notes(tmp_path)
+    root = tmp_path / "Index.md"
+    shards = tmp_path / "Index"
+    assert write_index_shards(notes, root, shards) == 4
+    assert sorted(p.name for p in shards.iterdir()) == [
+        "Index - Papers.md", "Index - Projects.md",
+        "Index - Research - Components.md", "Index - Research - Pull Requests.md",
+    ]
+    out = root.read_text()
+    # Same section order as the single-page index; research subtypes in RESEARCH_SUBTYPE_ORDER.
+    assert out.index("[[Index - Projects]]") < out.index("[[Index - Papers]]") \
+        < out.index("[[Index - Research - Components]]") < out.index("[[Index - Research - Pull Requests]]")
+    assert "[[Component - Foo]]" in (shards / "Index - Research - Components.md").read_text()
+    assert check_index_shards(notes, root, shards)
+    # The pages are not notes.
+    assert not any(p.parent == shards for p in find_md_files(tmp_path))
+
+
+def test_split_index_pages_large_sections_and_drops_stale_pages(tmp_path):
+    _mini_vault(tmp_path)
+    notes = collect_notes(tmp_path)
+    research = [n for n in notes if n["type"] == "research"]
+    root = tmp_path / "Index.md"
+    shards = tmp_path / "Index"
+    write_index_shards(notes, root, shards)
+    many = notes + [dict(research[0], slug=f"Component - N{i}", title=f"N{i}") for i in range(5)]
+    write_index_shards(many, root, shards, page_size=2)
+    names = sorted(p.name for p in shards.iterdir())
+    assert "Index - Research - Components 3.md" in names
+    assert "Index - Research - Components 4.md" not in names
+    assert check_index_shards(many, root, shards, page_size=2)
+    assert not check_index_shards(notes, root, shards, page_size=2)
+
+    write_index_shards([n for n in notes if n["type"] != "paper"], root, shards)
+    assert not (shards / "Index - Papers.md").exists()
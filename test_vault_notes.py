@@ -0,0 +1,289 @@
+"""Tests for vault_notes.py — shared note parsing and the on-disk parse cache."""
+import datetime
+import os
+import subprocess
+
+import pytest
+import yaml
+
+from vault_notes import (
+    DISCOVERY_ENV,
+    YAML_BACKEND_ENV,
+    NoteCache,
+    git_md_files,
+    list_md_files,
+    load_note,
+    load_yaml,
+    note_body,
+    parse_note,
+    read_body,
+    read_frontmatter_text,
+    walk_md_files,
+    yaml_loader,
+)
+
+needs_libyaml = pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML built without libyaml")
+
+NOTE = (
+    "---\n"
+    "type: concept\n"
+    "created: 2025-01-15\n"
+    "---\n"
+    "\n# Heading\n\nBody.\n"
+)
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return parse_note(text)
+
+
+def test_parse_note_extracts_metadata():
+    entry = parse_note(NOTE)
+    assert entry["frontmatter"] is True
+    assert entry["error"] is None
+    assert entry["metadata"]["created"] == datetime.date(2025, 1, 15)
+
+
+def test_parse_note_requires_delimiter_on_first_line():
+    assert parse_note("\n---\ntype: concept\n---\n")["frontmatter"] is False
+
+
+def test_parse_note_unterminated_block_has_empty_metadata():
+    entry = parse_note("---\ntype: concept\n")
+    assert entry["frontmatter"] is True
+    assert entry["metadata"] == {}
+
+
+def test_parse_note_non_mapping_block_has_empty_metadata():
+    assert parse_note("---\n- a\n---\nbody")["metadata"] == {}
+
+
+def test_parse_note_without_frontmatter():
+    entry = parse_note("# Just a heading\n")
+    assert entry["frontmatter"] is False
+    assert entry["metadata"] is None
+
+
+def test_parse_note_records_yaml_error():
+    entry = parse_note("---\ntype: [unclosed\n---\nbody\n")
+    assert entry["frontmatter"] is True
+    assert entry["error"]
+
+
+def test_read_frontmatter_text_stops_at_closing_delimiter(tmp_path):
+    md = tmp_path / "n.md"
+    md.write_text(NOTE + "x" * 100_000)
+    text = read_frontmatter_text(md)
+    assert text == "---\ntype: concept\ncreated: 2025-01-15\n---\n"
+    assert parse_note(text) == parse_note(md.read_text())
+
+
+def test_read_frontmatter_text_stops_after_first_line_without_frontmatter(tmp_path):
+    md = tmp_path / "n.md"
+    md.write_text("# Heading\n---\nnot: frontmatter\n---\n")
+    assert read_frontmatter_text(md) == "# Heading\n"
+
+
+def test_note_body_and_read_body(tmp_path):
+    assert note_body(NOTE) == "# Heading\n\nBody."
+    assert note_body("# Only body\n") == "# Only body"
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    assert read_body(md) == "# Heading\n\nBody."
+
+
+def test_load_note_without_cache(tmp_path):
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    assert load_note(md)["metadata"]["type"] == "concept"
+
+
+def test_cache_ignores_body_only_edits(tmp_path):
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    cache = NoteCache(tmp_path / "cache.pickle")
+    parse = CountingParser()
+    cache.get(md, "note", parse, read_frontmatter_text)
+    md.write_text(NOTE + "More body text.\n")
+    cache.get(md, "note", parse, read_frontmatter_text)
+    assert parse.calls == 1
+
+
+def test_cache_hit_skips_parse(tmp_path):
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    cache = NoteCache(tmp_path / "cache.pickle")
+    parse = CountingParser()
+    cache.get(md, "note", parse)
+    cache.get(md, "note", parse)
+    assert parse.calls == 1
+
+
+def test_cache_touch_with_same_content_skips_parse(tmp_path):
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    cache = NoteCache(tmp_path / "cache.pickle")
+    parse = CountingParser()
+    cache.get(md, "note", parse)
+    st = md.stat()
+    os.utime(md, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+    cache.get(md, "note", parse)
+    assert parse.calls == 1
+
+
+def test_cache_reparses_changed_content(tmp_path):
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    cache = NoteCache(tmp_path / "cache.pickle")
+    parse = CountingParser()
+    cache.get(md, "note", parse)
+    md.write_text(NOTE.replace("concept", "moc") + "more\n")
+    entry = cache.get(md, "note", parse)
+    assert parse.calls == 2
+    assert entry["metadata"]["type"] == "moc"
+
+
+def test_cache_persists_across_instances(tmp_path):
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    cache_path = tmp_path / "cache.pickle"
+    cache = NoteCache(cache_path)
+    cache.get(md, "note", parse_note)
+    cache.save()
+
+    parse = CountingParser()
+    entry = NoteCache(cache_path).get(md, "note", parse)
+    assert parse.calls == 0
+    assert entry["metadata"]["created"] == datetime.date(2025, 1, 15)
+
+
+def test_cache_save_drops_deleted_files(tmp_path):
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    cache_path = tmp_path / "cache.pickle"
+    cache = NoteCache(cache_path)
+    cache.get(md, "note", parse_note)
+    cache.save()
+    md.unlink()
+
+    reloaded = NoteCache(cache_path)
+    reloaded.save()
+    assert NoteCache(cache_path)._entries == {}
+
+
+def test_cache_ignores_corrupt_file(tmp_path):
+    cache_path = tmp_path / "cache.pickle"
+    cache_path.write_bytes(b"not a pickle")
+    assert NoteCache(cache_path)._entries == {}
+
+
+def test_snapshot_cache_stats_each_file_once(tmp_path, monkeypatch):
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    cache = NoteCache(None, snapshot=True)
+    parse = CountingParser()
+    cache.get(md, "note", parse)
+    monkeypatch.setattr(os, "stat", lambda *a, **k: pytest.fail("stat after first get"))
+    assert cache.get(md, "note", parse)["metadata"]["type"] == "concept"
+    assert cache.fresh(md, "note")["metadata"]["type"] == "concept"
+    assert parse.calls == 1
+
+
+def test_in_memory_cache_never_touches_disk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    md = tmp_path / "n.md"
+    md.write_text(NOTE)
+    cache = NoteCache(None)
+    cache.get(md, "note", parse_note)
+    cache.save()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["n.md"]
+
+
+@needs_libyaml
+def test_yaml_backends_parse_identically():
+    text = "d: 2025-01-15\nt: 2025-01-15 10:00:00\nn: ~\nb: yes\no: 0o17\nl: ['[[A]]', 1_000]\n"
+    assert load_yaml(text, "c") == load_yaml(text, "python")
+    assert load_yaml(text, "c")["d"] == datetime.date(2025, 1, 15)
+    assert parse_note(NOTE, "c") == parse_note(NOTE, "python")
+
+
+@needs_libyaml
+def test_yaml_backends_report_identical_errors():
+    bad = "---\nsummary: a: b\n---\n"
+    assert parse_note(bad, "c")["error"] == parse_note(bad, "python")["error"]
+    assert "mapping values are not allowed here" in parse_note(bad, "c")["error"]
+
+
+def test_yaml_backend_selection(monkeypatch):
+    assert yaml_loader("python") is yaml.SafeLoader
+    monkeypatch.setenv(YAML_BACKEND_ENV, "python")
+    assert yaml_loader() is yaml.SafeLoader
+    with pytest.raises(ValueError, match="unknown YAML backend"):
+        yaml_loader("rust")
+
+
+def test_c_backend_without_libyaml_raises(monkeypatch):
+    monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+    assert yaml_loader("auto") is yaml.SafeLoader
+    with pytest.raises(RuntimeError, match="libyaml"):
+        yaml_loader("c")
+
+
+def _md_tree(root):
+    """Files whose names sort differently as strings than as path parts ("a.md" < "a/b.md" bytewise)."""
+    for rel in ("a.md", "a/b.md", "a/z/c.md", "a-b.md", "B.md", "a/.hidden/x.md",
+                ".obsidian/plugin.md", "notes.txt"):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x\n")
+
+
+def test_walk_matches_sorted_rglob(tmp_path):
+    _md_tree(tmp_path)
+    assert list(walk_md_files(tmp_path)) == sorted(tmp_path.rglob("*.md"))
+
+
+def test_walk_prunes_skipped_dirs(tmp_path, monkeypatch):
+    _md_tree(tmp_path)
+    expected = [p for p in sorted(tmp_path.rglob("*.md")) if "/." not in str(p)]
+    listed = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: listed.append(os.path.basename(path)) or real_scandir(path))
+    assert list(walk_md_files(tmp_path, lambda name: name.startswith("."))) == expected
+    assert ".obsidian" not in listed and ".hidden" not in listed
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def test_git_discovery_matches_walk(tmp_path):
+    _md_tree(tmp_path)
+    (tmp_path / "gone.md").write_text("x\n")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    (tmp_path / "gone.md").unlink()
+    (tmp_path / "a" / "new.md").write_text("x\n")  # untracked, still listed
+    (tmp_path / ".gitignore").write_text("ignored.md\n")
+    (tmp_path / "ignored.md").write_text("x\n")
+
+    assert git_md_files(tmp_path) == [p for p in walk_md_files(tmp_path) if p.name != "ignored.md"]
+
+
+def test_git_discovery_falls_back_to_walk_outside_git(tmp_path, monkeypatch):
+    _md_tree(tmp_path)
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
+    assert git_md_files(tmp_path) is None
+    monkeypatch.setenv(DISCOVERY_ENV, "git")
+    assert list(list_md_files(tmp_path)) == list(walk_md_files(tmp_path))
+    with pytest.raises(ValueError, match="unknown discovery mode"):
+        list_md_files(tmp_path, mode="find")
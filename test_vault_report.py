@@ -0,0 +1,145 @@
+"""Tests for vault_report.py — text, NDJSON and SARIF validation reporters."""
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import vault_report
+from validate_frontmatter import validate_directory
+from vault_report import (
+    NdjsonReporter,
+    SarifReporter,
+    TextReporter,
+    diagnostic_rule,
+    field_line,
+    split_diagnostic,
+)
+
+REPO = Path(__file__).parent
+SCHEMA = REPO / "meta_schema.yml"
+TAGS = REPO / "meta_tags.yml"
+
+GOOD = """---
+type: concept
+tags:
+  - concept
+status: draft
+created: 2025-01-15
+revised: 2025-01-15
+revision: 1
+ai_generated: true
+summary: "A perfectly valid concept note for testing"
+related_notes:
+  - "[[Bad]]"
+---
+"""
+BAD = GOOD.replace("  - concept\n", "  - not-a-tag\n").replace("[[Bad]]", "[[Good]]")
+BAD = BAD.replace("revised: 2025-01-15", "revised: '2025-13-45'")
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = tmp_path / "vault"
+    (vault / "research").mkdir(parents=True)
+    (vault / "research/Good.md").write_text(GOOD)
+    (vault / "research/Bad.md").write_text(BAD)
+    (vault / "research/Lonely.md").write_text(GOOD.replace("[[Bad]]", "[[Good]]"))
+    return vault
+
+
+@pytest.mark.parametrize("text, rule", [
+    ("no frontmatter found", "no-frontmatter"),
+    ("failed to read: [Errno 2] No such file", "unreadable"),
+    ("failed to parse frontmatter: mapping values are not allowed", "unreadable"),
+    ("revised: '2025-13-45' is not a valid ISO date (YYYY-MM-DD)", "date"),
+    ("related_notes[2]: wiki link has whitespace-only inner text: '[[ ]]'", "wiki-link"),
+    ("tags: expected 'concept' tag for type=concept but tags are ['moc']", "type-tag"),
+    ("related_notes: missing backlink to [[A]] (declared in a.md)", "missing-backlink"),
+    ("related_notes: missing backlink to [[P]] (declared in p.md related_projects)", "missing-backlink"),
+    ("tags.0: 'x' is not one of ['concept']", "schema"),
+    ("(root): 'summary' is a required property", "schema"),
+])
+def test_diagnostic_rule(text, rule):
+    assert diagnostic_rule(text) == rule
+
+
+def test_split_diagnostic():
+    assert split_diagnostic("tags.0: 'x' is bad") == ("tags.0", "'x' is bad")
+    assert split_diagnostic("related_notes[2]: empty: yes") == ("related_notes[2]", "empty: yes")
+    assert split_diagnostic("(root): 'summary' is a required property") == (
+        None, "'summary' is a required property")
+    assert split_diagnostic("failed to read: boom") == (None, "failed to read: boom")
+
+
+def test_field_line(vault):
+    path = vault / "research/Bad.md"
+    assert field_line(path, "tags.0") == 3
+    assert field_line(path, "related_notes[0]") == 11
+    assert field_line(path, "github_pr") is None
+    assert field_line(path, None) is None
+
+
+def test_reporter_reads_each_file_frontmatter_once(vault, monkeypatch):
+    reads = []
+    original = vault_report.read_frontmatter_text
+    monkeypatch.setattr(vault_report, "read_frontmatter_text",
+                        lambda path: reads.append(str(path)) or original(path))
+    out = io.StringIO()
+    errors, warnings = validate_directory(vault, SCHEMA, TAGS, reporter=NdjsonReporter(out))
+    assert errors + warnings > len(reads)
+    assert len(reads) == len(set(reads))
+
+def test_ndjson_streams_one_record_per_diagnostic(vault):
+    out = io.StringIO()
+    errors, warnings = validate_directory(vault, SCHEMA, TAGS, reporter=NdjsonReporter(out))
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    diagnostics = [r for r in records if r["type"] == "diagnostic"]
+    assert records[-1] == {"type": "summary", "files": 3, "errors": errors, "warnings": warnings}
+    assert len(diagnostics) == errors + warnings
+    bad = [d for d in diagnostics if d["file"].endswith("Bad.md")]
+    assert {(d["severity"], d["rule"], d["field"], d["line"]) for d in bad} >= {
+        ("error", "schema", "tags.0", 3),
+        ("error", "date", "revised", 7),
+    }
+    # Good.md does not link back to Lonely.md
+    assert {"file": str(vault / "research/Good.md"), "line": 11, "field": "related_notes",
+            "severity": "warning", "rule": "missing-backlink"}.items() <= [
+        d for d in diagnostics if d["rule"] == "missing-backlink"
+    ][0].items()
+
+
+def test_sarif_is_a_valid_log(vault):
+    out = io.StringIO()
+    errors, warnings = validate_directory(vault, SCHEMA, TAGS, reporter=SarifReporter(out))
+    log = json.loads(out.getvalue())
+    assert log["version"] == "2.1.0"
+    run = log["runs"][0]
+    rule_ids = {rule["id"] for rule in run["tool"]["driver"]["rules"]}
+    assert len(run["results"]) == errors + warnings
+    assert {r["ruleId"] for r in run["results"]} <= rule_ids
+    assert run["properties"] == {"files": 3, "errors": errors, "warnings": warnings}
+    date = next(r for r in run["results"] if r["ruleId"] == "date")
+    assert date["level"] == "error"
+    location = date["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"]["uri"].endswith("research/Bad.md")
+    assert location["region"] == {"startLine": 7}
+
+
+def test_sarif_without_results_is_valid():
+    out = io.StringIO()
+    reporter = SarifReporter(out)
+    reporter.start()
+    reporter.finish(0, 0, 0)
+    assert json.loads(out.getvalue())["runs"][0]["results"] == []
+
+
+def test_text_reporter_groups_cross_file_warnings_under_one_header():
+    out = io.StringIO()
+    reporter = TextReporter(out)
+    reporter.file("a.md", ["x: bad"], ["y: meh"])
+    reporter.cross_file("a.md", "related_notes: missing backlink")
+    reporter.cross_file("b.md", "related_notes: one")
+    reporter.cross_file("b.md", "related_notes: two")
+    assert out.getvalue().count("\na.md:") == 1
+    assert out.getvalue().count("\nb.md:") == 1
@@ -0,0 +1,64 @@
+"""Tests for vault_trace.py — opt-in Chrome-trace span recording."""
+import io
+import json
+import os
+from contextlib import redirect_stdout
+
+import vault_trace
+from validate_frontmatter import validate_directory
+from vault_trace import span, tracing
+
+VAULT = os.path.join(os.path.dirname(__file__), "vault")
+SCHEMA = os.path.join(os.path.dirname(__file__), "meta_schema.yml")
+TAGS = os.path.join(os.path.dirname(__file__), "meta_tags.yml")
+
+
+def _events(path):
+    return json.loads(path.read_text())["traceEvents"]
+
+
+def test_span_is_shared_no_op_when_disabled():
+    assert span("read") is span("yaml", path="x")
+    with span("read"):
+        pass
+
+
+def test_tracing_none_records_nothing(tmp_path):
+    with tracing(None) as tracer:
+        assert tracer is None
+        assert span("read") is span("yaml")
+
+
+def test_tracing_writes_nested_complete_events(tmp_path):
+    out = tmp_path / "trace.json"
+    with tracing(out, "tool"):
+        with span("discovery"):
+            with span("read", path="a.md"):
+                pass
+    events = _events(out)
+    assert [e["name"] for e in events] == ["read", "discovery", "tool"]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    read, discovery, tool = events
+    assert read["args"] == {"path": "a.md"}
+    assert tool["ts"] <= discovery["ts"] <= read["ts"]
+    assert read["ts"] + read["dur"] <= discovery["ts"] + discovery["dur"]
+    assert vault_trace._tracer is None
+
+
+def test_trace_is_written_when_the_block_raises(tmp_path):
+    out = tmp_path / "trace.json"
+    try:
+        with tracing(out):
+            with span("discovery"):
+                raise SystemExit(2)
+    except SystemExit:
+        pass
+    assert [e["name"] for e in _events(out)] == ["discovery", "main"]
+
+
+def test_validator_phases_are_traced(tmp_path):
+    out = tmp_path / "trace.json"
+    with tracing(out), redirect_stdout(io.StringIO()):
+        validate_directory(VAULT, SCHEMA, TAGS)
+    names = {e["name"] for e in _events(out)}
+    assert {"schema-load", "discovery", "read", "yaml", "schema", "cross-file"} <= names
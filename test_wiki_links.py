@@ -0,0 +1,70 @@
+"""Tests for wiki_links.py — slugs and indexed wiki-link resolution."""
+import random
+
+import pytest
+
+from wiki_links import SlugIndex, body_links, slugify, strip_brackets
+
+
+def _linear_resolve(slug, slug_to_target):
+    """The original dict-scan semantics SlugIndex must reproduce."""
+    if not slug:
+        return None
+    if slug in slug_to_target:
+        return slug_to_target[slug]
+    for candidate, target in slug_to_target.items():
+        if candidate.startswith(slug):
+            return target
+    return None
+
+
+def test_slugify_matches_site_rules():
+    assert slugify("Issue 17506 - Convert Workflow") == "issue-17506-convert-workflow"
+    assert slugify("PR 18758 - Tool (Typing)") == "pr-18758-tool-typing"
+    assert slugify("a  --  b") == "a-b"
+
+
+def test_strip_brackets():
+    assert strip_brackets("[[ Note ]]") == "Note"
+    assert strip_brackets("Note") is None
+    assert strip_brackets(3) is None
+
+
+def test_exact_match_beats_earlier_prefix_match():
+    index = SlugIndex({"issue-1-long": "long.md", "issue-1": "exact.md"})
+    assert index.resolve("[[Issue 1]]") == "exact.md"
+
+
+def test_first_inserted_prefix_match_wins():
+    # "b..." sorts after "a..." but was inserted first.
+    index = SlugIndex({"plan-b-zeta": "zeta.md", "plan-a": "a.md", "plan-b-alpha": "alpha.md"})
+    assert index.resolve("[[Plan B]]") == "zeta.md"
+    assert index.resolve("[[Plan]]") == "zeta.md"
+
+
+def test_dangling_and_malformed_links():
+    index = SlugIndex({"note": "note.md"})
+    assert index.resolve("[[Other]]") is None
+    assert index.resolve("[[   ]]") is None
+    assert index.resolve("[[!!!]]") is None
+    assert index.resolve("Note") is None
+    assert SlugIndex({}).resolve("[[Note]]") is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    slugs = {}
+    for i in range(rng.randint(1, 200)):
+        slug = "".join(rng.choice("ab1-") for _ in range(rng.randint(1, 8)))
+        slugs[slug] = f"{i}.md"
+    index = SlugIndex(slugs)
+    for _ in range(300):
+        query = "".join(rng.choice("ab1-") for _ in range(rng.randint(0, 5)))
+        assert index.resolve_slug(query) == _linear_resolve(query, slugs)
+
+
+def test_body_links_strip_alias_heading_and_same_note_links():
+    body = r"[[A|alias]] [[B#Heading]] [[#Local]] ![[C]] | [[D\|table alias]] |"
+    assert [label for _, label in body_links(body)] == ["A", "B", "C", "D"]
+    assert next(body_links("x [[A]]")) == (2, "A")
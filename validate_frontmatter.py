@@ -2,7 +2,6 @@
 # /// script
 # requires-python = ">=3.10"
 # dependencies = [
-#     "python-frontmatter",
 #     "jsonschema",
 #     "pyyaml",
 # ]
@@ -10,22 +9,66 @@
 """Validate YAML frontmatter in Galaxy notes against JSON Schema.
 
 Usage:
-    uv run validate_frontmatter.py [directory] [--schema FILE] [--tags FILE]
+    uv run validate_frontmatter.py [directory] [--schema FILE] [--tags FILE] [--no-cache] [--jobs N]
+    uv run validate_frontmatter.py --since origin/main  # changed notes + link neighbours
+    uv run validate_frontmatter.py --watch              # revalidate notes as they are saved
+    uv run validate_frontmatter.py --trace trace.json   # per-phase timings for ui.perfetto.dev
+    uv run validate_frontmatter.py --format ndjson      # one JSON record per diagnostic (or sarif)
+    uv run validate_frontmatter.py --shard 1/4 --shard-summary s1.json  # one CI job's quarter
+    uv run validate_frontmatter.py --merge s1.json s2.json s3.json s4.json  # combined report
 
 Loads meta_tags.yml to build the allowed tag enum, injects it into
 meta_schema.yml, then validates every .md file in the target directory.
+Per-note results are cached in .cache/validation.json by frontmatter hash, so
+unchanged notes are not re-validated until the schema, tags or validator change.
 """
 import argparse
+import copy
 import datetime
+import hashlib
+import json
+import os
 import re
+import subprocess
 import sys
+import time
+import zlib
+from array import array
 from pathlib import Path
 
-import frontmatter
-import jsonschema
-import yaml
+from tag_index import tag_lineage
+from vault_notes import (
+    DEFAULT_CACHE_DIR,
+    NoteCache,
+    list_md_files,
+    load_note,
+    load_yaml,
+    read_frontmatter_text,
+    read_note_entry,
+)
+from vault_report import REPORTERS, TextReporter
+from vault_trace import span, tracing
+from wiki_links import WIKI_LINK_RE as _WIKI_LINK_RE
+from wiki_links import SlugIndex
+from wiki_links import note_stem as _note_stem
+from wiki_links import slugify as _slugify
+from wiki_links import strip_brackets as _strip_brackets
+
+# Bump when CompiledSchema's on-disk form or evaluation changes.
+COMPILED_SCHEMA_VERSION = 1
+
+# Bump when any per-note check (validate_note) changes its output, or ResultCache
+# entries change shape; cached results are then discarded.
+VALIDATOR_VERSION = 2
+DEFAULT_RESULTS_CACHE = DEFAULT_CACHE_DIR / "validation.json"
+
+# Bump when the --shard-summary file format changes; --merge rejects other versions.
+SHARD_SUMMARY_VERSION = 1
 
 SKIP_DIRS = {".obsidian", "templates", "reviews"}
+# Vault-root directory holding the pages of a sharded index (generate_index.py
+# --split). Skipped at the root only; an "Index" directory deeper down holds notes.
+INDEX_SHARD_DIR = "Index"
 SKIP_FILES = {"Dashboard.md", "Index.md", "log.md"}
 
 # Wiki link fields and whether they hold a single value or array of values.
@@ -36,6 +79,22 @@ WIKI_LINK_FIELDS = {
     "related_projects": "array",
 }
 
+# Link fields that make two notes neighbours for --since incremental validation.
+NEIGHBOUR_LINK_FIELDS = ("related_notes", "parent_plan", "related_projects")
+
+# Declared inverse relations, as (field, source type, target type, inverse fields):
+# a note of source type linking through field to a note of target type must be
+# linked back through one of the target's inverse fields (None matches any
+# type); warnings name the first. A paper's related_projects entry is the
+# back-reference for a project's related_notes link to it. parent_plan and
+# related_issues are one-way -- plans do not list their sections, issue notes
+# do not list the plans tracking them -- so they are resolved into the edge
+# index but carry no rule.
+INVERSE_RELATIONS = (
+    ("related_notes", None, None, ("related_notes", "related_projects")),
+    ("related_projects", "paper", "project", ("related_notes",)),
+)
+
 # Maps (type, subtype) -> expected tag. subtype=None for non-research types.
 TYPE_TAG_MAP = {
     ("research", "component"): "research/component",
@@ -57,14 +116,14 @@ TYPE_TAG_MAP = {
 def load_tags(tags_path):
     """Load allowed tags from meta_tags.yml. Returns list of tag strings."""
     with open(tags_path) as f:
-        data = yaml.safe_load(f)
+        data = load_yaml(f.read())
     return list(data.keys())
 
 
 def load_schema(schema_path, tags):
     """Load JSON Schema from YAML file and inject tag enum."""
     with open(schema_path) as f:
-        schema = yaml.safe_load(f)
+        schema = load_yaml(f.read())
     schema["properties"]["tags"]["items"]["enum"] = tags
     return schema
 
@@ -82,13 +141,331 @@ def preprocess_frontmatter(data):
     return result
 
 
+def _const_condition(if_schema):
+    """Compile an allOf `if` of the form {properties: {f: {const: str}}, required: [...]}.
+
+    Returns (required fields, {field: const}) or None if the shape is anything else.
+    """
+    if set(if_schema) - {"properties", "required"}:
+        return None
+    consts = {}
+    for field, sub in if_schema.get("properties", {}).items():
+        if set(sub) != {"const"} or not isinstance(sub["const"], str):
+            return None
+        consts[field] = sub["const"]
+    return tuple(if_schema.get("required", ())), consts
+
+
+def _is_integer(value):
+    # Draft 7: bools are not integers, integral floats are.
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+_TYPE_CHECKS = {
+    "string": lambda v: isinstance(v, str),
+    "integer": _is_integer,
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+    "null": lambda v: v is None,
+}
+
+# Keywords that never produce errors without a format checker.
+_ANNOTATION_KEYWORDS = {"$schema", "title", "description", "format", "$comment"}
+
+
+def _compile_predicate(schema):
+    """Compile a Draft 7 schema into a fast `is_valid(instance) -> bool`.
+
+    Covers the keywords meta_schema.yml uses; returns None if the schema uses
+    anything else, in which case callers fall back to jsonschema.
+    """
+    if schema is True or schema == {}:
+        return lambda v: True
+    if not isinstance(schema, dict):
+        return None
+    checks = []
+    for keyword, value in schema.items():
+        if keyword in _ANNOTATION_KEYWORDS or keyword in ("then", "else"):
+            continue
+        if keyword == "type":
+            names = value if isinstance(value, list) else [value]
+            if any(n not in _TYPE_CHECKS for n in names):
+                return None
+            fns = [_TYPE_CHECKS[n] for n in names]
+            checks.append(lambda v, fns=fns: any(f(v) for f in fns))
+        elif keyword in ("enum", "const"):
+            options = value if keyword == "enum" else [value]
+            if not all(isinstance(o, str) for o in options):
+                return None
+            allowed = frozenset(options)
+            checks.append(lambda v, allowed=allowed: isinstance(v, str) and v in allowed)
+        elif keyword == "required":
+            fields = tuple(value)
+            checks.append(lambda v, fields=fields: not isinstance(v, dict) or all(f in v for f in fields))
+        elif keyword == "properties":
+            props = {}
+            for name, sub in value.items():
+                props[name] = _compile_predicate(sub)
+                if props[name] is None:
+                    return None
+            checks.append(lambda v, props=props: not isinstance(v, dict) or all(
+                props[k](x) for k, x in v.items() if k in props))
+        elif keyword == "additionalProperties":
+            if value is not False or "patternProperties" in schema:
+                return None
+            known = frozenset(schema.get("properties", {}))
+            checks.append(lambda v, known=known: not isinstance(v, dict) or all(k in known for k in v))
+        elif keyword == "items":
+            item = _compile_predicate(value)
+            if item is None:
+                return None
+            checks.append(lambda v, item=item: not isinstance(v, list) or all(item(x) for x in v))
+        elif keyword in ("minItems", "maxItems", "minLength", "maxLength"):
+            kind = list if keyword.endswith("Items") else str
+            bound = value
+            if keyword.startswith("min"):
+                checks.append(lambda v, kind=kind, bound=bound: not isinstance(v, kind) or len(v) >= bound)
+            else:
+                checks.append(lambda v, kind=kind, bound=bound: not isinstance(v, kind) or len(v) <= bound)
+        elif keyword in ("minimum", "maximum"):
+            is_number = _TYPE_CHECKS["number"]
+            if keyword == "minimum":
+                checks.append(lambda v, b=value, is_number=is_number: not is_number(v) or v >= b)
+            else:
+                checks.append(lambda v, b=value, is_number=is_number: not is_number(v) or v <= b)
+        elif keyword == "pattern":
+            rx = re.compile(value)
+            checks.append(lambda v, rx=rx: not isinstance(v, str) or rx.search(v) is not None)
+        elif keyword in ("oneOf", "allOf"):
+            subs = [_compile_predicate(sub) for sub in value]
+            if any(sub is None for sub in subs):
+                return None
+            if keyword == "oneOf":
+                checks.append(lambda v, subs=subs: sum(1 for f in subs if f(v)) == 1)
+            else:
+                checks.append(lambda v, subs=subs: all(f(v) for f in subs))
+        elif keyword == "if":
+            cond = _compile_predicate(value)
+            then = _compile_predicate(schema.get("then", True))
+            else_ = _compile_predicate(schema.get("else", True))
+            if None in (cond, then, else_):
+                return None
+            checks.append(lambda v, c=cond, t=then, e=else_: t(v) if c(v) else e(v))
+        else:
+            return None
+    return lambda v: all(check(v) for check in checks)
+
+
+class CompiledSchema:
+    """The merged frontmatter schema, prepared once for fast per-note validation.
+
+    Produces the same errors, in the same order, as a Draft7Validator over the
+    merged schema, but:
+
+    - valid notes (the common case) are accepted by a predicate compiled from
+      the schema, without touching jsonschema at all;
+    - the injected tag enum is checked against a frozenset instead of a list scan;
+    - allOf if/then branches whose `if` only tests const type/subtype values are
+      evaluated directly on the note, and only matching `then` schemas run;
+    - the underlying validators are built once, not per note, and only when the
+      first invalid note needs them, so a clean run never imports jsonschema.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.is_valid = _compile_predicate(schema)
+        self.tag_enum = schema.get("properties", {}).get("tags", {}).get("items", {}).get("enum")
+        self.tag_set = frozenset(t for t in self.tag_enum or () if isinstance(t, str))
+        self.base = None
+
+    def _build_validators(self):
+        import jsonschema
+
+        base = copy.deepcopy(self.schema)
+        base.get("properties", {}).get("tags", {}).get("items", {}).pop("enum", None)
+
+        self.branches = []  # (condition or None, if validator or None, then validator or None, whole-branch validator or None)
+        for branch in base.pop("allOf", []):
+            if set(branch) - {"if", "then"} or "if" not in branch:
+                self.branches.append((None, None, None, jsonschema.Draft7Validator(branch)))
+                continue
+            then = jsonschema.Draft7Validator(branch["then"]) if "then" in branch else None
+            condition = _const_condition(branch["if"])
+            if_validator = None if condition else jsonschema.Draft7Validator(branch["if"])
+            self.branches.append((condition, if_validator, then, None))
+
+        additional = base.pop("additionalProperties", None)
+        self.tail = None
+        if additional is not None:
+            tail = {"properties": {k: {} for k in base.get("properties", {})}, "additionalProperties": additional}
+            if "patternProperties" in base:
+                tail["patternProperties"] = {k: {} for k in base["patternProperties"]}
+            self.tail = jsonschema.Draft7Validator(tail)
+        self.base = jsonschema.Draft7Validator(base)
+
+    def __reduce__(self):
+        # Validators are rebuilt rather than pickled (for --jobs worker processes).
+        return (CompiledSchema, (self.schema,))
+
+    def _tag_errors(self, data):
+        if self.tag_enum is None or not isinstance(data, dict):
+            return
+        tags = data.get("tags")
+        if not isinstance(tags, list):
+            return
+        for i, tag in enumerate(tags):
+            if not (isinstance(tag, str) and tag in self.tag_set):
+                yield (["tags", i], f"{tag!r} is not one of {self.tag_enum!r}")
+
+    @staticmethod
+    def _matches(condition, data):
+        if not isinstance(data, dict):
+            return True  # properties/required are vacuously true for non-objects
+        required, consts = condition
+        if any(field not in data for field in required):
+            return False
+        return all(data[field] == value for field, value in consts.items() if field in data)
+
+    def iter_errors(self, data):
+        """Yield (path list, message) in Draft7Validator's keyword order."""
+        if self.is_valid is not None and self.is_valid(data):
+            return
+        if self.base is None:
+            self._build_validators()
+        for error in self.base.iter_errors(data):
+            yield list(error.absolute_path), error.message
+        yield from self._tag_errors(data)
+        for condition, if_validator, then, whole in self.branches:
+            if whole is not None:
+                errors = whole.iter_errors(data)
+            elif then is None:
+                continue
+            elif (self._matches(condition, data) if condition is not None
+                  else if_validator.is_valid(data)):
+                errors = then.iter_errors(data)
+            else:
+                continue
+            for error in errors:
+                yield list(error.absolute_path), error.message
+        if self.tail is not None:
+            for error in self.tail.iter_errors(data):
+                yield list(error.absolute_path), error.message
+
+
+def _file_digest(*paths):
+    h = hashlib.sha256(str(COMPILED_SCHEMA_VERSION).encode())
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def load_compiled_schema(schema_path, tags_path, cache_dir=None):
+    """Load, merge and compile the schema.
+
+    With cache_dir, the merged schema is stored as JSON under a name keyed by
+    the hash of both YAML files, so unchanged runs skip YAML parsing entirely.
+    """
+    cached = None
+    if cache_dir is not None:
+        cached = Path(cache_dir) / f"schema-{_file_digest(schema_path, tags_path)[:16]}.json"
+        try:
+            return CompiledSchema(json.loads(cached.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            pass
+    schema = load_schema(schema_path, load_tags(tags_path))
+    if cached is not None:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        for stale in cached.parent.glob("schema-*.json"):
+            stale.unlink(missing_ok=True)
+        tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(schema), encoding="utf-8")
+        os.replace(tmp, cached)
+    return CompiledSchema(schema)
+
+
+def _link_metadata(metadata):
+    """The part of a note's metadata the cross-file checks read: type and WIKI_LINK_FIELDS."""
+    if metadata is None:
+        return None
+    return {f: metadata[f] for f in ("type", *WIKI_LINK_FIELDS) if f in metadata}
+
+
+class ResultCache:
+    """Portable JSON map of a note's frontmatter hash -> its validation result.
+
+    Entries are valid for one validator version, meta_schema.yml and
+    meta_tags.yml (together the cache key); a different key discards them all.
+    Holding no paths or mtimes, the file can be restored in CI on a fresh
+    checkout. Each entry keeps the note's errors and warnings plus its type and
+    WIKI_LINK_FIELDS values, which is all the cross-file checks need.
+    """
+
+    def __init__(self, path, schema_path, tags_path):
+        self.path = Path(path)
+        self.key = f"{VALIDATOR_VERSION}-{_file_digest(schema_path, tags_path)}"
+        self._entries = {}
+        self._used = set()
+        self._dirty = False
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("key") == self.key:
+            self._entries = payload.get("results", {})
+
+    @staticmethod
+    def digest(filepath):
+        """Hash of the frontmatter text validation depends on."""
+        return hashlib.sha256(read_frontmatter_text(filepath).encode("utf-8")).hexdigest()
+
+    def get(self, digest):
+        """(errors, warnings, link metadata or None) for digest, or None on a miss."""
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        self._used.add(digest)
+        return entry["errors"], entry["warnings"], entry["links"]
+
+    def put(self, digest, errors, warnings, metadata):
+        entry = {"errors": errors, "warnings": warnings, "links": _link_metadata(metadata)}
+        try:
+            json.dumps(entry)
+        except (TypeError, ValueError):
+            return  # e.g. a date in a link field; validate this note every time
+        self._entries[digest] = entry
+        self._used.add(digest)
+        self._dirty = True
+
+    def save(self, prune=False):
+        """Write the cache atomically; prune drops entries this run did not use."""
+        if prune and self._used != self._entries.keys():
+            self._entries = {d: e for d, e in self._entries.items() if d in self._used}
+            self._dirty = True
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"key": self.key, "results": self._entries}, sort_keys=True),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
 def validate_schema(data, schema):
-    """Validate frontmatter dict against JSON Schema. Returns list of error strings."""
+    """Validate frontmatter dict against JSON Schema. Returns list of error strings.
+
+    schema: a CompiledSchema, or a raw schema dict (compiled on each call).
+    """
+    if not isinstance(schema, CompiledSchema):
+        schema = CompiledSchema(schema)
     errors = []
-    validator = jsonschema.Draft7Validator(schema)
-    for error in sorted(validator.iter_errors(data), key=lambda e: list(e.path)):
-        path = ".".join(str(p) for p in error.absolute_path) or "(root)"
-        errors.append(f"{path}: {error.message}")
+    for path, message in sorted(schema.iter_errors(data), key=lambda e: e[0]):
+        errors.append(f"{'.'.join(str(p) for p in path) or '(root)'}: {message}")
     return errors
 
 
@@ -105,9 +482,6 @@ def validate_dates(data):
     return errors
 
 
-_WIKI_LINK_RE = re.compile(r"^\[\[(.+)\]\]$")
-
-
 def validate_wiki_links(data):
     """Validate wiki link fields beyond what JSON Schema pattern catches.
 
@@ -139,11 +513,6 @@ def validate_wiki_links(data):
     return errors, warnings
 
 
-def _tag_matches(actual_tag, expected_tag):
-    """Hierarchy-aware tag match: 'plan/followup' satisfies expected 'plan'."""
-    return actual_tag == expected_tag or actual_tag.startswith(expected_tag + "/")
-
-
 def validate_tag_coherence(data):
     """Warn if tags don't include the expected type tag. Returns list of warnings."""
     warnings = []
@@ -155,7 +524,8 @@ def validate_tag_coherence(data):
         return warnings
 
     expected = TYPE_TAG_MAP.get((note_type, subtype)) or TYPE_TAG_MAP.get((note_type, None))
-    if expected and not any(_tag_matches(t, expected) for t in tags):
+    # Hierarchy-aware: 'plan/followup' satisfies expected 'plan'.
+    if expected and not any(isinstance(t, str) and expected in tag_lineage(t) for t in tags):
         msg = f"tags: expected '{expected}' tag for type={note_type}"
         if subtype:
             msg += f", subtype={subtype}"
@@ -175,7 +545,8 @@ def validate_data(data, schema):
     errors = []
     warnings = []
 
-    errors.extend(validate_schema(processed, schema))
+    with span("schema"):
+        errors.extend(validate_schema(processed, schema))
     errors.extend(validate_dates(processed))
 
     wiki_errors, wiki_warnings = validate_wiki_links(processed)
@@ -187,57 +558,187 @@ def validate_data(data, schema):
     return errors, warnings
 
 
-def validate_file(filepath, schema):
-    """Validate a single markdown file. Returns (errors, warnings)."""
+def validate_file(filepath, schema, cache=None):
+    """Validate a single markdown file. Returns (errors, warnings, metadata).
+
+    metadata is the parsed frontmatter dict, or None if the file could not be
+    read or parsed, so callers never need to parse the note a second time.
+    cache: optional vault_notes.NoteCache to reuse parsed frontmatter.
+    """
     try:
-        text = Path(filepath).read_text(encoding="utf-8")
+        note = load_note(filepath, cache)
     except Exception as e:
-        return ([f"failed to read: {e}"], [])
+        return ([f"failed to read: {e}"], [], None)
+    return validate_note(note, schema)
 
-    if not frontmatter.checks(text):
-        return (["no frontmatter found"], [])
 
-    try:
-        post = frontmatter.loads(text)
-    except Exception as e:
-        return ([f"failed to parse frontmatter: {e}"], [])
+def validate_note(note, schema):
+    """Validate a parsed note entry (see vault_notes.parse_note). Returns (errors, warnings, metadata)."""
+    if not note["frontmatter"]:
+        return (["no frontmatter found"], [], None)
 
-    return validate_data(post.metadata, schema)
+    if note["error"] is not None:
+        return ([f"failed to parse frontmatter: {note['error']}"], [], None)
 
+    errors, warnings = validate_data(note["metadata"], schema)
+    return errors, warnings, note["metadata"]
 
-def find_md_files(directory):
-    """Yield .md files, skipping hidden dirs, templates/, and SKIP_FILES."""
-    directory = Path(directory)
-    for path in sorted(directory.rglob("*.md")):
-        parts = path.relative_to(directory).parts
-        if any(p.startswith(".") or p in SKIP_DIRS for p in parts):
-            continue
-        if path.name in SKIP_FILES:
-            continue
-        if ("projects" in parts or "papers" in parts) and path.name != "index.md":
+
+_WORKER_SCHEMA = None
+
+
+def _init_worker(schema):
+    global _WORKER_SCHEMA
+    _WORKER_SCHEMA = schema
+
+
+def _validate_job(job):
+    """Process-pool task: (filepath, cached note or None, stale cache entry or None) -> result tuple plus fresh cache entry.
+
+    The stale entry's parse is reused when the content hash still matches, as NoteCache.get() does.
+    """
+    filepath, note, previous = job
+    entry = None
+    if note is None:
+        try:
+            entry = read_note_entry(filepath, previous)
+        except Exception as e:
+            return [f"failed to read: {e}"], [], None, None
+        note = entry["data"]
+    errors, warnings, metadata = validate_note(note, _WORKER_SCHEMA)
+    return errors, warnings, metadata, entry
+
+
+def iter_file_results(paths, schema, cache=None, jobs=1, results=None):
+    """Yield (filepath, errors, warnings, metadata) for each path, in input order.
+
+    With jobs > 1, reading, parsing and validation fan out over a process pool;
+    results still stream back in input order as they complete. Cache lookups
+    and updates stay in this process.
+
+    results: optional ResultCache. Notes whose frontmatter it has seen are not
+    parsed or validated again; their metadata holds only type and WIKI_LINK_FIELDS.
+    """
+    if results is not None:
+        yield from _iter_cached_results(paths, schema, cache, jobs, results)
+        return
+    if jobs <= 1:
+        for filepath in paths:
+            yield (filepath, *validate_file(filepath, schema, cache))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    work = []
+    for filepath in paths:
+        note = previous = None
+        if cache is not None:
+            try:
+                note = cache.fresh(filepath, "note")
+            except OSError:
+                pass
+            if note is None:
+                previous = cache.previous(filepath, "note")
+        work.append((filepath, note, previous))
+
+    chunksize = max(1, len(work) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(schema,)) as pool:
+        for (filepath, _, _), (errors, warnings, metadata, entry) in zip(
+            work, pool.map(_validate_job, work, chunksize=chunksize)
+        ):
+            if cache is not None and entry is not None:
+                cache.put(filepath, "note", entry)
+            yield filepath, errors, warnings, metadata
+
+
+def _iter_cached_results(paths, schema, cache, jobs, results):
+    digests = {}
+    hits = {}
+    for filepath in paths:
+        try:
+            # A note whose parse-cache entry still matches on stat reuses that
+            # entry's hash: it is taken over the same read_frontmatter_text().
+            digest = cache.fresh_digest(filepath, "note") if cache is not None else None
+            if digest is None:
+                digest = ResultCache.digest(filepath)
+        except (OSError, UnicodeDecodeError):
+            continue  # validate_file reports it
+        digests[filepath] = digest
+        hit = results.get(digest)
+        if hit is not None:
+            hits[filepath] = hit
+    fresh = iter_file_results([p for p in paths if p not in hits], schema, cache, jobs)
+    for filepath in paths:
+        if filepath in hits:
+            yield (filepath, *hits[filepath])
             continue
-        yield path
+        _, errors, warnings, metadata = next(fresh)
+        if filepath in digests:
+            results.put(digests[filepath], errors, warnings, metadata)
+        yield filepath, errors, warnings, metadata
 
 
-def _slugify(name):
-    """Mirror the site's wiki-link slug: lowercase, collapse dashes/spaces, strip non-alnum."""
-    s = name.lower()
-    s = re.sub(r"\s+-\s+", "-", s)
-    s = re.sub(r"\s+", "-", s)
-    s = re.sub(r"[^a-z0-9\-]", "", s)
-    s = re.sub(r"-+", "-", s)
-    return s
+def _is_skipped_dir(name):
+    return name.startswith(".") or name in SKIP_DIRS
 
 
-def _strip_brackets(wiki_link):
-    if not isinstance(wiki_link, str):
-        return None
-    m = _WIKI_LINK_RE.match(wiki_link)
-    return m.group(1).strip() if m else None
+def _is_note_path(parts):
+    """True if a vault-relative path (as parts) is a note find_md_files would yield."""
+    if any(_is_skipped_dir(p) for p in parts):
+        return False
+    if len(parts) > 1 and parts[0] == INDEX_SHARD_DIR:
+        return False
+    if parts[-1] in SKIP_FILES:
+        return False
+    return parts[-1] == "index.md" or ("projects" not in parts and "papers" not in parts)
+
+
+def find_md_files(directory, mode=None):
+    """Yield .md files in sorted path order, skipping hidden dirs, SKIP_DIRS, INDEX_SHARD_DIR and SKIP_FILES.
+
+    Skipped directories are pruned from the walk, never listed. mode: see
+    vault_notes.list_md_files ("git" reads the git index instead of walking).
+    """
+    directory = Path(directory)
+    for path in list_md_files(directory, _is_skipped_dir, mode):
+        if _is_note_path(path.relative_to(directory).parts):
+            yield path
+
+
+def git_changed_paths(directory, rev):
+    """Note paths under directory changed since rev, spelled like find_md_files output.
+
+    Covers committed, staged, unstaged and untracked changes. Deleted notes are
+    included (they no longer exist on disk) so their former neighbours are rechecked.
+    """
+    directory = Path(directory)
+    abs_dir = directory.resolve()
+    root = Path(subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"],
+        cwd=abs_dir, check=True, capture_output=True, text=True,
+    ).stdout.strip())
+    listings = [
+        ["git", "diff", "--name-only", "--no-renames", "-z", rev, "--", str(abs_dir)],
+        ["git", "ls-files", "--others", "--exclude-standard", "-z", "--", str(abs_dir)],
+    ]
+    changed = set()
+    for cmd in listings:
+        out = subprocess.run(cmd, cwd=root, check=True, capture_output=True, text=True).stdout
+        for name in filter(None, out.split("\0")):
+            rel = (root / name).relative_to(abs_dir)
+            if rel.suffix == ".md" and _is_note_path(rel.parts):
+                changed.add(str(directory / rel))
+    return changed
 
 
 def _resolve_wiki_link(wiki_link, slug_to_file):
-    """Resolve a wiki link to a file path using exact-then-prefix slug match on basenames."""
+    """Resolve a wiki link to a file path using exact-then-prefix slug match on basenames.
+
+    slug_to_file: a wiki_links.SlugIndex (logarithmic lookup), or a plain
+    slug -> path dict, which is scanned linearly on a prefix miss.
+    """
+    if isinstance(slug_to_file, SlugIndex):
+        return slug_to_file.resolve(wiki_link)
     label = _strip_brackets(wiki_link)
     if not label:
         return None
@@ -252,92 +753,552 @@ def _resolve_wiki_link(wiki_link, slug_to_file):
     return None
 
 
-def validate_bidirectional_related_notes(files_meta):
-    """Cross-file check: warn when A.related_notes lists B but B.related_notes lacks A.
+def _build_slug_map(paths):
+    return SlugIndex((_slugify(_note_stem(path)), path) for path in paths)
 
-    files_meta: list of (filepath, metadata) tuples for notes that parsed successfully.
-    Returns list of (filepath, warning) tuples.
-    """
-    slug_to_file = {}
-    for path, _ in files_meta:
-        stem = Path(path).stem
-        if stem == "index":
-            # workspace dirs: use parent dir name (matches how notes reference projects/papers)
-            stem = Path(path).parent.name
-        slug_to_file[_slugify(stem)] = path
 
-    meta_by_path = {p: m for p, m in files_meta}
+def _link_values(meta, fields):
+    """Yield the raw wiki-link strings of meta for the given WIKI_LINK_FIELDS."""
+    for field in fields:
+        value = meta.get(field)
+        if value is None:
+            continue
+        if WIKI_LINK_FIELDS[field] == "single":
+            yield value
+        elif isinstance(value, list):
+            yield from value
+
 
-    forward = {}  # path -> set of resolved target paths
+def resolve_edges(files_meta, slug_to_file, only=None):
+    """The resolved link graph: {path: {field: target paths}} over WIKI_LINK_FIELDS.
+
+    Each distinct link string is resolved once, however many notes and fields
+    use it. Links to the note itself, dangling and non-string links are dropped,
+    as are fields left without targets. only: optional set of paths to include.
+    """
+    resolved = {}
+    edges = {}
     for path, meta in files_meta:
-        targets = set()
-        rns = meta.get("related_notes") or []
-        if isinstance(rns, list):
-            for wl in rns:
-                tp = _resolve_wiki_link(wl, slug_to_file)
+        if only is not None and path not in only:
+            continue
+        by_field = {}
+        for field in WIKI_LINK_FIELDS:
+            targets = set()
+            for wl in _link_values(meta, (field,)):
+                if not isinstance(wl, str):
+                    continue
+                if wl not in resolved:
+                    resolved[wl] = _resolve_wiki_link(wl, slug_to_file)
+                tp = resolved[wl]
                 if tp and tp != path:
                     targets.add(tp)
-        forward[path] = targets
+            if targets:
+                by_field[field] = targets
+        edges[path] = by_field
+    return edges
+
+
+def _edge_targets(by_field, fields):
+    """Union of the targets of by_field (a resolve_edges() value) over fields."""
+    targets = set()
+    for field in fields:
+        targets |= by_field.get(field, set())
+    return targets
+
+
+_RELATION_FIELDS = tuple(dict.fromkeys(field for field, _, _, _ in INVERSE_RELATIONS))
+
+
+def _missing_backlink(a_path, b_path, field="related_notes", inverse="related_notes"):
+    declared = a_path if field == inverse else f"{a_path} {field}"
+    return (b_path, f"{inverse}: missing backlink to [[{_note_stem(a_path)}]] (declared in {declared})")
+
 
+def _relation_warnings(a_path, b_path, edges, types, relations=INVERSE_RELATIONS):
+    """(b_path, warning) for each back-reference from b_path that a_path's links imply but b_path lacks.
+
+    b_path must be in edges. At most one warning per inverse field named.
+    """
     warnings = []
-    for a_path, targets in forward.items():
-        for b_path in targets:
-            if b_path not in meta_by_path:
-                continue
-            if a_path not in forward.get(b_path, set()):
-                a_stem = Path(a_path).stem if Path(a_path).stem != "index" else Path(a_path).parent.name
-                warnings.append(
-                    (b_path, f"related_notes: missing backlink to [[{a_stem}]] (declared in {a_path})")
-                )
+    missing = set()
+    for field, source_type, target_type, inverse in relations:
+        if b_path not in edges[a_path].get(field, ()) or inverse[0] in missing:
+            continue
+        if source_type is not None and types.get(a_path) != source_type:
+            continue
+        if target_type is not None and types.get(b_path) != target_type:
+            continue
+        if a_path not in _edge_targets(edges[b_path], inverse):
+            missing.add(inverse[0])
+            warnings.append(_missing_backlink(a_path, b_path, field, inverse[0]))
     return warnings
 
 
-def validate_directory(directory, schema_path, tags_path):
-    """Validate all .md files in directory. Returns (total_errors, total_warnings)."""
-    tags = load_tags(tags_path)
-    schema = load_schema(schema_path, tags)
+def linked_neighbourhood(files_meta, changed, fields=NEIGHBOUR_LINK_FIELDS):
+    """Return changed plus every note linking to or from a changed note via fields.
 
-    total_errors = 0
-    total_warnings = 0
-    files_checked = 0
+    files_meta: (filepath, metadata) for every note in the vault.
+    changed: set of filepaths; may name deleted notes, whose former linkers are included.
+    Only links whose slug is a prefix of a changed note's slug are resolved for
+    unchanged notes, so the work tracks the size of the change set.
+    """
+    slugs = {_slugify(_note_stem(p)): p for p, _ in files_meta}
+    for path in sorted(changed):
+        slugs.setdefault(_slugify(_note_stem(path)), path)
+    changed_slugs = [slug for slug, path in slugs.items() if path in changed]
+    slug_to_file = SlugIndex(slugs)
 
-    per_file_warnings = {}  # path -> list of warning strings
-    files_meta = []  # (path, metadata) for cross-file checks
+    selected = set(changed)
+    for path, meta in files_meta:
+        is_changed = path in changed
+        for wl in _link_values(meta, fields):
+            label = _strip_brackets(wl)
+            slug = _slugify(label) if label else ""
+            if not slug:
+                continue
+            if not is_changed and not any(cs.startswith(slug) for cs in changed_slugs):
+                continue
+            target = slug_to_file.resolve_slug(slug)
+            if target is None or target == path:
+                continue
+            if is_changed:
+                selected.add(target)
+            elif target in changed:
+                selected.add(path)
+    existing = {p for p, _ in files_meta}
+    return {p for p in selected if p in existing or Path(p).exists()}
+
+
+class RelationIndex:
+    """Compact, streamed input to the INVERSE_RELATIONS check.
+
+    add() keeps, per note, only its path, its type and the links in the
+    relation fields, each link as an index into one table of distinct link
+    strings. Memory grows with the number of links rather than with the size
+    of the frontmatter, so the per-file pass need not hold every note's
+    metadata. warnings() resolves each distinct link once, when every note's
+    path (hence slug) is known.
+    """
 
-    for filepath in find_md_files(directory):
-        files_checked += 1
-        errors, warnings = validate_file(filepath, schema)
+    def __init__(self, relations=INVERSE_RELATIONS):
+        self.relations = relations
+        self.fields = tuple(dict.fromkeys(
+            f for field, _, _, inverse in relations for f in (field, *inverse)
+        ))
+        self.paths = []
+        self.types = []
+        self.links = []  # per note: () or one array of label ids (or None) per field
+        self._labels = {}  # link string -> label id
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, path, metadata):
+        """Record the note at path; metadata may hold just type and the link fields."""
+        labels = self._labels
+        per_field = []
+        for field in self.fields:
+            ids = array("I", (
+                labels.setdefault(wl, len(labels))
+                for wl in _link_values(metadata, (field,)) if isinstance(wl, str)
+            ))
+            per_field.append(ids or None)
+        note_type = metadata.get("type")
+        self.paths.append(str(path))
+        self.types.append(sys.intern(note_type) if isinstance(note_type, str) else note_type)
+        self.links.append(tuple(per_field) if any(per_field) else ())
+
+    def edges(self, only=None):
+        """{path: {field: target paths}}, as resolve_edges() would give over the relation fields."""
+        slug_to_file = _build_slug_map(self.paths)
+        targets = [_resolve_wiki_link(label, slug_to_file) for label in self._labels]
+        edges = {}
+        for path, per_field in zip(self.paths, self.links):
+            if only is not None and path not in only:
+                continue
+            by_field = {}
+            for field, ids in zip(self.fields, per_field):
+                if ids:
+                    resolved = {targets[i] for i in ids} - {None, path}
+                    if resolved:
+                        by_field[field] = resolved
+            edges[path] = by_field
+        return edges
+
+    def warnings(self, only=None):
+        """(filepath, warning) for every missing back-reference; only: as in validate_inverse_relations()."""
+        edges = self.edges(only)
+        types = {path: t for path, t in zip(self.paths, self.types) if path in edges}
+        relation_fields = tuple(dict.fromkeys(field for field, _, _, _ in self.relations))
+        warnings = []
+        for a_path, by_field in edges.items():
+            for b_path in sorted(_edge_targets(by_field, relation_fields)):
+                if b_path in edges:
+                    warnings.extend(_relation_warnings(a_path, b_path, edges, types, self.relations))
+        return warnings
 
-        if errors or warnings:
-            print(f"\n{filepath}:")
 
-        for e in errors:
-            print(f"  ERROR  {e}")
-            total_errors += 1
+def validate_inverse_relations(files_meta, only=None, relations=INVERSE_RELATIONS):
+    """Cross-file check: warn when a link implies a back-reference (see INVERSE_RELATIONS) that is missing.
 
-        for w in warnings:
-            print(f"  WARN   {w}")
-            total_warnings += 1
-            per_file_warnings.setdefault(str(filepath), []).append(w)
+    files_meta: list of (filepath, metadata) tuples for notes that parsed successfully.
+    only: optional set of filepaths; links are then followed, and warnings
+    reported, only between these notes (slugs still resolve against all of files_meta).
+    Links are resolved once into one edge index (see RelationIndex); each
+    relation is then a set lookup per edge. Returns list of (filepath, warning) tuples.
+    """
+    index = RelationIndex(relations)
+    for path, meta in files_meta:
+        index.add(path, meta)
+    return index.warnings(only)
 
-        if not errors:
+
+def validate_bidirectional_related_notes(files_meta, only=None):
+    """Cross-file check: warn when A.related_notes lists B but B.related_notes lacks A.
+
+    validate_inverse_relations() with only related_notes counted either way.
+    """
+    relations = (("related_notes", None, None, ("related_notes",)),)
+    return validate_inverse_relations(files_meta, only, relations=relations)
+
+
+class VaultWatcher:
+    """Keep a vault validated in memory and recheck only what a change can affect.
+
+    Holds the compiled schema, each note's stat signature, parsed metadata and
+    per-file results, the slug map of notes without errors (slug_to_file) and
+    the resolved link graph (resolve_edges). update() revalidates changed
+    notes and the notes linked to or from them over NEIGHBOUR_LINK_FIELDS, and
+    recomputes their INVERSE_RELATIONS warnings.
+    """
+
+    def __init__(self, directory, schema):
+        self.directory = Path(directory)
+        self.schema = schema
+        self.stats = {}  # path -> (mtime_ns, size)
+        self.results = {}  # path -> (errors, warnings)
+        self.meta = {}  # path -> metadata, for notes without errors
+        self.slug_to_file = {}
+        self.edges = {}  # path -> {field: targets}, for notes without errors
+        self.forward = {}  # path -> targets over NEIGHBOUR_LINK_FIELDS
+        self.cross = {}  # path -> backlink warnings
+
+    def scan(self):
+        """Stat every note; return paths added, modified or removed since the last scan."""
+        current = {}
+        for path in find_md_files(self.directory):
             try:
-                post = frontmatter.loads(Path(filepath).read_text(encoding="utf-8"))
-                files_meta.append((str(filepath), post.metadata))
-            except Exception:
-                pass
+                st = os.stat(path)
+            except OSError:
+                continue
+            current[str(path)] = (st.st_mtime_ns, st.st_size)
+        changed = {p for p, sig in current.items() if self.stats.get(p) != sig}
+        changed |= self.stats.keys() - current.keys()
+        self.stats = current
+        return changed
+
+    def update(self, changed):
+        """Revalidate changed notes and their link neighbours. Returns the rechecked paths."""
+        removed = {p for p in changed if p not in self.stats}
+        old_targets = set()
+        for p in changed:
+            old_targets |= self.forward.get(p, set())
+
+        resolvable = False  # whether the error-free notes links resolve against changed
+        for p in removed:
+            resolvable |= p in self.meta
+            self.results.pop(p, None)
+            self.meta.pop(p, None)
+            self.edges.pop(p, None)
+            self.forward.pop(p, None)
+            self.cross.pop(p, None)
+        for p in changed - removed:
+            errors, warnings, metadata = validate_file(p, self.schema)
+            self.results[p] = (errors, warnings)
+            resolvable |= (p in self.meta) == bool(errors)
+            if errors:
+                self.meta.pop(p, None)
+            else:
+                self.meta[p] = metadata
+
+        if resolvable:
+            # Links resolve only against error-free notes, as in a full run; a note
+            # gaining, losing or fixing its errors can change how any prefix link resolves.
+            self.slug_to_file = _build_slug_map(sorted(self.meta))
+            relink = set(self.stats)
+        else:
+            relink = changed - removed
+        old_edges = {p: self.edges.get(p, {}) for p in relink}
+        for p in relink:
+            if p not in self.meta:
+                self.edges.pop(p, None)
+                self.forward.pop(p, None)
+        self.edges.update(resolve_edges(
+            [(p, self.meta[p]) for p in relink if p in self.meta], self.slug_to_file
+        ))
+        for p in relink:
+            if p in self.edges:
+                self.forward[p] = _edge_targets(self.edges[p], NEIGHBOUR_LINK_FIELDS)
+
+        affected = (changed - removed) | old_targets
+        for p in changed - removed:
+            affected |= self.forward.get(p, set())
+        affected |= {a for a, targets in self.forward.items() if targets & changed}
+        # A relinked note whose links now resolve elsewhere (e.g. a new note took
+        # over a prefix match) changes the backlinks of its old and new targets.
+        for p, old in old_edges.items():
+            before = _edge_targets(old, WIKI_LINK_FIELDS)
+            after = _edge_targets(self.edges.get(p, {}), WIKI_LINK_FIELDS)
+            if before != after:
+                affected |= (before ^ after) | {p}
+        affected &= self.stats.keys()
+
+        incoming = {}
+        for a, by_field in self.edges.items():
+            for b in _edge_targets(by_field, _RELATION_FIELDS):
+                incoming.setdefault(b, []).append(a)
+        types = {p: meta.get("type") for p, meta in self.meta.items()}
+        for b in affected:
+            if b not in self.edges:
+                self.cross[b] = []
+                continue
+            self.cross[b] = [
+                warning
+                for a in sorted(incoming.get(b, ()))
+                for _, warning in _relation_warnings(a, b, self.edges, types)
+            ]
+        return affected
+
+    def report(self, paths):
+        """Print errors and warnings for paths. Returns (errors, warnings) counts."""
+        total_errors = 0
+        total_warnings = 0
+        for path in sorted(paths):
+            errors, warnings = self.results.get(path, ([], []))
+            warnings = warnings + self.cross.get(path, [])
+            if errors or warnings:
+                print(f"\n{path}:")
+            for e in errors:
+                print(f"  ERROR  {e}")
+            for w in warnings:
+                print(f"  WARN   {w}")
+            total_errors += len(errors)
+            total_warnings += len(warnings)
+        return total_errors, total_warnings
+
+
+def watch(directory, schema_path, tags_path, interval=0.5):
+    """Load the vault once, then poll for changes and revalidate until interrupted."""
+    watcher = VaultWatcher(directory, load_compiled_schema(schema_path, tags_path))
+    errors, warnings = watcher.report(watcher.update(watcher.scan()))
+    print(f"\nWatching {len(watcher.stats)} notes in {directory} "
+          f"(Errors: {errors}  Warnings: {warnings}). Ctrl-C to stop.")
+    try:
+        while True:
+            time.sleep(interval)
+            changed = watcher.scan()
+            if not changed:
+                continue
+            start = time.perf_counter()
+            affected = watcher.update(changed)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            errors, warnings = watcher.report(affected)
+            print(f"[{time.strftime('%H:%M:%S')}] rechecked {len(affected)} notes in "
+                  f"{elapsed_ms:.1f} ms  Errors: {errors}  Warnings: {warnings}")
+    except KeyboardInterrupt:
+        pass
+
+
+def parse_shard(value):
+    """argparse type for --shard: "I/N" -> (I, N), 1 <= I <= N."""
+    try:
+        index, count = (int(n) for n in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, e.g. 1/4, not {value!r}")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {value} out of range: need 1 <= I <= N")
+    return index, count
+
+
+def in_shard(relpath, shard):
+    """True if the note at vault-relative relpath belongs to shard (I, N).
+
+    Notes are spread by CRC-32 of their posix relative path, so every machine
+    partitions the vault the same way and a note keeps its shard as others
+    are added or removed.
+    """
+    index, count = shard
+    return zlib.crc32(Path(relpath).as_posix().encode("utf-8")) % count == index - 1
+
 
-    # Cross-file: bidirectional related_notes
-    for path, warning in validate_bidirectional_related_notes(files_meta):
-        if path not in per_file_warnings:
-            print(f"\n{path}:")
-        print(f"  WARN   {warning}")
+def write_shard_summary(path, shard, files):
+    """Write one shard's results for --merge.
+
+    files: {vault-relative posix path: {"errors", "warnings", "links"}}, where
+    links is _link_metadata() of a note without errors (else None); together
+    the notes' paths (their slugs) and links are all validate_inverse_relations
+    needs.
+    """
+    payload = {"version": SHARD_SUMMARY_VERSION, "shard": list(shard), "files": files}
+    Path(path).write_text(json.dumps(payload, sort_keys=True, default=str), encoding="utf-8")
+
+
+def _check_shard_summary(path, payload):
+    """Raise ValueError naming the first key of a shard summary that is missing or malformed."""
+    shard = payload.get("shard")
+    if not (isinstance(shard, list) and len(shard) == 2 and all(isinstance(n, int) for n in shard)):
+        raise ValueError(f"{path}: shard summary has no valid 'shard'")
+    if not isinstance(payload.get("files"), dict):
+        raise ValueError(f"{path}: shard summary has no valid 'files'")
+    for relpath, result in payload["files"].items():
+        if not isinstance(result, dict):
+            raise ValueError(f"{path}: shard summary entry for {relpath} is not a mapping")
+        for key in ("errors", "warnings", "links"):
+            if key not in result:
+                raise ValueError(f"{path}: shard summary entry for {relpath} has no '{key}'")
+
+
+def load_shard_summaries(paths):
+    """Combined {relpath: result} of shard summary files covering shards 1..N exactly once.
+
+    Raises ValueError if a file has another format version or missing keys, or
+    shards are missing or repeated.
+    """
+    files = {}
+    seen = []
+    counts = set()
+    for path in paths:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(payload, dict) or payload.get("version") != SHARD_SUMMARY_VERSION:
+            raise ValueError(f"{path}: not a version {SHARD_SUMMARY_VERSION} shard summary")
+        _check_shard_summary(path, payload)
+        index, count = payload["shard"]
+        seen.append(index)
+        counts.add(count)
+        files.update(payload["files"])
+    if len(counts) != 1 or sorted(seen) != list(range(1, counts.pop() + 1)):
+        raise ValueError(f"shard summaries do not cover each shard once: got {sorted(seen)}")
+    return files
+
+
+def merge_shard_summaries(directory, summary_paths, reporter=None):
+    """Report the shards' per-file results and run the cross-file checks over all of them.
+
+    Output matches an unsharded validate_directory() run over the same vault.
+    Returns (total_errors, total_warnings).
+    """
+    if reporter is None:
+        reporter = TextReporter()
+    files = load_shard_summaries(summary_paths)
+    reporter.start()
+    total_errors = 0
+    total_warnings = 0
+    relations = RelationIndex()
+    directory = Path(directory)
+    # find_md_files order: by path parts.
+    for relpath in sorted(files, key=lambda rel: rel.split("/")):
+        result = files[relpath]
+        filepath = directory / relpath
+        reporter.file(filepath, result["errors"], result["warnings"])
+        total_errors += len(result["errors"])
+        total_warnings += len(result["warnings"])
+        if not result["errors"]:
+            relations.add(filepath, result["links"] or {})
+    with span("cross-file"):
+        cross_file = relations.warnings()
+    for path, warning in cross_file:
+        reporter.cross_file(path, warning)
         total_warnings += 1
-        per_file_warnings.setdefault(path, []).append(warning)
+    reporter.finish(len(files), total_errors, total_warnings)
+    return total_errors, total_warnings
+
+
+def validate_directory(directory, schema_path, tags_path, cache=None, jobs=1, since=None,
+                       reporter=None, paths=None, results=None, shard=None, summary=None):
+    """Validate all .md files in directory. Returns (total_errors, total_warnings).
+
+    cache: optional vault_notes.NoteCache shared with the other vault tools.
+    jobs: number of worker processes for per-file validation (1 = in-process).
+    since: optional git revision; only notes changed since it, plus their
+    NEIGHBOUR_LINK_FIELDS neighbours, are validated and cross-checked.
+    reporter: a vault_report reporter receiving diagnostics as they are found
+    (default: TextReporter on stdout).
+    paths: find_md_files(directory) output when the caller has already walked the vault.
+    results: optional ResultCache; notes it has already validated are skipped.
+    shard: optional (I, N); validate only the notes in_shard() assigns to shard I
+    of N. The cross-file checks need every note, so they are left to
+    merge_shard_summaries(); summary: path to write this shard's results to.
+    """
+    if reporter is None:
+        reporter = TextReporter()
+    reporter.start()
+    with span("schema-load"):
+        schema = load_compiled_schema(
+            schema_path, tags_path, cache.path.parent if cache is not None and cache.path else None
+        )
 
-    print(f"\n{'=' * 50}")
-    print(f"Files: {files_checked}  Errors: {total_errors}  Warnings: {total_warnings}")
+    total_errors = 0
+    total_warnings = 0
+    files_checked = 0
 
+    relations = RelationIndex()  # notes without errors, for cross-file checks
+
+    if paths is None:
+        with span("discovery"):
+            paths = list(find_md_files(directory))
+    vault_meta = None  # error-free notes' metadata, for slug resolution in --since mode
+    checked = None  # every note's result in --since mode, reported below for the selected ones
+    if since is not None:
+        # Resolve against the same notes a full run would: those without errors.
+        # Result and parse cache hits make this a stat per unchanged note.
+        vault_meta = []
+        checked = {}
+        for filepath, errors, warnings, metadata in iter_file_results(paths, schema, cache, jobs, results):
+            checked[filepath] = (errors, warnings, metadata)
+            if not errors:
+                vault_meta.append((str(filepath), _link_metadata(metadata)))
+        with span("git-diff"):
+            changed = git_changed_paths(directory, since)
+        selected = linked_neighbourhood(vault_meta, changed)
+        paths = [p for p in paths if str(p) in selected]
+    if shard is not None:
+        paths = [p for p in paths if in_shard(Path(p).relative_to(directory), shard)]
+
+    shard_files = {}
+    if checked is None:
+        file_results = iter_file_results(paths, schema, cache, jobs, results)
+    else:
+        file_results = ((p, *checked[p]) for p in paths)
+    for filepath, errors, warnings, metadata in file_results:
+        files_checked += 1
+        reporter.file(filepath, errors, warnings)
+        total_errors += len(errors)
+        total_warnings += len(warnings)
+        if not errors:
+            relations.add(filepath, metadata)
+        if shard is not None:
+            shard_files[Path(filepath).relative_to(directory).as_posix()] = {
+                "errors": errors, "warnings": warnings,
+                "links": None if errors else _link_metadata(metadata),
+            }
+
+    if shard is not None:
+        if summary is not None:
+            write_shard_summary(summary, shard, shard_files)
+        reporter.finish(files_checked, total_errors, total_warnings)
+        return total_errors, total_warnings
+
+    # Cross-file: INVERSE_RELATIONS backlinks
+    with span("cross-file"):
+        if vault_meta is None:
+            cross_file = relations.warnings()
+        else:
+            cross_file = validate_inverse_relations(vault_meta, only=set(relations.paths))
+    for path, warning in cross_file:
+        reporter.cross_file(path, warning)
+        total_warnings += 1
+
+    reporter.finish(files_checked, total_errors, total_warnings)
     return total_errors, total_warnings
 
 
@@ -359,9 +1320,111 @@ def main():
         default="meta_tags.yml",
         help="Path to tags file (default: meta_tags.yml)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every note from scratch instead of using .cache/notes.pickle",
+    )
+    parser.add_argument(
+        "--results-cache",
+        default=str(DEFAULT_RESULTS_CACHE),
+        metavar="FILE",
+        help=f"Portable per-note validation result cache, e.g. restored in CI (default: {DEFAULT_RESULTS_CACHE})",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Validate notes in N worker processes; 0 means one per CPU (default: 1)",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="REV",
+        help="Only validate notes changed since git revision REV, plus their linked neighbours",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and revalidate notes (and their link neighbours) as they change",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Polling interval in seconds for --watch (default: 0.5)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(REPORTERS),
+        default="text",
+        help="Output format: human text, NDJSON records or a SARIF log (default: text)",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="Write per-phase span timings to FILE as Chrome trace event JSON",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="I/N",
+        help="Validate only shard I of N (e.g. one CI matrix job); skips the cross-file checks",
+    )
+    parser.add_argument(
+        "--shard-summary",
+        metavar="FILE",
+        help="With --shard, write this shard's results to FILE for --merge",
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="SUMMARY",
+        help="Combine --shard-summary files from every shard and run the cross-file checks",
+    )
     args = parser.parse_args()
-
-    total_errors, _ = validate_directory(args.directory, args.schema, args.tags)
+    if args.shard_summary and not args.shard:
+        parser.error("--shard-summary requires --shard")
+    if args.shard and (args.since or args.watch or args.merge):
+        parser.error("--shard cannot be combined with --since, --watch or --merge")
+    if args.watch and (args.since or args.merge or args.jobs != 1 or args.format != "text" or args.trace):
+        parser.error("--watch cannot be combined with --since, --merge, --jobs, --format or --trace")
+
+    if args.watch:
+        watch(args.directory, args.schema, args.tags, args.interval)
+        return
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    with tracing(args.trace, "validate_frontmatter"):
+        if args.merge:
+            try:
+                total_errors, _ = merge_shard_summaries(
+                    args.directory, args.merge, reporter=REPORTERS[args.format]()
+                )
+            except (OSError, ValueError) as e:
+                print(f"ERROR: {e}", file=sys.stderr)
+                sys.exit(2)
+            if total_errors > 0:
+                sys.exit(1)
+            return
+
+        cache = None if args.no_cache else NoteCache()
+        results = None if args.no_cache else ResultCache(args.results_cache, args.schema, args.tags)
+        try:
+            total_errors, _ = validate_directory(
+                args.directory, args.schema, args.tags, cache, jobs, since=args.since,
+                reporter=REPORTERS[args.format](), results=results,
+                shard=args.shard, summary=args.shard_summary,
+            )
+        except subprocess.CalledProcessError as e:
+            print(f"ERROR: {' '.join(e.cmd)} failed: {e.stderr.strip()}", file=sys.stderr)
+            sys.exit(2)
+        except OSError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(2)
+        if cache is not None:
+            cache.save()
+            results.save(prune=args.since is None and args.shard is None)
 
     if total_errors > 0:
         sys.exit(1)
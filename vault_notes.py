@@ -0,0 +1,377 @@
+"""Shared note parsing and on-disk parse cache for the vault tools.
+
+validate_frontmatter.py, generate_index.py and check_references.py all need
+the same parsed view of vault files. NoteCache stores that view on disk keyed
+by path, mtime, size and content hash, so a warm run over an unchanged vault
+costs one stat() per file:
+
+- stat matches the cached entry  -> cached data, no read
+- stat differs, content hash same -> cached data, stat refreshed (e.g. touch)
+- content changed                 -> re-parse and store
+
+Notes are read frontmatter-first: read_frontmatter_text() stops at the line
+closing the YAML block, so validation never reads note bodies. Tools that
+need the body (generate_index.py for titles) opt in with read_body().
+
+All YAML goes through load_yaml(), which uses libyaml's CSafeLoader when
+PyYAML was built with it and the pure-Python SafeLoader otherwise. Set
+GALAXY_BRAIN_YAML=python (or c) to force a backend.
+
+Markdown files are discovered by list_md_files(): a pruning os.scandir walk
+by default, or the git index with GALAXY_BRAIN_DISCOVERY=git.
+"""
+import hashlib
+import os
+import pickle
+import re
+import subprocess
+import tempfile
+from pathlib import Path
+
+from vault_trace import span
+
+REPO_ROOT = Path(__file__).parent
+DEFAULT_CACHE_DIR = REPO_ROOT / ".cache"
+DEFAULT_CACHE = DEFAULT_CACHE_DIR / "notes.pickle"
+
+# Bump when the shape of a parsed entry changes; older cache files are discarded.
+CACHE_VERSION = 2
+
+# Environment variable selecting the YAML backend: one of YAML_BACKENDS.
+YAML_BACKEND_ENV = "GALAXY_BRAIN_YAML"
+YAML_BACKENDS = ("auto", "c", "python")
+
+# Environment variable selecting how .md files are found: one of DISCOVERY_MODES.
+DISCOVERY_ENV = "GALAXY_BRAIN_DISCOVERY"
+DISCOVERY_MODES = ("walk", "git")
+
+# python-frontmatter's YAML delimiter, kept so parsing matches frontmatter.loads().
+FM_BOUNDARY = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+_BOUNDARY_LINE_RE = re.compile(r"-{3,}\s*")
+
+
+def read_text(filepath):
+    """Whole file as text (utf-8, universal newlines)."""
+    return Path(filepath).read_text(encoding="utf-8")
+
+
+def read_frontmatter_text(filepath):
+    """Read filepath only up to and including the line closing its frontmatter.
+
+    Returns the text read: the opening delimiter, the YAML block and the closing
+    delimiter. Stops after the first line if it does not open a frontmatter
+    block; reads to EOF only if the block is never closed.
+    """
+    with open(filepath, encoding="utf-8") as f:
+        first = f.readline()
+        lines = [first]
+        if _BOUNDARY_LINE_RE.fullmatch(first):
+            for line in f:
+                lines.append(line)
+                if _BOUNDARY_LINE_RE.fullmatch(line):
+                    break
+    return "".join(lines)
+
+
+def walk_md_files(directory, skip_dir=None):
+    """Yield the .md files under directory, in sorted(directory.rglob("*.md")) order.
+
+    Directories whose name satisfies skip_dir(name) are never entered, and
+    paths stream out as the walk reaches them: each directory is listed once
+    and only its own entries are sorted. Symlinked directories are not followed.
+    """
+    directory = Path(directory)
+
+    def walk(dirpath, prefix):
+        with os.scandir(dirpath) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if skip_dir is None or not skip_dir(entry.name):
+                    yield from walk(entry.path, prefix / entry.name)
+            elif entry.name.endswith(".md"):
+                yield prefix / entry.name
+
+    # Sorting each listing by name, files and directories together, visits
+    # paths in the same order as comparing them part by part, as Path does.
+    return walk(directory, directory)
+
+
+def git_md_files(directory):
+    """Sorted paths of the .md files under directory that git tracks or would add.
+
+    Read from the git index (plus untracked, non-ignored files), so no
+    directory is listed; tracked files deleted from the work tree are left
+    out. Same order and spelling as walk_md_files(). None if directory is not
+    inside a git work tree or git is unavailable.
+    """
+    directory = Path(directory)
+
+    try:
+        out = subprocess.run(
+            ["git", "ls-files", "-z", "-t", "--cached", "--deleted", "--others",
+             "--exclude-standard", "--", "*.md"],
+            cwd=directory, check=True, capture_output=True, text=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    # -t prefixes a status tag: "R " marks a tracked file deleted from the work
+    # tree (--deleted lists it again, after its "H " cached entry).
+    listed = [entry.split(" ", 1) for entry in filter(None, out.split("\0"))]
+    deleted = {name for tag, name in listed if tag == "R"}
+    names = {name for _, name in listed} - deleted
+    return [directory.joinpath(*parts) for parts in sorted(name.split("/") for name in names)]
+
+
+def list_md_files(directory, skip_dir=None, mode=None):
+    """Yield the .md files under directory in a stable order (see walk_md_files).
+
+    mode: "walk" or "git" (default: $GALAXY_BRAIN_DISCOVERY or walk). "git"
+    reads git_md_files() and falls back to walking outside a git work tree;
+    its paths are not filtered by skip_dir, so callers still check each path.
+    """
+    mode = mode or os.environ.get(DISCOVERY_ENV) or "walk"
+    if mode not in DISCOVERY_MODES:
+        raise ValueError(f"unknown discovery mode {mode!r} (choose from {', '.join(DISCOVERY_MODES)})")
+    if mode == "git":
+        paths = git_md_files(directory)
+        if paths is not None:
+            return iter(paths)
+    return walk_md_files(directory, skip_dir)
+
+
+def yaml_loader(backend=None):
+    """PyYAML loader class for backend ("auto", "c" or "python"; default: $GALAXY_BRAIN_YAML or auto).
+
+    "auto" is CSafeLoader when libyaml is available, else SafeLoader; "c"
+    raises RuntimeError if it is not. Both construct the same safe types
+    (datetime.date for dates, ...), so parsed values do not depend on the backend.
+    """
+    import yaml  # deferred: warm cache hits never parse YAML
+
+    backend = backend or os.environ.get(YAML_BACKEND_ENV) or "auto"
+    if backend not in YAML_BACKENDS:
+        raise ValueError(f"unknown YAML backend {backend!r} (choose from {', '.join(YAML_BACKENDS)})")
+    if backend == "python":
+        return yaml.SafeLoader
+    loader = getattr(yaml, "CSafeLoader", None)
+    if loader is None:
+        if backend == "c":
+            raise RuntimeError("PyYAML was built without libyaml; CSafeLoader is unavailable")
+        return yaml.SafeLoader
+    return loader
+
+
+def load_yaml(text, backend=None):
+    """yaml.safe_load(text) through the selected backend (see yaml_loader).
+
+    libyaml words its errors differently, so a document it rejects is re-parsed
+    with SafeLoader to raise the same error message on either backend.
+    """
+    import yaml
+
+    loader = yaml_loader(backend)
+    try:
+        return yaml.load(text, Loader=loader)
+    except yaml.YAMLError:
+        if loader is yaml.SafeLoader:
+            raise
+        return yaml.load(text, Loader=yaml.SafeLoader)
+
+
+def parse_note(text, yaml_backend=None):
+    """Parse a note's frontmatter into a cacheable dict.
+
+    text may be the whole note or just read_frontmatter_text() output.
+    Keys: frontmatter (bool), metadata (dict or None), error (str or None).
+    An unterminated block yields empty metadata, as python-frontmatter does.
+    yaml_backend: see yaml_loader().
+    """
+    entry = {"frontmatter": False, "metadata": None, "error": None}
+    # Like frontmatter.checks(), the delimiter must be the very first line.
+    if not FM_BOUNDARY.match(text):
+        return entry
+    entry["frontmatter"] = True
+    try:
+        _, fm, _ = FM_BOUNDARY.split(text.strip(), 2)
+    except ValueError:
+        entry["metadata"] = {}
+        return entry
+    try:
+        with span("yaml"):
+            data = load_yaml(fm, yaml_backend)
+    except Exception as e:
+        entry["error"] = str(e)
+        return entry
+    entry["metadata"] = data if isinstance(data, dict) else {}
+    return entry
+
+
+def note_body(text):
+    """Body of a whole note's text, after any frontmatter block (stripped)."""
+    text = text.strip()
+    if FM_BOUNDARY.match(text):
+        try:
+            _, _, content = FM_BOUNDARY.split(text, 2)
+        except ValueError:
+            return text
+        return content.strip()
+    return text
+
+
+def read_body(filepath):
+    """Read a note in full and return its body. The opt-in path for tools needing more than frontmatter."""
+    return note_body(read_text(filepath))
+
+
+def read_entry(filepath, parse, previous=None, read=read_text):
+    """Stat and read filepath into a cache entry.
+
+    read(filepath) returns the text parse needs (the whole file by default);
+    its hash keys the entry, and parse is skipped when it matches previous.
+    """
+    st = os.stat(filepath)
+    with span("read", path=str(filepath)):
+        text = read(filepath)
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if previous and previous["sha256"] == digest:
+        data = previous["data"]
+    else:
+        data = parse(text)
+    return {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sha256": digest,
+        "data": data,
+    }
+
+
+class NoteCache:
+    """Persistent map of (kind, path) -> parsed data, validated by stat and content hash.
+
+    kind namespaces parsers sharing one cache file ("note", "references", ...).
+    Parsed data is pickled, so YAML values such as datetime.date round-trip
+    unchanged.
+
+    path None keeps the cache in memory only: nothing is loaded or saved.
+    snapshot: assume files do not change while this object lives, so each
+    (kind, path) is stat'ed at most once. For one-shot runs where several
+    checks consult the same notes; never for --watch.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE, snapshot=False):
+        self.path = Path(path) if path is not None else None
+        self.snapshot = snapshot
+        self._entries = {}
+        self._touched = set()
+        self._verified = set()  # keys known current this run (snapshot mode)
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "rb") as f, span("cache-load"):
+                payload = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == CACHE_VERSION:
+            self._entries = payload.get("entries", {})
+
+    def _fresh_entry(self, filepath, kind):
+        key = (kind, str(filepath))
+        if key in self._verified:
+            return self._entries[key]
+        self._touched.add(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        st = os.stat(filepath)
+        if entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry
+        return None
+
+    def fresh(self, filepath, kind):
+        """Cached data for filepath if its stat still matches, else None. Never reads the file."""
+        entry = self._fresh_entry(filepath, kind)
+        return entry["data"] if entry is not None else None
+
+    def fresh_digest(self, filepath, kind):
+        """sha256 of the text read for filepath's cached entry if its stat still matches, else None.
+
+        Never reads the file.
+        """
+        entry = self._fresh_entry(filepath, kind)
+        return entry["sha256"] if entry is not None else None
+
+    def previous(self, filepath, kind):
+        """The stored entry for filepath, current or not, as read_entry()'s previous."""
+        return self._entries.get((kind, str(filepath)))
+
+    def put(self, filepath, kind, entry):
+        """Store an entry produced by read_entry() (e.g. in a worker process)."""
+        key = (kind, str(filepath))
+        self._touched.add(key)
+        self._entries[key] = entry
+        self._dirty = True
+        if self.snapshot:
+            self._verified.add(key)
+
+    def get(self, filepath, kind, parse, read=read_text):
+        """Return parse(read(filepath)), reusing the cached result when unchanged.
+
+        Read errors propagate to the caller.
+        """
+        key = (kind, str(filepath))
+        if key in self._verified:
+            return self._entries[key]["data"]
+        self._touched.add(key)
+        st = os.stat(filepath)
+        entry = self._entries.get(key)
+        if not (entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size):
+            entry = read_entry(filepath, parse, previous=entry, read=read)
+            self._entries[key] = entry
+            self._dirty = True
+        if self.snapshot:
+            self._verified.add(key)
+        return entry["data"]
+
+    def save(self):
+        """Write the cache atomically, dropping entries whose files are gone."""
+        for key in list(self._entries):
+            if key not in self._touched and not os.path.exists(key[1]):
+                del self._entries[key]
+                self._dirty = True
+        if not self._dirty or self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f, span("cache-save"):
+                pickle.dump({"version": CACHE_VERSION, "entries": self._entries}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._dirty = False
+
+
+def load_parsed(filepath, kind, parse, cache=None, read=read_text):
+    """parse(read(filepath)), through cache when one is given."""
+    if cache is None:
+        with span("read", path=str(filepath)):
+            text = read(filepath)
+        return parse(text)
+    return cache.get(filepath, kind, parse, read)
+
+
+def load_note(filepath, cache=None):
+    """Parsed frontmatter entry for filepath (see parse_note); never reads the body."""
+    return load_parsed(filepath, "note", parse_note, cache, read_frontmatter_text)
+
+
+def read_note_entry(filepath, previous=None):
+    """Cache entry for the "note" kind, as NoteCache.put() expects (for worker processes)."""
+    return read_entry(filepath, parse_note, previous, read_frontmatter_text)
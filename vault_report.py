@@ -0,0 +1,212 @@
+"""Reporters for validate_frontmatter.py results: human text, NDJSON or SARIF.
+
+validate_directory() hands each file's diagnostics to a reporter as soon as
+the file is validated, so the structured formats stream: NDJSON writes and
+flushes one record per diagnostic, and SARIF writes each result into the
+open results array, closing the document when the run finishes.
+
+Diagnostics are the validator's "field: message" strings. Structured records
+split them into the field path and message, name the check that produced
+them (rule), and point at the frontmatter line declaring the field when it
+can be found.
+"""
+import json
+import re
+import sys
+from pathlib import Path
+from urllib.parse import quote
+
+from vault_notes import read_frontmatter_text
+
+# (rule id, description, pattern matched against the full diagnostic); first match wins.
+RULES = [
+    ("no-frontmatter", "Note has no YAML frontmatter block",
+     re.compile(r"no frontmatter found$")),
+    ("unreadable", "Note could not be read or its frontmatter is not valid YAML",
+     re.compile(r"failed to (?:read|parse frontmatter): ")),
+    ("date", "Date field is not an ISO date (YYYY-MM-DD)",
+     re.compile(r"[\w-]+: '.*' is not a valid ISO date")),
+    ("wiki-link", "Wiki link field holds an empty [[...]] link",
+     re.compile(r"[\w\[\]-]+: wiki link has whitespace-only inner text")),
+    ("type-tag", "Tags do not include the tag expected for the note type",
+     re.compile(r"tags: expected '")),
+    ("missing-backlink", "Link is not reciprocated by the inverse relation on its target",
+     re.compile(r"related_notes: missing backlink to ")),
+]
+SCHEMA_RULE = ("schema", "Frontmatter does not match meta_schema.yml")
+
+# "field.path: message", where field.path may carry .N / [N] parts or be "(root)".
+_FIELD_RE = re.compile(r"(\(root\)|[A-Za-z_][\w-]*(?:\.[\w-]+|\[\d+\])*): (.*)", re.DOTALL)
+_KEY_RE = re.compile(r"[A-Za-z_][\w-]*")
+
+
+def diagnostic_rule(text):
+    """Rule id of a validator diagnostic string."""
+    for rule, _, pattern in RULES:
+        if pattern.match(text):
+            return rule
+    return SCHEMA_RULE[0]
+
+
+def split_diagnostic(text):
+    """(field path or None, message) of a "field: message" diagnostic string."""
+    m = _FIELD_RE.fullmatch(text)
+    if not m:
+        return None, text
+    field = m.group(1)
+    return (None if field == "(root)" else field), m.group(2)
+
+
+_KEY_LINE_RE = re.compile(r"([A-Za-z_][\w-]*)\s*:")
+
+
+def field_lines(filepath):
+    """{top-level frontmatter key: 1-based line declaring it} for filepath; {} if unreadable."""
+    try:
+        lines = read_frontmatter_text(filepath).splitlines()
+    except (OSError, UnicodeDecodeError):
+        return {}
+    found = {}
+    for number, line in enumerate(lines, 1):
+        m = _KEY_LINE_RE.match(line)
+        if m:
+            found.setdefault(m.group(1), number)
+    return found
+
+
+def field_line(filepath, field, lines=None):
+    """1-based line of the frontmatter key holding field, or None if it is not found.
+
+    lines is a field_lines() map to reuse across a file's diagnostics; read from filepath if omitted.
+    """
+    key = _KEY_RE.match(field or "")
+    if not key:
+        return None
+    if lines is None:
+        lines = field_lines(filepath)
+    return lines.get(key.group())
+
+
+class TextReporter:
+    """The validator's human-readable output: diagnostics grouped under each file."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._warned = set()
+
+    def start(self):
+        pass
+
+    def file(self, path, errors, warnings):
+        if errors or warnings:
+            print(f"\n{path}:", file=self.stream)
+        for e in errors:
+            print(f"  ERROR  {e}", file=self.stream)
+        for w in warnings:
+            print(f"  WARN   {w}", file=self.stream)
+        if warnings:
+            self._warned.add(str(path))
+
+    def cross_file(self, path, warning):
+        if path not in self._warned:
+            print(f"\n{path}:", file=self.stream)
+            self._warned.add(path)
+        print(f"  WARN   {warning}", file=self.stream)
+
+    def finish(self, files, errors, warnings):
+        print(f"\n{'=' * 50}", file=self.stream)
+        print(f"Files: {files}  Errors: {errors}  Warnings: {warnings}", file=self.stream)
+
+
+class _StructuredReporter:
+    """Turns diagnostic strings into records; subclasses decide how to emit them."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lines = (None, None)  # (path, field_lines map) of the last file reported
+
+    def start(self):
+        pass
+
+    def _field_lines(self, path):
+        if self._lines[0] != str(path):
+            self._lines = (str(path), field_lines(path))
+        return self._lines[1]
+
+    def record(self, path, severity, text):
+        field, message = split_diagnostic(text)
+        return {
+            "file": str(path),
+            "line": field_line(path, field, self._field_lines(path)),
+            "field": field,
+            "severity": severity,
+            "rule": diagnostic_rule(text),
+            "message": message,
+        }
+
+    def file(self, path, errors, warnings):
+        for e in errors:
+            self.emit(self.record(path, "error", e))
+        for w in warnings:
+            self.emit(self.record(path, "warning", w))
+
+    def cross_file(self, path, warning):
+        self.emit(self.record(path, "warning", warning))
+
+
+class NdjsonReporter(_StructuredReporter):
+    """One JSON object per line: a "diagnostic" record per finding, then a "summary"."""
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def emit(self, record):
+        self._write({"type": "diagnostic", **record})
+
+    def finish(self, files, errors, warnings):
+        self._write({"type": "summary", "files": files, "errors": errors, "warnings": warnings})
+
+
+class SarifReporter(_StructuredReporter):
+    """A SARIF 2.1.0 log with one run, written incrementally result by result."""
+
+    def __init__(self, stream=None, tool="validate_frontmatter"):
+        super().__init__(stream)
+        self.tool = tool
+        self._count = 0
+
+    def start(self):
+        rules = [{"id": rule, "shortDescription": {"text": description}}
+                 for rule, description, _ in RULES]
+        rules.append({"id": SCHEMA_RULE[0], "shortDescription": {"text": SCHEMA_RULE[1]}})
+        driver = {"name": self.tool, "rules": rules}
+        # Open the results array; emit() appends to it and finish() closes the document.
+        self.stream.write(
+            '{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0", '
+            f'"runs": [{{"tool": {json.dumps({"driver": driver})}, "results": [\n'
+        )
+        self.stream.flush()
+
+    def emit(self, record):
+        location = {"artifactLocation": {"uri": quote(Path(record["file"]).as_posix())}}
+        if record["line"] is not None:
+            location["region"] = {"startLine": record["line"]}
+        text = record["message"] if record["field"] is None else f"{record['field']}: {record['message']}"
+        result = {
+            "ruleId": record["rule"],
+            "level": record["severity"],
+            "message": {"text": text},
+            "locations": [{"physicalLocation": location}],
+        }
+        self.stream.write(("," if self._count else "") + json.dumps(result, ensure_ascii=False) + "\n")
+        self.stream.flush()
+        self._count += 1
+
+    def finish(self, files, errors, warnings):
+        summary = json.dumps({"files": files, "errors": errors, "warnings": warnings})
+        self.stream.write(f'], "properties": {summary}}}]}}\n')
+        self.stream.flush()
+
+
+REPORTERS = {"text": TextReporter, "ndjson": NdjsonReporter, "sarif": SarifReporter}
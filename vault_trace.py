@@ -0,0 +1,93 @@
+"""Opt-in phase tracing for the vault tools, written as Chrome trace event JSON.
+
+Tools wrap their phases (discovery, read, yaml, schema, cross-file, render,
+write, ...) in span(); main() enables tracing for --trace FILE with tracing().
+Open the file in https://ui.perfetto.dev or chrome://tracing.
+
+While tracing is off, span() returns one shared no-op context manager, so an
+instrumented per-file hot path costs a global lookup and a function call.
+Only the tracing process is recorded: spans inside --jobs worker processes
+are not collected.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+_NULL_SPAN = nullcontext()
+_tracer = None
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns(), self.args)
+
+
+class Tracer:
+    """Collects complete ("X") events; timestamps are microseconds since the tracer started."""
+
+    def __init__(self):
+        self.events = []
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+
+    def span(self, name, args):
+        return _Span(self, name, args)
+
+    def record(self, name, start_ns, end_ns, args):
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start_ns - self.origin) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def write(self, path):
+        Path(path).write_text(
+            json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"}), encoding="utf-8"
+        )
+
+
+def span(name, **args):
+    """Context manager timing one phase; args (e.g. path=...) are attached to the event."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, args)
+
+
+@contextmanager
+def tracing(path, name="main"):
+    """Record spans for the duration of the block and write them to path.
+
+    Does nothing when path is None, so mains can wrap their body unconditionally.
+    The whole block is recorded as one outer span called name.
+    """
+    global _tracer
+    if path is None:
+        yield None
+        return
+    tracer = _tracer = Tracer()
+    try:
+        with span(name):
+            yield tracer
+    finally:
+        _tracer = None
+        tracer.write(path)
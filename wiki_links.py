@@ -0,0 +1,111 @@
+"""Wiki-link slugs and indexed [[...]] resolution shared by the vault tools.
+
+Mirrors site/src/lib/wiki-links.ts: a label resolves to the note whose slug
+equals the label's slug, else to the first note (in map order) whose slug
+starts with it. SlugIndex answers the prefix case with a sorted slug array
+and a range-minimum table instead of scanning every slug.
+"""
+import re
+from bisect import bisect_left
+from pathlib import Path
+
+WIKI_LINK_RE = re.compile(r"^\[\[(.+)\]\]$")
+# A [[...]] link anywhere in body text, as the site's remark plugin finds them.
+BODY_LINK_RE = re.compile(r"\[\[([^\]\n]+)\]\]")
+
+# Sorts after any character a slug can continue with, bounding a prefix range.
+_PREFIX_END = chr(0x10FFFF)
+
+
+def slugify(name):
+    """Mirror the site's wiki-link slug: lowercase, collapse dashes/spaces, strip non-alnum."""
+    s = name.lower()
+    s = re.sub(r"\s+-\s+", "-", s)
+    s = re.sub(r"\s+", "-", s)
+    s = re.sub(r"[^a-z0-9\-]", "", s)
+    s = re.sub(r"-+", "-", s)
+    return s
+
+
+def strip_brackets(wiki_link):
+    """Inner label of a "[[...]]" string (stripped), or None if it is not one."""
+    if not isinstance(wiki_link, str):
+        return None
+    m = WIKI_LINK_RE.match(wiki_link)
+    return m.group(1).strip() if m else None
+
+
+def body_links(body):
+    """Yield (offset, label) for each [[...]] link in body, in order.
+
+    Drops "|alias" (also the table-escaped "\\|alias") and "#heading" suffixes;
+    same-note heading links such as [[#Setup]] have no target and are skipped.
+    """
+    for m in BODY_LINK_RE.finditer(body):
+        label = m.group(1).split("|", 1)[0].rstrip("\\")
+        label = label.split("#", 1)[0].strip()
+        if label:
+            yield m.start(), label
+
+
+def note_stem(path):
+    """Name notes link to: the file stem, or the workspace dir name for index.md."""
+    stem = Path(path).stem
+    if stem == "index":
+        # workspace dirs: use parent dir name (matches how notes reference projects/papers)
+        stem = Path(path).parent.name
+    return stem
+
+
+class SlugIndex:
+    """slug -> target map with logarithmic "exact, else first prefix match" lookup.
+
+    Insertion order of slug_to_target decides which prefix match wins, exactly
+    as iterating the dict would. The prefix range is found by bisecting the
+    sorted slugs; a sparse table over insertion ranks picks its earliest entry.
+    """
+
+    def __init__(self, slug_to_target):
+        self.targets = dict(slug_to_target)
+        rank = {slug: i for i, slug in enumerate(self.targets)}
+        self._slugs = sorted(self.targets)
+        self._ranks = [rank[s] for s in self._slugs]
+        # _table[k][i]: index in _slugs of the lowest rank within [i, i + 2**k).
+        n = len(self._slugs)
+        self._table = [list(range(n))]
+        width = 1
+        while width * 2 <= n:
+            prev = self._table[-1]
+            ranks = self._ranks
+            level = [
+                a if ranks[a] <= ranks[b] else b
+                for a, b in zip(prev, prev[width:])
+            ]
+            self._table.append(level)
+            width *= 2
+
+    def __len__(self):
+        return len(self.targets)
+
+    def resolve_slug(self, slug):
+        """Target for an already-slugified label, or None."""
+        if not slug:
+            return None
+        if slug in self.targets:
+            return self.targets[slug]
+        lo = bisect_left(self._slugs, slug)
+        hi = bisect_left(self._slugs, slug + _PREFIX_END, lo)
+        if lo == hi:
+            return None
+        k = (hi - lo).bit_length() - 1
+        a = self._table[k][lo]
+        b = self._table[k][hi - (1 << k)]
+        best = a if self._ranks[a] <= self._ranks[b] else b
+        return self.targets[self._slugs[best]]
+
+    def resolve(self, wiki_link):
+        """Target for a "[[label]]" string, or None if malformed or dangling."""
+        label = strip_brackets(wiki_link)
+        if not label:
+            return None
+        return self.resolve_slug(slugify(label))